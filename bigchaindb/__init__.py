@@ -21,6 +21,7 @@ from bigchaindb.core import App  # noqa
 
 _database_keys_map = {
     'localmongodb': ('host', 'port', 'name'),
+    'localsqlite': ('name',),
 }
 
 _base_database_localmongodb = {
@@ -42,11 +43,46 @@ _database_localmongodb = {
     'keyfile': None,
     'keyfile_passphrase': None,
     'crlfile': None,
+    # Connection settings by role: the ABCI application validates and
+    # writes blocks, the web API serves reads.
+    'profiles': {
+        'consensus': {
+            'read_preference': 'primary',
+            'max_time_ms': 0,
+            'max_pool_size': 100,
+        },
+        'api': {
+            # The API validates posted transactions and confirms commits
+            # with this connection, so it must not read stale data.
+            'read_preference': 'primary',
+            'max_time_ms': 5000,
+            'max_pool_size': 20,
+        },
+    },
 }
 _database_localmongodb.update(_base_database_localmongodb)
 
+_database_localsqlite = {
+    'backend': 'localsqlite',
+    # The path to the database file
+    'name': 'bigchain.sqlite',
+    # The milliseconds to wait for a lock on the database
+    'connection_timeout': 5000,
+    'max_tries': 3,
+}
+
+# For tests and benchmarks: the data only lives as long as the process
+_database_localmemory = {
+    'backend': 'localmemory',
+    'name': 'bigchain',
+    'connection_timeout': 5000,
+    'max_tries': 3,
+}
+
 _database_map = {
     'localmongodb': _database_localmongodb,
+    'localsqlite': _database_localsqlite,
+    'localmemory': _database_localmemory,
 }
 
 config = {
@@ -57,6 +93,15 @@ config = {
         'loglevel': logging.getLevelName(
             log_config['handlers']['console']['level']).lower(),
         'workers': None,  # if None, the value will be cpu_count * 2 + 1
+        'engine': 'gunicorn',  # or 'aiohttp'
+        'response_cache_size': 1024,
+        'commit_timeout': 10,
+        'status_max_waiters': 2,
+        'dedupe_ttl': 30,
+        'admission_max_mempool_size': 10000,
+        'admission_max_in_flight': 0,
+        'admission_max_rejection_rate': 0,
+        'admission_retry_after': 2,
     },
     'wsserver': {
         'scheme': 'ws',
@@ -65,10 +110,24 @@ config = {
         'advertised_scheme': 'ws',
         'advertised_host': 'localhost',
         'advertised_port': 9985,
+        'queue_size': 1000,
+        'overflow': 'drop_oldest',
+        'event_source': 'tendermint',  # or 'commit'
+        'workers': 1,
+        'tx_events_sample_rate': 0.01,
+        'tx_events_rate_limit': 100,
     },
     'tendermint': {
         'host': 'localhost',
         'port': 26657,
+        'rpc_pool_size': 10,
+        'rpc_connect_timeout': 5,
+        'rpc_read_timeout': 30,
+        'rpc_retries': 3,
+        'rpc_backoff_factor': 0.1,
+    },
+    'verification_cache': {
+        'size': 65536,
     },
     # FIXME: hardcoding to localmongodb for now
     'database': _database_map['localmongodb'],
@@ -13,6 +13,12 @@ from bigchaindb.backend.exceptions import ConnectionError
 
 BACKENDS = {
     'localmongodb': 'bigchaindb.backend.localmongodb.connection.LocalMongoDBConnection',
+    'localsqlite': 'bigchaindb.backend.localsqlite.connection.LocalSQLiteConnection',
+    'localmemory': 'bigchaindb.backend.localmemory.connection.LocalMemoryConnection',
+}
+
+ASYNC_BACKENDS = {
+    'localmongodb': 'bigchaindb.backend.localmongodb.connection.AsyncLocalMongoDBConnection',
 }
 
 logger = logging.getLogger(__name__)
@@ -21,7 +27,7 @@ logger = logging.getLogger(__name__)
 def connect(backend=None, host=None, port=None, name=None, max_tries=None,
             connection_timeout=None, replicaset=None, ssl=None, login=None, password=None,
             ca_cert=None, certfile=None, keyfile=None, keyfile_passphrase=None,
-            crlfile=None):
+            crlfile=None, profiles=None, asynchronous=False, role=None):
     """Create a new connection to the database backend.
 
     All arguments default to the current configuration's values if not
@@ -34,6 +40,13 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
         name (str): the name of the database to use.
         replicaset (str): the name of the replica set (only relevant for
                           MongoDB connections).
+        profiles (dict): the connection settings of each role.
+        asynchronous (bool): return a connection to use from an asyncio
+                             event loop, whose queries are coroutines.
+        role (str): the name of the connection profile to use from
+                    :attr:`profiles` (e.g. ``'consensus'`` or ``'api'``).
+                    If not given, or if the backend has no profiles, the
+                    driver's defaults are used.
 
     Returns:
         An instance of :class:`~bigchaindb.backend.connection.Connection`
@@ -48,8 +61,8 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
     """
 
     backend = backend or bigchaindb.config['database']['backend']
-    host = host or bigchaindb.config['database']['host']
-    port = port or bigchaindb.config['database']['port']
+    host = host or bigchaindb.config['database'].get('host')
+    port = port or bigchaindb.config['database'].get('port')
     dbname = name or bigchaindb.config['database']['name']
     # Not sure how to handle this here. This setting is only relevant for
     # mongodb.
@@ -70,12 +83,20 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
     keyfile_passphrase = keyfile_passphrase or bigchaindb.config['database'].get('keyfile_passphrase', None)
     crlfile = crlfile or bigchaindb.config['database'].get('crlfile', None)
 
+    profiles = profiles or bigchaindb.config['database'].get('profiles', {})
+
+    try:
+        profile = profiles[role] if role and profiles else {}
+    except KeyError:
+        raise ConfigurationError('Unknown database role `{}`'.format(role))
+
+    backends = ASYNC_BACKENDS if asynchronous else BACKENDS
     try:
-        module_name, _, class_name = BACKENDS[backend].rpartition('.')
+        module_name, _, class_name = backends[backend].rpartition('.')
         Class = getattr(import_module(module_name), class_name)
     except KeyError:
         raise ConfigurationError('Backend `{}` is not supported. '
-                                 'BigchainDB currently supports {}'.format(backend, BACKENDS.keys()))
+                                 'BigchainDB currently supports {}'.format(backend, backends.keys()))
     except (ImportError, AttributeError) as exc:
         raise ConfigurationError('Error loading backend `{}`'.format(backend)) from exc
 
@@ -84,7 +105,8 @@ def connect(backend=None, host=None, port=None, name=None, max_tries=None,
                  max_tries=max_tries, connection_timeout=connection_timeout,
                  replicaset=replicaset, ssl=ssl, login=login, password=password,
                  ca_cert=ca_cert, certfile=certfile, keyfile=keyfile,
-                 keyfile_passphrase=keyfile_passphrase, crlfile=crlfile)
+                 keyfile_passphrase=keyfile_passphrase, crlfile=crlfile,
+                 **profile)
 
 
 class Connection:
@@ -114,8 +136,8 @@ class Connection:
 
         dbconf = bigchaindb.config['database']
 
-        self.host = host or dbconf['host']
-        self.port = port or dbconf['port']
+        self.host = host or dbconf.get('host')
+        self.port = port or dbconf.get('port')
         self.dbname = dbname or dbconf['name']
         self.connection_timeout = connection_timeout if connection_timeout is not None\
             else dbconf['connection_timeout']
@@ -0,0 +1,28 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""In-memory backend implementation.
+
+Contains an implementation of the :mod:`~bigchaindb.backend.schema` and
+:mod:`~bigchaindb.backend.query` interfaces on Python dicts, with the
+indexes of the MongoDB collections.
+
+The data only lives as long as the process, and isn't shared with other
+processes: this backend is meant for tests and for benchmarks of the
+validation code, which can then run without a database server. You can
+specify BigchainDB to use it by either setting ``database.backend`` to
+``'localmemory'`` in your configuration file, or setting the
+``BIGCHAINDB_DATABASE_BACKEND`` environment variable to ``'localmemory'``.
+
+If configured to use it, BigchainDB will automatically return instances
+of :class:`~bigchaindb.backend.localmemory.connection.LocalMemoryConnection`
+for :func:`~bigchaindb.backend.connection.connect` and dispatch calls of the
+generic backend interfaces to the implementations in this module.
+"""
+
+# Register the single dispatched modules on import.
+from bigchaindb.backend.localmemory import schema, query # noqa
+
+# LocalMemoryConnection should always be accessed via
+# ``bigchaindb.backend.connect()``.
@@ -0,0 +1,46 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from bigchaindb.backend.connection import Connection
+from bigchaindb.backend.exceptions import OperationError
+
+# The databases of this process, by name
+DATABASES = {}
+
+
+class LocalMemoryConnection(Connection):
+    """A connection to the in-memory database ``dbname`` of the current
+    process.
+
+    All the connections to a database share its tables, so the ABCI
+    application, the validation code and the tests see the same data, as
+    long as they run in the same process.
+    """
+
+    @property
+    def conn(self):
+        try:
+            return DATABASES[self.dbname]
+        except KeyError:
+            raise OperationError('Database `{}` does not exist'
+                                 .format(self.dbname)) from None
+
+    def run(self, query):
+        """Run a query.
+
+        Args:
+            query (callable): a function taking the
+                :class:`~bigchaindb.backend.localmemory.table.Database`
+                to query. It holds the lock of the database.
+
+        Raises:
+            :exc:`~DuplicateKeyError`: If the query fails because of a
+                unique key.
+            :exc:`~OperationError`: If the database or a table doesn't
+                exist.
+        """
+
+        db = self.conn
+        with db.lock:
+            return query(db)
@@ -0,0 +1,351 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Query implementation for in-memory databases.
+
+The queries have the same semantics as the ones in
+:mod:`bigchaindb.backend.localmongodb.query`, except that results are
+returned as lists, in insertion order, and that the text search only
+approximates the one of MongoDB.
+"""
+
+from bigchaindb import backend
+from bigchaindb.backend.exceptions import DuplicateKeyError
+from bigchaindb.backend.utils import fold, module_dispatch_registrar, parse_search
+from bigchaindb.backend.localmemory.connection import LocalMemoryConnection
+from bigchaindb.backend.localmemory.table import stems
+from bigchaindb.common.transaction import Transaction
+
+register_query = module_dispatch_registrar(backend.query)
+
+
+def _insert_unordered(conn, table, docs):
+    """Insert the documents with a new key, then raise if any was a
+    duplicate, like an unordered ``insert_many`` in MongoDB."""
+
+    def insert(db):
+        duplicates = 0
+        for doc in docs:
+            try:
+                db[table].insert(doc)
+            except DuplicateKeyError:
+                duplicates += 1
+        return duplicates
+
+    docs = list(docs)
+    duplicates = conn.run(insert)
+    if duplicates:
+        raise DuplicateKeyError('{} of {} documents in `{}` are duplicates'
+                                .format(duplicates, len(docs), table))
+    return len(docs)
+
+
+def _insert_or_ignore(db, table, docs):
+    written = 0
+    for doc in docs:
+        try:
+            db[table].insert(doc)
+            written += 1
+        except DuplicateKeyError:
+            pass
+    return written
+
+
+@register_query(LocalMemoryConnection)
+def store_transactions(conn, signed_transactions):
+    def insert(db):
+        for transaction in signed_transactions:
+            db['transactions'].insert(transaction)
+        return len(signed_transactions)
+
+    return conn.run(insert)
+
+
+@register_query(LocalMemoryConnection)
+def get_transaction(conn, transaction_id):
+    return conn.run(lambda db: db['transactions'].get(transaction_id))
+
+
+@register_query(LocalMemoryConnection)
+def get_transactions(conn, transaction_ids):
+    return conn.run(lambda db: db['transactions'].get_many(transaction_ids))
+
+
+@register_query(LocalMemoryConnection)
+def store_metadatas(conn, metadata):
+    return _insert_unordered(conn, 'metadata', metadata)
+
+
+@register_query(LocalMemoryConnection)
+def get_metadata(conn, transaction_ids):
+    return conn.run(lambda db: db['metadata'].get_many(transaction_ids))
+
+
+@register_query(LocalMemoryConnection)
+def store_asset(conn, asset):
+    return conn.run(lambda db: _insert_or_ignore(db, 'assets', [asset]))
+
+
+@register_query(LocalMemoryConnection)
+def store_assets(conn, assets):
+    return _insert_unordered(conn, 'assets', assets)
+
+
+@register_query(LocalMemoryConnection)
+def get_asset(conn, asset_id):
+    asset = conn.run(lambda db: db['assets'].get(asset_id))
+    if asset is not None:
+        del asset['id']
+    return asset
+
+
+@register_query(LocalMemoryConnection)
+def get_assets(conn, asset_ids):
+    return conn.run(lambda db: db['assets'].get_many(asset_ids))
+
+
+@register_query(LocalMemoryConnection)
+def get_spent(conn, transaction_id, output):
+    return conn.run(
+        lambda db: db['transactions'].find('inputs', (transaction_id, output)))
+
+
+@register_query(LocalMemoryConnection)
+def get_latest_block(conn):
+    return conn.run(lambda db: db['blocks'].last())
+
+
+@register_query(LocalMemoryConnection)
+def store_block(conn, block):
+    return conn.run(lambda db: _insert_or_ignore(db, 'blocks', [block]))
+
+
+@register_query(LocalMemoryConnection)
+def get_txids_filtered(conn, asset_id, operation=None):
+    def find(db):
+        transactions = []
+        if operation in (None, Transaction.CREATE):
+            create = db['transactions'].get(asset_id)
+            if create and create['operation'] == Transaction.CREATE:
+                transactions.append(create)
+        if operation in (None, Transaction.TRANSFER):
+            transactions.extend(
+                transaction for transaction
+                in db['transactions'].find('asset_id', asset_id)
+                if transaction['operation'] == Transaction.TRANSFER)
+        return [transaction['id'] for transaction in transactions]
+
+    return conn.run(find)
+
+
+@register_query(LocalMemoryConnection)
+def text_search(conn, search, *, language='english', case_sensitive=False,
+                diacritic_sensitive=False, text_score=False, limit=0, table='assets'):
+    # Words are stemmed with a few English suffix rules, whatever the
+    # ``language``. The score of a document is the number of distinct
+    # words of the search it matches, plus the share of its own words
+    # matching the search.
+    phrases, terms, negations = parse_search(search)
+    if not (phrases or terms):
+        return []
+
+    def search_table(db):
+        docs = db[table]
+        if phrases:
+            # All the words of the phrases, then the phrases themselves
+            matches = docs.search({word for phrase in phrases
+                                   for word in stems(phrase)})
+            keys = set.intersection(*map(set, matches.values())) if matches else set()
+            keys = {key for key in keys
+                    if all(fold(phrase) in fold(docs.texts[key][0])
+                           for phrase in phrases)}
+        else:
+            matches = docs.search({word for term in terms
+                                   for word in stems(term)})
+            keys = set().union(*matches.values())
+
+        for negation in negations:
+            excluded = stems(negation)
+            keys = {key for key in keys
+                    if not all(key in docs.words.get(word, ())
+                               for word in excluded)}
+
+        if case_sensitive or diacritic_sensitive:
+            needles = [fold(needle, case_sensitive, diacritic_sensitive)
+                       for needle in phrases or terms]
+            keys = {key for key in keys
+                    if (all if phrases else any)(
+                        needle in fold(docs.texts[key][0], case_sensitive,
+                                       diacritic_sensitive)
+                        for needle in needles)}
+
+        scores = {}
+        for key in keys:
+            occurrences = [keys_[key] for keys_ in matches.values() if key in keys_]
+            scores[key] = (len(occurrences) +
+                           sum(occurrences) / max(docs.texts[key][1], 1))
+        ranked = sorted(keys, key=lambda key: (-scores[key], docs.rows[key][0]))
+        if limit:
+            ranked = ranked[:limit]
+
+        results = []
+        for key in ranked:
+            doc = docs.get(key)
+            if text_score:
+                doc['score'] = scores[key]
+            results.append(doc)
+        return results
+
+    return conn.run(search_table)
+
+
+@register_query(LocalMemoryConnection)
+def get_owned_ids(conn, owner):
+    return conn.run(lambda db: db['transactions'].find('outputs', owner))
+
+
+@register_query(LocalMemoryConnection)
+def get_spending_transactions(conn, inputs):
+    def find(db):
+        index = db['transactions'].index_maps['inputs']
+        keys = {key for fulfills in inputs
+                for key in index.get((fulfills['transaction_id'],
+                                      fulfills['output_index']), ())}
+        return db['transactions'].get_many(keys)
+
+    return conn.run(find)
+
+
+@register_query(LocalMemoryConnection)
+def get_block(conn, block_id):
+    return conn.run(lambda db: db['blocks'].get(block_id))
+
+
+@register_query(LocalMemoryConnection)
+def get_blocks(conn, from_height, limit):
+    return conn.run(lambda db: db['blocks'].range(from_height, limit))
+
+
+@register_query(LocalMemoryConnection)
+def get_block_with_transaction(conn, txid):
+    return conn.run(lambda db: [{'height': block['height']} for block
+                                in db['blocks'].find('transactions', txid)])
+
+
+@register_query(LocalMemoryConnection)
+def delete_transactions(conn, txn_ids):
+    def delete(db):
+        for table in ('assets', 'metadata', 'transactions'):
+            for txn_id in txn_ids:
+                db[table].delete(txn_id)
+
+    conn.run(delete)
+
+
+@register_query(LocalMemoryConnection)
+def store_unspent_outputs(conn, *unspent_outputs):
+    if unspent_outputs:
+        return conn.run(
+            lambda db: _insert_or_ignore(db, 'utxos', unspent_outputs))
+
+
+@register_query(LocalMemoryConnection)
+def delete_unspent_outputs(conn, *unspent_outputs):
+    if unspent_outputs:
+        return conn.run(lambda db: sum(
+            db['utxos'].delete((utxo['transaction_id'], utxo['output_index']))
+            for utxo in unspent_outputs))
+
+
+@register_query(LocalMemoryConnection)
+def get_unspent_outputs(conn, *, query=None):
+    # Only equality on top level fields is supported in ``query``.
+    query = query or {}
+    return conn.run(lambda db: [
+        utxo for utxo in db['utxos']
+        if all(utxo.get(key) == value for key, value in query.items())])
+
+
+@register_query(LocalMemoryConnection)
+def store_pre_commit_state(conn, state):
+    conn.run(lambda db: db['pre_commit'].replace(state))
+
+
+@register_query(LocalMemoryConnection)
+def get_pre_commit_state(conn, commit_id):
+    return conn.run(lambda db: db['pre_commit'].get(commit_id))
+
+
+@register_query(LocalMemoryConnection)
+def store_validator_set(conn, validators_update):
+    conn.run(lambda db: db['validators'].replace(validators_update))
+
+
+@register_query(LocalMemoryConnection)
+def store_election_results(conn, election):
+    conn.run(lambda db: db['elections'].replace(election))
+
+
+@register_query(LocalMemoryConnection)
+def get_validator_set(conn, height=None):
+    return conn.run(lambda db: db['validators'].last(height))
+
+
+@register_query(LocalMemoryConnection)
+def get_election(conn, election_id):
+    return conn.run(lambda db: next(
+        iter(db['elections'].find('election_id', election_id)), None))
+
+
+@register_query(LocalMemoryConnection)
+def increment_vote_tallies(conn, votes):
+    def increment(db):
+        for election_id, count in votes.items():
+            tally = db['vote_tallies'].get(election_id) or {
+                'election_id': election_id, 'votes': 0}
+            tally['votes'] += count
+            db['vote_tallies'].replace(tally)
+
+    conn.run(increment)
+
+
+@register_query(LocalMemoryConnection)
+def store_vote_tally(conn, tally):
+    conn.run(lambda db: db['vote_tallies'].replace(tally))
+
+
+@register_query(LocalMemoryConnection)
+def insert_vote_tally(conn, tally):
+    def insert(db):
+        if db['vote_tallies'].get(tally['election_id']) is None:
+            db['vote_tallies'].replace(tally)
+
+    conn.run(insert)
+
+
+@register_query(LocalMemoryConnection)
+def get_vote_tally(conn, election_id):
+    return conn.run(lambda db: db['vote_tallies'].get(election_id))
+
+
+@register_query(LocalMemoryConnection)
+def get_asset_tokens_for_public_key(conn, asset_id, public_key):
+    def find(db):
+        index_maps = db['transactions'].index_maps
+        keys = (index_maps['asset_id'].get(asset_id, {}).keys() &
+                index_maps['sole_outputs'].get(public_key, {}).keys())
+        return db['transactions'].get_many(keys)
+
+    return conn.run(find)
+
+
+@register_query(LocalMemoryConnection)
+def store_abci_chain(conn, height, chain_id, is_synced=True):
+    conn.run(lambda db: db['abci_chains'].replace(
+        {'height': height, 'chain_id': chain_id, 'is_synced': is_synced}))
+
+
+@register_query(LocalMemoryConnection)
+def get_latest_abci_chain(conn):
+    return conn.run(lambda db: db['abci_chains'].last())
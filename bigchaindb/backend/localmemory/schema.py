@@ -0,0 +1,85 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Utils to initialize and drop the database."""
+
+import logging
+from operator import itemgetter
+
+from bigchaindb import backend
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.localmemory.connection import (DATABASES,
+                                                       LocalMemoryConnection)
+from bigchaindb.backend.localmemory.table import Database, Table
+from bigchaindb.common.exceptions import DatabaseDoesNotExist
+
+
+logger = logging.getLogger(__name__)
+register_schema = module_dispatch_registrar(backend.schema)
+
+
+def _asset_id(transaction):
+    return [(transaction.get('asset') or {}).get('id')]
+
+
+def _inputs(transaction):
+    return [(input_['fulfills']['transaction_id'],
+             input_['fulfills']['output_index'])
+            for input_ in transaction['inputs'] if input_['fulfills']]
+
+
+def _outputs(transaction):
+    return [public_key for output in transaction['outputs']
+            for public_key in output['public_keys']]
+
+
+def _sole_outputs(transaction):
+    return [output['public_keys'][0] for output in transaction['outputs']
+            if len(output['public_keys']) == 1]
+
+
+# The arguments of the :class:`~.Table` of each table, with the same
+# indexes as the MongoDB collections.
+TABLES = {
+    'transactions': dict(key=itemgetter('id'),
+                         indexes={'asset_id': _asset_id,
+                                  'inputs': _inputs,
+                                  'outputs': _outputs,
+                                  'sole_outputs': _sole_outputs}),
+    'assets': dict(key=itemgetter('id'), text=True),
+    'blocks': dict(key=itemgetter('height'), ordered=True,
+                   indexes={'transactions': itemgetter('transactions')}),
+    'metadata': dict(key=itemgetter('id'), text=True),
+    'utxos': dict(key=itemgetter('transaction_id', 'output_index')),
+    'pre_commit': dict(key=itemgetter('commit_id')),
+    'elections': dict(key=itemgetter('height'),
+                      unique={'election_id': lambda election: [election['election_id']]}),
+    'validators': dict(key=itemgetter('height'), ordered=True),
+    'abci_chains': dict(key=itemgetter('height'), ordered=True,
+                        unique={'chain_id': lambda chain: [chain['chain_id']]}),
+    'vote_tallies': dict(key=itemgetter('election_id')),
+}
+
+
+@register_schema(LocalMemoryConnection)
+def create_database(conn, dbname):
+    logger.info('Create database `%s`.', dbname)
+    DATABASES.setdefault(dbname, Database())
+
+
+@register_schema(LocalMemoryConnection)
+def create_tables(conn, dbname):
+    db = DATABASES[dbname]
+    for table_name in backend.schema.TABLES:
+        logger.info(f'Create `{table_name}` table.')
+        if table_name not in db:
+            db[table_name] = Table(**TABLES[table_name])
+
+
+@register_schema(LocalMemoryConnection)
+def drop_database(conn, dbname):
+    try:
+        del DATABASES[dbname]
+    except KeyError:
+        raise DatabaseDoesNotExist(f'Database `{dbname}` does not exist')
@@ -0,0 +1,208 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""In-memory tables of documents, with the indexes the queries need."""
+
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from itertools import count
+
+import rapidjson
+
+from bigchaindb.backend.exceptions import DuplicateKeyError, OperationError
+from bigchaindb.backend.utils import fold
+
+WORDS = re.compile(r'\w+')
+SUFFIXES = ('ing', 'ed', 'es', 's')
+
+
+def stem(word):
+    """Reduce a folded word to an approximation of its English stem, so that
+    e.g. "baking" and "bake" or "shop" and "shopping" match."""
+
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'aeiou':
+        word = word[:-1]
+    if len(word) > 3 and word.endswith('e'):
+        word = word[:-1]
+    return word
+
+
+def stems(text):
+    return [stem(word) for word in WORDS.findall(fold(text))]
+
+
+def strings(value):
+    """Yield every string in a document."""
+
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from strings(item)
+
+
+class Database(dict):
+    """The tables of a database, by name."""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.RLock()
+
+    def __missing__(self, name):
+        raise OperationError('Table `{}` does not exist'.format(name))
+
+
+class Table:
+    """A table of documents, stored serialized, by a unique key.
+
+    Args:
+        key (callable): returns the key of a document.
+        indexes (dict): functions returning the values a document is
+            indexed by, by index name.
+        unique (dict): like ``indexes``, for indexes whose values can only
+            belong to one document.
+        ordered (bool): keep the keys sorted, to look up the last one.
+        text (bool): index the words of the strings of the documents.
+    """
+
+    def __init__(self, key, indexes=None, unique=None, ordered=False,
+                 text=False):
+        self.key = key
+        self.indexes = dict(indexes or {}, **(unique or {}))
+        self.unique = set(unique or ())
+        self.ordered = ordered
+        self.text = text
+        self.clear()
+
+    def clear(self):
+        # key -> (sequence number, serialized document, indexed values)
+        self.rows = {}
+        self.index_maps = {name: defaultdict(dict) for name in self.indexes}
+        self.sorted_keys = []
+        # stem -> {key: occurrences}, and key -> (text, number of words)
+        self.words = defaultdict(dict)
+        self.texts = {}
+        self.sequence = count()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return (rapidjson.loads(doc) for _, doc, _ in self.rows.values())
+
+    def get(self, key):
+        row = self.rows.get(key)
+        return rapidjson.loads(row[1]) if row else None
+
+    def get_many(self, keys):
+        return self._load(self.rows[key] for key in set(keys) if key in self.rows)
+
+    def find(self, index, value):
+        return self.get_many(self.index_maps[index].get(value, ()))
+
+    def last(self, at_most=None):
+        """Return the document with the greatest key, or with the greatest
+        key not greater than ``at_most``."""
+
+        keys = self.sorted_keys
+        position = len(keys) if at_most is None else bisect_right(keys, at_most)
+        return self.get(keys[position - 1]) if position else None
+
+    def range(self, start, limit):
+        """Return at most ``limit`` documents, in ascending order of key,
+        from the one with key ``start``."""
+
+        keys = self.sorted_keys
+        position = bisect_left(keys, start)
+        return [self.get(key) for key in keys[position:position + limit]]
+
+    def insert(self, doc):
+        """Insert a document.
+
+        Raises:
+            :exc:`~DuplicateKeyError`: If the key or the value of a unique
+                index of the document is taken.
+        """
+
+        key = self.key(doc)
+        if key in self.rows:
+            raise DuplicateKeyError('Key `{}` is taken'.format(key))
+        self._add(key, doc, next(self.sequence))
+
+    def replace(self, doc):
+        """Replace the document with the same key, or insert it."""
+
+        key = self.key(doc)
+        row = self.rows.get(key)
+        if row is None:
+            return self._add(key, doc, next(self.sequence))
+        self._remove(key)
+        try:
+            self._add(key, doc, row[0])
+        except DuplicateKeyError:
+            self._add(key, rapidjson.loads(row[1]), row[0])
+            raise
+
+    def delete(self, key):
+        if key not in self.rows:
+            return False
+        self._remove(key)
+        return True
+
+    def search(self, words):
+        """Return the keys of the documents containing each of ``words``,
+        with the number of occurrences."""
+
+        return {word: self.words.get(word, {}) for word in words}
+
+    def _load(self, rows):
+        return [rapidjson.loads(doc) for _, doc, _ in sorted(rows)]
+
+    def _add(self, key, doc, sequence):
+        values = {name: set(index(doc)) for name, index in self.indexes.items()}
+        for name in self.unique:
+            for value in values[name]:
+                if self.index_maps[name].get(value):
+                    raise DuplicateKeyError('Value `{}` of `{}` is taken'
+                                            .format(value, name))
+
+        self.rows[key] = (sequence, rapidjson.dumps(doc, ensure_ascii=False),
+                          values)
+        for name, index_values in values.items():
+            for value in index_values:
+                self.index_maps[name][value][key] = None
+        if self.ordered:
+            insort(self.sorted_keys, key)
+        if self.text:
+            text = ' '.join(strings(doc))
+            words = stems(text)
+            for word, occurrences in Counter(words).items():
+                self.words[word][key] = occurrences
+            self.texts[key] = (text, len(words))
+
+    def _remove(self, key):
+        _, _, values = self.rows.pop(key)
+        for name, index_values in values.items():
+            index_map = self.index_maps[name]
+            for value in index_values:
+                del index_map[value][key]
+                if not index_map[value]:
+                    del index_map[value]
+        if self.ordered:
+            del self.sorted_keys[bisect_right(self.sorted_keys, key) - 1]
+        if self.text:
+            text, _ = self.texts.pop(key)
+            for word in set(stems(text)):
+                del self.words[word][key]
+                if not self.words[word]:
+                    del self.words[word]
@@ -18,10 +18,13 @@ If configured to use MongoDB, BigchainDB will automatically return instances
 of :class:`~bigchaindb.backend.localmongodb.LocalMongoDBConnection` for
 :func:`~bigchaindb.backend.connection.connect` and dispatch calls of the
 generic backend interfaces to the implementations in this module.
+``connect(asynchronous=True)`` returns an instance of
+:class:`~bigchaindb.backend.localmongodb.connection.AsyncLocalMongoDBConnection`
+instead, for which the read queries are coroutines.
 """
 
 # Register the single dispatched modules on import.
-from bigchaindb.backend.localmongodb import schema, query # noqa
+from bigchaindb.backend.localmongodb import schema, query, async_query # noqa
 
 # MongoDBConnection should always be accessed via
 # ``bigchaindb.backend.connect()``.
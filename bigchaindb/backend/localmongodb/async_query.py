@@ -0,0 +1,230 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Asynchronous query implementation for MongoDB.
+
+The read queries of :mod:`bigchaindb.backend.query`, implemented as
+coroutines for :class:`~.AsyncLocalMongoDBConnection`. They have the same
+semantics as the ones in :mod:`bigchaindb.backend.localmongodb.query`,
+except that cursors are returned as lists.
+"""
+
+from pymongo import ASCENDING, DESCENDING
+
+from bigchaindb import backend
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.localmongodb.connection import AsyncLocalMongoDBConnection
+from bigchaindb.backend.localmongodb.query import _remove_text_score
+from bigchaindb.common.transaction import Transaction
+
+register_query = module_dispatch_registrar(backend.query)
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_transaction(conn, transaction_id):
+    return await conn.run(
+        conn.collection('transactions')
+        .find_one({'id': transaction_id}, {'_id': 0}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_transactions(conn, transaction_ids):
+    return await conn.run(
+        conn.collection('transactions')
+        .find({'id': {'$in': transaction_ids}},
+              projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_metadata(conn, transaction_ids):
+    return await conn.run(
+        conn.collection('metadata')
+        .find({'id': {'$in': transaction_ids}},
+              projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_asset(conn, asset_id):
+    return await conn.run(
+        conn.collection('assets')
+        .find_one({'id': asset_id}, {'_id': 0, 'id': 0}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_assets(conn, asset_ids):
+    return await conn.run(
+        conn.collection('assets')
+        .find({'id': {'$in': asset_ids}},
+              projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_spent(conn, transaction_id, output):
+    query = {'inputs.fulfills': {'transaction_id': transaction_id,
+                                 'output_index': output}}
+    return await conn.run(
+        conn.collection('transactions')
+        .find(query, {'_id': 0}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_latest_block(conn):
+    return await conn.run(
+        conn.collection('blocks')
+        .find_one(projection={'_id': False},
+                  sort=[('height', DESCENDING)]))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_txids_filtered(conn, asset_id, operation=None):
+    match_create = {
+        'operation': 'CREATE',
+        'id': asset_id
+    }
+    match_transfer = {
+        'operation': 'TRANSFER',
+        'asset.id': asset_id
+    }
+
+    if operation == Transaction.CREATE:
+        match = match_create
+    elif operation == Transaction.TRANSFER:
+        match = match_transfer
+    else:
+        match = {'$or': [match_create, match_transfer]}
+
+    transactions = await conn.run(
+        conn.collection('transactions')
+        .aggregate([{'$match': match}]))
+    return [elem['id'] for elem in transactions]
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def text_search(conn, search, *, language='english',
+                      case_sensitive=False, diacritic_sensitive=False,
+                      text_score=False, limit=0, table='assets'):
+    objs = await conn.run(
+        conn.collection(table)
+        .find({'$text': {
+                '$search': search,
+                '$language': language,
+                '$caseSensitive': case_sensitive,
+                '$diacriticSensitive': diacritic_sensitive}},
+              {'score': {'$meta': 'textScore'}, '_id': False})
+        .sort([('score', {'$meta': 'textScore'})])
+        .limit(limit))
+
+    if text_score:
+        return objs
+
+    return [_remove_text_score(obj) for obj in objs]
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_owned_ids(conn, owner):
+    return await conn.run(
+        conn.collection('transactions').aggregate([
+            {'$match': {'outputs.public_keys': owner}},
+            {'$project': {'_id': False}}
+        ]))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_spending_transactions(conn, inputs):
+    return await conn.run(
+        conn.collection('transactions').aggregate([
+            {'$match': {
+                'inputs.fulfills': {
+                    '$in': inputs,
+                },
+            }},
+            {'$project': {'_id': False}}
+        ]))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_block(conn, block_id):
+    return await conn.run(
+        conn.collection('blocks')
+        .find_one({'height': block_id},
+                  projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_blocks(conn, from_height, limit):
+    return await conn.run(
+        conn.collection('blocks')
+        .find({'height': {'$gte': from_height}},
+              projection={'_id': False})
+        .sort('height', ASCENDING)
+        .limit(limit))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_block_with_transaction(conn, txid):
+    return await conn.run(
+        conn.collection('blocks')
+        .find({'transactions': txid},
+              projection={'_id': False, 'height': True}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_unspent_outputs(conn, *, query=None):
+    if query is None:
+        query = {}
+    return await conn.run(
+        conn.collection('utxos')
+        .find(query, projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_pre_commit_state(conn, commit_id):
+    return await conn.run(
+        conn.collection('pre_commit')
+        .find_one({'commit_id': commit_id},
+                  projection={'_id': False}))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_validator_set(conn, height=None):
+    query = {}
+    if height is not None:
+        query = {'height': {'$lte': height}}
+
+    validators = await conn.run(
+        conn.collection('validators')
+        .find(query, projection={'_id': False})
+        .sort([('height', DESCENDING)])
+        .limit(1))
+
+    return next(iter(validators), None)
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_election(conn, election_id):
+    elections = await conn.run(
+        conn.collection('elections')
+        .find({'election_id': election_id}, projection={'_id': False})
+        .limit(1))
+
+    return next(iter(elections), None)
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_asset_tokens_for_public_key(conn, asset_id, public_key):
+    query = {'outputs.public_keys': [public_key],
+             'asset.id': asset_id}
+
+    return await conn.run(
+        conn.collection('transactions').aggregate([
+            {'$match': query},
+            {'$project': {'_id': False}}
+        ]))
+
+
+@register_query(AsyncLocalMongoDBConnection)
+async def get_latest_abci_chain(conn):
+    return await conn.run(
+        conn.collection('abci_chains')
+        .find_one(projection={'_id': False}, sort=[('height', DESCENDING)]))
@@ -18,16 +18,25 @@ from bigchaindb.backend.connection import Connection
 logger = logging.getLogger(__name__)
 
 
-class LocalMongoDBConnection(Connection):
+class MongoDBConnection(Connection):
+    """Settings shared by the connections to MongoDB."""
 
     def __init__(self, replicaset=None, ssl=None, login=None, password=None,
                  ca_cert=None, certfile=None, keyfile=None,
-                 keyfile_passphrase=None, crlfile=None, **kwargs):
+                 keyfile_passphrase=None, crlfile=None, read_preference=None,
+                 max_time_ms=0, max_pool_size=None, **kwargs):
         """Create a new Connection instance.
 
         Args:
             replicaset (str, optional): the name of the replica set to
                                         connect to.
+            read_preference (str, optional): the MongoDB read preference,
+                                             e.g. ``'secondaryPreferred'``.
+            max_time_ms (int, optional): the milliseconds after which the
+                                         server aborts a read, ``0`` for
+                                         no limit.
+            max_pool_size (int, optional): the maximum number of sockets
+                                           the client opens to each server.
             **kwargs: arbitrary keyword arguments provided by the
                 configuration's ``database`` settings
         """
@@ -42,6 +51,9 @@ class LocalMongoDBConnection(Connection):
         self.keyfile = keyfile or bigchaindb.config['database'].get('keyfile', None)
         self.keyfile_passphrase = keyfile_passphrase or bigchaindb.config['database'].get('keyfile_passphrase', None)
         self.crlfile = crlfile or bigchaindb.config['database'].get('crlfile', None)
+        self.read_preference = read_preference
+        self.max_time_ms = max_time_ms
+        self.max_pool_size = max_pool_size
 
     @property
     def db(self):
@@ -58,7 +70,51 @@ class LocalMongoDBConnection(Connection):
         """
         return self.query()[self.dbname][name]
 
+    def _client_options(self):
+        """Return the keyword arguments of the MongoDB client."""
+
+        options = dict(MONGO_OPTS,
+                       replicaset=self.replicaset,
+                       serverselectiontimeoutms=self.connection_timeout,
+                       ssl=self.ssl)
+        if self.read_preference:
+            options['readPreference'] = self.read_preference
+        if self.max_pool_size:
+            options['maxPoolSize'] = self.max_pool_size
+        # The presence of ca_cert, certfile, keyfile, crlfile implies the
+        # use of certificates for TLS connectivity.
+        if self.ca_cert is not None and self.certfile is not None and \
+                self.keyfile is not None and self.crlfile is not None:
+            options.update(ssl_ca_certs=self.ca_cert,
+                           ssl_certfile=self.certfile,
+                           ssl_keyfile=self.keyfile,
+                           ssl_pem_passphrase=self.keyfile_passphrase,
+                           ssl_crlfile=self.crlfile,
+                           ssl_cert_reqs=CERT_REQUIRED)
+        return options
+
+    def _limit_time(self, query):
+        """Give the reads of a lazy query the time limit of the
+        connection.
+        """
+
+        if self.max_time_ms:
+            stack = query.stack
+            for i, name in enumerate(stack[:-1]):
+                if isinstance(name, str) and name in MAX_TIME_ARGUMENTS \
+                        and not isinstance(stack[i + 1], str):
+                    args, kwargs = stack[i + 1]
+                    kwargs = dict(kwargs)
+                    kwargs.setdefault(MAX_TIME_ARGUMENTS[name],
+                                      self.max_time_ms)
+                    stack[i + 1] = (args, kwargs)
+        return query
+
+
+class LocalMongoDBConnection(MongoDBConnection):
+
     def run(self, query):
+        self._limit_time(query)
         try:
             try:
                 return query.run(self.conn)
@@ -90,35 +146,16 @@ class LocalMongoDBConnection(Connection):
             # FYI: the connection process might raise a
             # `ServerSelectionTimeoutError`, that is a subclass of
             # `ConnectionFailure`.
-            # The presence of ca_cert, certfile, keyfile, crlfile implies the
-            # use of certificates for TLS connectivity.
-            if self.ca_cert is None or self.certfile is None or \
-                    self.keyfile is None or self.crlfile is None:
-                client = pymongo.MongoClient(self.host,
-                                             self.port,
-                                             replicaset=self.replicaset,
-                                             serverselectiontimeoutms=self.connection_timeout,
-                                             ssl=self.ssl,
-                                             **MONGO_OPTS)
-                if self.login is not None and self.password is not None:
-                    client[self.dbname].authenticate(self.login, self.password)
-            else:
+            options = self._client_options()
+            if 'ssl_ca_certs' in options:
                 logger.info('Connecting to MongoDB over TLS/SSL...')
-                client = pymongo.MongoClient(self.host,
-                                             self.port,
-                                             replicaset=self.replicaset,
-                                             serverselectiontimeoutms=self.connection_timeout,
-                                             ssl=self.ssl,
-                                             ssl_ca_certs=self.ca_cert,
-                                             ssl_certfile=self.certfile,
-                                             ssl_keyfile=self.keyfile,
-                                             ssl_pem_passphrase=self.keyfile_passphrase,
-                                             ssl_crlfile=self.crlfile,
-                                             ssl_cert_reqs=CERT_REQUIRED,
-                                             **MONGO_OPTS)
+            client = pymongo.MongoClient(self.host, self.port, **options)
+            if 'ssl_ca_certs' in options:
                 if self.login is not None:
                     client[self.dbname].authenticate(self.login,
                                                      mechanism='MONGODB-X509')
+            elif self.login is not None and self.password is not None:
+                client[self.dbname].authenticate(self.login, self.password)
 
             return client
 
@@ -130,6 +167,80 @@ class LocalMongoDBConnection(Connection):
             raise ConfigurationError from exc
 
 
+class AsyncLocalMongoDBConnection(MongoDBConnection):
+    """A connection to MongoDB for code running on an asyncio event loop.
+
+    The client is a Motor client, created on first use and bound to the
+    event loop running at that time. It pools its sockets, so that many
+    queries can run concurrently over a single connection object.
+    :meth:`run` is a coroutine, and so are the queries registered for this
+    class in :mod:`bigchaindb.backend.localmongodb.async_query`.
+    """
+
+    async def run(self, query):
+        """Run a query and return its result. Cursors are read to the end
+        and returned as lists.
+        """
+
+        # Running a lazy query empties it, keep its chain for the retry.
+        stack = list(self._limit_time(query).stack)
+        try:
+            try:
+                return await self._run(query)
+            except pymongo.errors.AutoReconnect as exc:
+                logger.warning('Lost connection to the database, '
+                               'retrying query.')
+                query.stack = stack
+                return await self._run(query)
+        except pymongo.errors.AutoReconnect as exc:
+            raise ConnectionError from exc
+        except pymongo.errors.DuplicateKeyError as exc:
+            raise DuplicateKeyError from exc
+        except pymongo.errors.OperationFailure as exc:
+            raise OperationError from exc
+
+    async def _run(self, query):
+        result = query.run(self.conn)
+        if hasattr(result, 'to_list'):
+            return await result.to_list(length=None)
+        return await result
+
+    def _connect(self):
+        """Create the Motor client. Motor connects in the background, so
+        connection failures are raised by the first query instead.
+
+        Raises:
+            :exc:`~ConfigurationError`: If there is a ConfigurationError
+                while creating the client.
+        """
+
+        import motor.motor_asyncio
+
+        options = self._client_options()
+        if 'ssl_ca_certs' in options:
+            if self.login is not None:
+                options.update(username=self.login,
+                               authMechanism='MONGODB-X509')
+        elif self.login is not None and self.password is not None:
+            options.update(username=self.login, password=self.password,
+                           authSource=self.dbname)
+
+        try:
+            return motor.motor_asyncio.AsyncIOMotorClient(self.host,
+                                                          self.port,
+                                                          **options)
+        except pymongo.errors.ConfigurationError as exc:
+            raise ConfigurationError from exc
+
+
 MONGO_OPTS = {
     'socketTimeoutMS': 20000,
 }
+
+# The collection methods reading from the database, and the name of their
+# argument limiting the time the server spends on them.
+MAX_TIME_ARGUMENTS = {
+    'find': 'max_time_ms',
+    'find_one': 'max_time_ms',
+    'aggregate': 'maxTimeMS',
+}
@@ -4,7 +4,7 @@
 
 """Query implementation for MongoDB"""
 
-from pymongo import DESCENDING
+from pymongo import ASCENDING, DESCENDING, UpdateOne
 
 from bigchaindb import backend
 from bigchaindb.backend.exceptions import DuplicateKeyError
@@ -200,6 +200,16 @@ def get_block(conn, block_id):
                   projection={'_id': False}))
 
 
+@register_query(LocalMongoDBConnection)
+def get_blocks(conn, from_height, limit):
+    return list(conn.run(
+        conn.collection('blocks')
+        .find({'height': {'$gte': from_height}},
+              projection={'_id': False})
+        .sort('height', ASCENDING)
+        .limit(limit)))
+
+
 @register_query(LocalMongoDBConnection)
 def get_block_with_transaction(conn, txid):
     return conn.run(
@@ -321,6 +331,46 @@ def get_election(conn, election_id):
     return next(cursor, None)
 
 
+@register_query(LocalMongoDBConnection)
+def increment_vote_tallies(conn, votes):
+    return conn.run(
+        conn.collection('vote_tallies').bulk_write([
+            UpdateOne({'election_id': election_id},
+                      {'$inc': {'votes': count}},
+                      upsert=True)
+            for election_id, count in votes.items()]))
+
+
+@register_query(LocalMongoDBConnection)
+def store_vote_tally(conn, tally):
+    return conn.run(
+        conn.collection('vote_tallies').replace_one(
+            {'election_id': tally['election_id']},
+            tally,
+            upsert=True
+        )
+    )
+
+
+@register_query(LocalMongoDBConnection)
+def insert_vote_tally(conn, tally):
+    return conn.run(
+        conn.collection('vote_tallies').update_one(
+            {'election_id': tally['election_id']},
+            {'$setOnInsert': {'votes': tally['votes']}},
+            upsert=True
+        )
+    )
+
+
+@register_query(LocalMongoDBConnection)
+def get_vote_tally(conn, election_id):
+    return conn.run(
+        conn.collection('vote_tallies')
+        .find_one({'election_id': election_id}, projection={'_id': False})
+    )
+
+
 @register_query(LocalMongoDBConnection)
 def get_asset_tokens_for_public_key(conn, asset_id, public_key):
     query = {'outputs.public_keys': [public_key],
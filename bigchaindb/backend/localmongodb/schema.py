@@ -54,6 +54,9 @@ INDEXES = {
         ('height', dict(name='height', unique=True)),
         ('chain_id', dict(name='chain_id', unique=True)),
     ],
+    'vote_tallies': [
+        ('election_id', dict(name='election_id', unique=True)),
+    ],
 }
 
 
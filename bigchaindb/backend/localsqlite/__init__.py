@@ -0,0 +1,28 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""SQLite backend implementation.
+
+Contains a SQLite-specific implementation of the
+:mod:`~bigchaindb.backend.schema` and :mod:`~bigchaindb.backend.query` interfaces.
+
+SQLite is an embedded database: it needs no server, and is meant for nodes
+whose ABCI application and web API run on a single host. You can specify
+BigchainDB to use it as its database backend by either setting
+``database.backend`` to ``'localsqlite'`` in your configuration file, or
+setting the ``BIGCHAINDB_DATABASE_BACKEND`` environment variable to
+``'localsqlite'``. The ``database.name`` is then the path to the database
+file.
+
+If configured to use SQLite, BigchainDB will automatically return instances
+of :class:`~bigchaindb.backend.localsqlite.connection.LocalSQLiteConnection`
+for :func:`~bigchaindb.backend.connection.connect` and dispatch calls of the
+generic backend interfaces to the implementations in this module.
+"""
+
+# Register the single dispatched modules on import.
+from bigchaindb.backend.localsqlite import schema, query # noqa
+
+# LocalSQLiteConnection should always be accessed via
+# ``bigchaindb.backend.connect()``.
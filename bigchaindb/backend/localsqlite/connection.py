@@ -0,0 +1,109 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import logging
+import os
+import sqlite3
+import threading
+
+from bigchaindb.backend.connection import Connection
+from bigchaindb.backend.exceptions import (DuplicateKeyError,
+                                           OperationError,
+                                           ConnectionError)
+
+logger = logging.getLogger(__name__)
+
+
+class LocalSQLiteConnection(Connection):
+    """A connection to a SQLite database file, ``dbname``.
+
+    SQLite connections can't be shared between threads or processes, so
+    each thread of each process opens its own, on first use. The database
+    runs in WAL mode: the ABCI application writes while the web API
+    workers read.
+    """
+
+    def __init__(self, **kwargs):
+        """Create a new Connection instance.
+
+        Args:
+            **kwargs: arbitrary keyword arguments provided by the
+                configuration's ``database`` settings. The
+                ``connection_timeout`` is the number of milliseconds to
+                wait for a lock on the database.
+        """
+
+        super().__init__(**kwargs)
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.conn = self._connect()
+            local.pid = os.getpid()
+        return local.conn
+
+    def run(self, query, *, write=False):
+        """Run a query.
+
+        Args:
+            query (callable): a function taking the :class:`sqlite3.Connection`
+                to query.
+            write (bool): run the query in a transaction holding the write
+                lock, committed if the query succeeds.
+
+        Raises:
+            :exc:`~DuplicateKeyError`: If the query fails because of a
+                unique constraint.
+            :exc:`~OperationError`: If the query fails for any other
+                reason.
+        """
+
+        db = self.conn
+        try:
+            if not write:
+                return query(db)
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                result = query(db)
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+            return result
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateKeyError(str(exc)) from exc
+        except sqlite3.Error as exc:
+            raise OperationError(str(exc)) from exc
+
+    def close(self):
+        """Close the connection of the current thread, if any."""
+
+        if getattr(self._local, 'pid', None) == os.getpid():
+            self._local.conn.close()
+        self._local = threading.local()
+
+    def _connect(self):
+        """Open the database file, creating it if needed.
+
+        Raises:
+            :exc:`~ConnectionError`: If the database can't be opened.
+        """
+
+        try:
+            # Transactions are handled by :meth:`run`.
+            db = sqlite3.connect(self.dbname,
+                                 timeout=self.connection_timeout / 1000,
+                                 isolation_level=None,
+                                 check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            # In WAL mode, a crash can't corrupt the database, and committed
+            # transactions are only lost on power loss. The ABCI application
+            # replays those from Tendermint on restart.
+            db.execute('PRAGMA synchronous=NORMAL')
+            return db
+        except sqlite3.Error as exc:
+            logger.info('Exception in _connect(): {}'.format(exc))
+            raise ConnectionError(str(exc)) from exc
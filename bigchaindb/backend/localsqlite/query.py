@@ -0,0 +1,441 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Query implementation for SQLite.
+
+The queries have the same semantics as the ones in
+:mod:`bigchaindb.backend.localmongodb.query`, except that results are
+returned as lists, in insertion order.
+"""
+
+import rapidjson
+
+from bigchaindb import backend
+from bigchaindb.backend.exceptions import DuplicateKeyError
+from bigchaindb.backend.utils import fold, module_dispatch_registrar, parse_search
+from bigchaindb.backend.localsqlite.connection import LocalSQLiteConnection
+from bigchaindb.common.transaction import Transaction
+
+register_query = module_dispatch_registrar(backend.query)
+
+# SQLite limits the number of parameters of a statement
+CHUNK_SIZE = 400
+
+
+def _dumps(doc):
+    return rapidjson.dumps(doc, ensure_ascii=False)
+
+
+def _loads(doc):
+    return rapidjson.loads(doc)
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _find_in(db, table, column, values):
+    rows = []
+    for chunk in _chunks(values):
+        rows.extend(db.execute(
+            'SELECT rowid, doc FROM {} WHERE {} IN ({})'
+            .format(table, column, ', '.join('?' * len(chunk))), chunk))
+    return [_loads(doc) for _, doc in sorted(rows)]
+
+
+def _find_one(db, sql, *parameters):
+    row = db.execute(sql, parameters).fetchone()
+    return _loads(row[0]) if row else None
+
+
+def _replace_one(db, table, doc, key, **columns):
+    columns['doc'] = _dumps(doc)
+    cursor = db.execute(
+        'UPDATE {} SET {} WHERE {} = :{}'.format(
+            table, ', '.join('{0} = :{0}'.format(c) for c in columns),
+            key, key),
+        columns)
+    if not cursor.rowcount:
+        db.execute('INSERT INTO {} ({}) VALUES ({})'.format(
+            table, ', '.join(columns), ', '.join(':' + c for c in columns)),
+            columns)
+
+
+def _insert_unordered(conn, table, docs):
+    """Insert the documents with a new ``id``, then raise if any was a
+    duplicate, like an unordered ``insert_many`` in MongoDB."""
+
+    rows = [(doc['id'], _dumps(doc)) for doc in docs]
+    written = conn.run(
+        lambda db: db.executemany(
+            'INSERT OR IGNORE INTO {} (id, doc) VALUES (?, ?)'.format(table),
+            rows).rowcount,
+        write=True)
+    if written < len(rows):
+        raise DuplicateKeyError('{} of {} documents in `{}` are duplicates'
+                                .format(len(rows) - written, len(rows), table))
+    return written
+
+
+@register_query(LocalSQLiteConnection)
+def store_transactions(conn, signed_transactions):
+    rows = [(tx['id'], tx['operation'], (tx.get('asset') or {}).get('id'),
+             _dumps(tx))
+            for tx in signed_transactions]
+    return conn.run(
+        lambda db: db.executemany(
+            'INSERT INTO transactions (id, operation, asset_id, doc) '
+            'VALUES (?, ?, ?, ?)', rows).rowcount,
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_transaction(conn, transaction_id):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM transactions WHERE id = ?', transaction_id))
+
+
+@register_query(LocalSQLiteConnection)
+def get_transactions(conn, transaction_ids):
+    return conn.run(
+        lambda db: _find_in(db, 'transactions', 'id', transaction_ids))
+
+
+@register_query(LocalSQLiteConnection)
+def store_metadatas(conn, metadata):
+    return _insert_unordered(conn, 'metadata', metadata)
+
+
+@register_query(LocalSQLiteConnection)
+def get_metadata(conn, transaction_ids):
+    return conn.run(lambda db: _find_in(db, 'metadata', 'id', transaction_ids))
+
+
+@register_query(LocalSQLiteConnection)
+def store_asset(conn, asset):
+    return conn.run(
+        lambda db: db.execute(
+            'INSERT OR IGNORE INTO assets (id, doc) VALUES (?, ?)',
+            (asset['id'], _dumps(asset))).rowcount,
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def store_assets(conn, assets):
+    return _insert_unordered(conn, 'assets', assets)
+
+
+@register_query(LocalSQLiteConnection)
+def get_asset(conn, asset_id):
+    asset = conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM assets WHERE id = ?', asset_id))
+    if asset is not None:
+        del asset['id']
+    return asset
+
+
+@register_query(LocalSQLiteConnection)
+def get_assets(conn, asset_ids):
+    return conn.run(lambda db: _find_in(db, 'assets', 'id', asset_ids))
+
+
+@register_query(LocalSQLiteConnection)
+def get_spent(conn, transaction_id, output):
+    return conn.run(lambda db: [_loads(doc) for doc, in db.execute(
+        'SELECT doc FROM transactions WHERE rowid IN ('
+        '    SELECT tx_rowid FROM transaction_inputs'
+        '    WHERE fulfills_transaction_id = ?'
+        '    AND fulfills_output_index = ?) '
+        'ORDER BY rowid', (transaction_id, output))])
+
+
+@register_query(LocalSQLiteConnection)
+def get_latest_block(conn):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM blocks ORDER BY height DESC LIMIT 1'))
+
+
+@register_query(LocalSQLiteConnection)
+def store_block(conn, block):
+    return conn.run(
+        lambda db: db.execute(
+            'INSERT OR IGNORE INTO blocks (height, doc) VALUES (?, ?)',
+            (block['height'], _dumps(block))).rowcount,
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_txids_filtered(conn, asset_id, operation=None):
+    match_create = "(operation = 'CREATE' AND id = :asset_id)"
+    match_transfer = "(operation = 'TRANSFER' AND asset_id = :asset_id)"
+
+    if operation == Transaction.CREATE:
+        match = match_create
+    elif operation == Transaction.TRANSFER:
+        match = match_transfer
+    else:
+        match = '{} OR {}'.format(match_create, match_transfer)
+
+    return conn.run(lambda db: [txid for txid, in db.execute(
+        'SELECT id FROM transactions WHERE {} ORDER BY rowid'.format(match),
+        {'asset_id': asset_id})])
+
+
+@register_query(LocalSQLiteConnection)
+def text_search(conn, search, *, language='english', case_sensitive=False,
+                diacritic_sensitive=False, text_score=False, limit=0, table='assets'):
+    # The index stems English words, whatever the ``language``. It is case
+    # and diacritic insensitive; sensitive searches filter its results.
+    phrases, terms, negations = parse_search(search)
+    matches = phrases or terms
+    if not matches:
+        return []
+
+    def quote(string):
+        return '"{}"'.format(string.replace('"', '""'))
+
+    expression = (' AND ' if phrases else ' OR ').join(map(quote, matches))
+    if negations:
+        expression = '({}) NOT ({})'.format(
+            expression, ' OR '.join(map(quote, negations)))
+
+    sensitive = case_sensitive or diacritic_sensitive
+    if sensitive:
+        matches = [fold(match, case_sensitive, diacritic_sensitive)
+                   for match in matches]
+
+    def search_index(db):
+        results = []
+        for text, doc, score in db.execute(
+                'SELECT {0}_text.text, {0}.doc, -bm25({0}_text) '
+                'FROM {0}_text JOIN {0} ON {0}.rowid = {0}_text.rowid '
+                'WHERE {0}_text MATCH ? ORDER BY bm25({0}_text)'.format(table),
+                (expression,)):
+            if sensitive:
+                text = fold(text, case_sensitive, diacritic_sensitive)
+                if not (all if phrases else any)(m in text for m in matches):
+                    continue
+            doc = _loads(doc)
+            if text_score:
+                doc['score'] = score
+            results.append(doc)
+            if len(results) == limit:
+                break
+        return results
+
+    return conn.run(search_index)
+
+
+@register_query(LocalSQLiteConnection)
+def get_owned_ids(conn, owner):
+    return conn.run(lambda db: [_loads(doc) for doc, in db.execute(
+        'SELECT doc FROM transactions WHERE rowid IN ('
+        '    SELECT tx_rowid FROM transaction_outputs WHERE public_key = ?) '
+        'ORDER BY rowid', (owner,))])
+
+
+@register_query(LocalSQLiteConnection)
+def get_spending_transactions(conn, inputs):
+    def find(db):
+        rows = {}
+        for chunk in _chunks(inputs, CHUNK_SIZE // 2):
+            parameters = [value for fulfills in chunk
+                          for value in (fulfills['transaction_id'],
+                                        fulfills['output_index'])]
+            rows.update(db.execute(
+                'SELECT rowid, doc FROM transactions WHERE rowid IN ('
+                '    SELECT tx_rowid FROM transaction_inputs'
+                '    WHERE (fulfills_transaction_id, fulfills_output_index)'
+                '    IN (VALUES {}))'.format(', '.join(['(?, ?)'] * len(chunk))),
+                parameters))
+        return [_loads(rows[rowid]) for rowid in sorted(rows)]
+
+    return conn.run(find)
+
+
+@register_query(LocalSQLiteConnection)
+def get_block(conn, block_id):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM blocks WHERE height = ?', block_id))
+
+
+@register_query(LocalSQLiteConnection)
+def get_blocks(conn, from_height, limit):
+    return conn.run(lambda db: [_loads(doc) for doc, in db.execute(
+        'SELECT doc FROM blocks WHERE height >= ? ORDER BY height LIMIT ?',
+        (from_height, limit))])
+
+
+@register_query(LocalSQLiteConnection)
+def get_block_with_transaction(conn, txid):
+    return conn.run(lambda db: [{'height': height} for height, in db.execute(
+        'SELECT height FROM block_transactions WHERE transaction_id = ?',
+        (txid,))])
+
+
+@register_query(LocalSQLiteConnection)
+def delete_transactions(conn, txn_ids):
+    def delete(db):
+        for chunk in _chunks(txn_ids):
+            placeholders = ', '.join('?' * len(chunk))
+            for table in ('assets', 'metadata', 'transactions'):
+                db.execute('DELETE FROM {} WHERE id IN ({})'
+                           .format(table, placeholders), chunk)
+
+    conn.run(delete, write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def store_unspent_outputs(conn, *unspent_outputs):
+    if unspent_outputs:
+        rows = [(utxo['transaction_id'], utxo['output_index'], _dumps(utxo))
+                for utxo in unspent_outputs]
+        return conn.run(
+            lambda db: db.executemany(
+                'INSERT OR IGNORE INTO utxos '
+                '(transaction_id, output_index, doc) VALUES (?, ?, ?)',
+                rows).rowcount,
+            write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def delete_unspent_outputs(conn, *unspent_outputs):
+    if unspent_outputs:
+        rows = [(utxo['transaction_id'], utxo['output_index'])
+                for utxo in unspent_outputs]
+        return conn.run(
+            lambda db: db.executemany(
+                'DELETE FROM utxos '
+                'WHERE transaction_id = ? AND output_index = ?',
+                rows).rowcount,
+            write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_unspent_outputs(conn, *, query=None):
+    # Only equality on top level fields is supported in ``query``.
+    query = query or {}
+    where = ' AND '.join(['json_extract(doc, ?) = ?'] * len(query)) or '1'
+    parameters = [value for key, value in query.items()
+                  for value in ('$."{}"'.format(key), value)]
+    return conn.run(lambda db: [_loads(doc) for doc, in db.execute(
+        'SELECT doc FROM utxos WHERE {} ORDER BY rowid'.format(where),
+        parameters)])
+
+
+@register_query(LocalSQLiteConnection)
+def store_pre_commit_state(conn, state):
+    conn.run(
+        lambda db: _replace_one(db, 'pre_commit', state, 'commit_id',
+                                commit_id=state['commit_id']),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_pre_commit_state(conn, commit_id):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM pre_commit WHERE commit_id = ?', commit_id))
+
+
+@register_query(LocalSQLiteConnection)
+def store_validator_set(conn, validators_update):
+    conn.run(
+        lambda db: _replace_one(db, 'validators', validators_update, 'height',
+                                height=validators_update['height']),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def store_election_results(conn, election):
+    conn.run(
+        lambda db: _replace_one(db, 'elections', election, 'height',
+                                height=election['height'],
+                                election_id=election['election_id']),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_validator_set(conn, height=None):
+    if height is None:
+        return conn.run(lambda db: _find_one(
+            db, 'SELECT doc FROM validators ORDER BY height DESC LIMIT 1'))
+
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM validators WHERE height <= ? '
+            'ORDER BY height DESC LIMIT 1', height))
+
+
+@register_query(LocalSQLiteConnection)
+def get_election(conn, election_id):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM elections WHERE election_id = ?', election_id))
+
+
+@register_query(LocalSQLiteConnection)
+def increment_vote_tallies(conn, votes):
+    def increment(db):
+        for election_id, count in votes.items():
+            cursor = db.execute(
+                'UPDATE vote_tallies SET votes = votes + ? WHERE election_id = ?',
+                (count, election_id))
+            if not cursor.rowcount:
+                db.execute('INSERT INTO vote_tallies (election_id, votes) '
+                           'VALUES (?, ?)', (election_id, count))
+
+    conn.run(increment, write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def store_vote_tally(conn, tally):
+    conn.run(
+        lambda db: db.execute(
+            'INSERT OR REPLACE INTO vote_tallies (election_id, votes) '
+            'VALUES (?, ?)', (tally['election_id'], tally['votes'])),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def insert_vote_tally(conn, tally):
+    conn.run(
+        lambda db: db.execute(
+            'INSERT OR IGNORE INTO vote_tallies (election_id, votes) '
+            'VALUES (?, ?)', (tally['election_id'], tally['votes'])),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_vote_tally(conn, election_id):
+    def find(db):
+        row = db.execute('SELECT votes FROM vote_tallies WHERE election_id = ?',
+                         (election_id,)).fetchone()
+        return {'election_id': election_id, 'votes': row[0]} if row else None
+
+    return conn.run(find)
+
+
+@register_query(LocalSQLiteConnection)
+def get_asset_tokens_for_public_key(conn, asset_id, public_key):
+    return conn.run(lambda db: [_loads(doc) for doc, in db.execute(
+        'SELECT doc FROM transactions WHERE asset_id = ? AND rowid IN ('
+        '    SELECT tx_rowid FROM transaction_outputs'
+        '    WHERE public_key = ? AND sole) '
+        'ORDER BY rowid', (asset_id, public_key))])
+
+
+@register_query(LocalSQLiteConnection)
+def store_abci_chain(conn, height, chain_id, is_synced=True):
+    conn.run(
+        lambda db: _replace_one(db, 'abci_chains',
+                                {'height': height, 'chain_id': chain_id,
+                                 'is_synced': is_synced},
+                                'height', height=height, chain_id=chain_id),
+        write=True)
+
+
+@register_query(LocalSQLiteConnection)
+def get_latest_abci_chain(conn):
+    return conn.run(lambda db: _find_one(
+        db, 'SELECT doc FROM abci_chains ORDER BY height DESC LIMIT 1'))
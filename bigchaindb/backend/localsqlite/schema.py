@@ -0,0 +1,193 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Utils to initialize and drop the database.
+
+Documents are stored as JSON, next to the columns they are looked up by.
+The indexes on lists (the inputs and outputs of a transaction, the
+transactions of a block) and the text indexes live in side tables, which
+triggers keep in sync with the documents.
+"""
+
+import logging
+import os
+
+from bigchaindb import backend
+from bigchaindb.backend.utils import module_dispatch_registrar
+from bigchaindb.backend.localsqlite.connection import LocalSQLiteConnection
+from bigchaindb.common.exceptions import DatabaseDoesNotExist
+
+
+logger = logging.getLogger(__name__)
+register_schema = module_dispatch_registrar(backend.schema)
+
+
+# Like the ``$**`` text indexes of MongoDB, the text indexes cover every
+# string in the documents.
+TEXT_INDEX = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS {table}_text USING fts5(
+    text, tokenize = "porter unicode61 remove_diacritics 2");
+CREATE TRIGGER IF NOT EXISTS {table}_text_insert AFTER INSERT ON {table}
+BEGIN
+    INSERT INTO {table}_text (rowid, text)
+        SELECT new.rowid, group_concat(value, ' ') FROM json_tree(new.doc)
+        WHERE type = 'text';
+END;
+CREATE TRIGGER IF NOT EXISTS {table}_text_delete AFTER DELETE ON {table}
+BEGIN
+    DELETE FROM {table}_text WHERE rowid = old.rowid;
+END;
+'''
+
+TABLES = {
+    'transactions': '''
+        CREATE TABLE IF NOT EXISTS transactions (
+            id NOT NULL, operation TEXT, asset_id, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS transactions_transaction_id
+            ON transactions (id);
+        CREATE INDEX IF NOT EXISTS transactions_asset_id
+            ON transactions (asset_id);
+
+        CREATE TABLE IF NOT EXISTS transaction_inputs (
+            tx_rowid INTEGER NOT NULL,
+            fulfills_transaction_id, fulfills_output_index);
+        CREATE INDEX IF NOT EXISTS transactions_inputs
+            ON transaction_inputs (fulfills_transaction_id,
+                                   fulfills_output_index);
+        CREATE INDEX IF NOT EXISTS transaction_inputs_tx_rowid
+            ON transaction_inputs (tx_rowid);
+
+        CREATE TABLE IF NOT EXISTS transaction_outputs (
+            tx_rowid INTEGER NOT NULL, public_key, sole INTEGER);
+        CREATE INDEX IF NOT EXISTS transactions_outputs
+            ON transaction_outputs (public_key);
+        CREATE INDEX IF NOT EXISTS transaction_outputs_tx_rowid
+            ON transaction_outputs (tx_rowid);
+
+        CREATE TRIGGER IF NOT EXISTS transactions_insert
+        AFTER INSERT ON transactions
+        BEGIN
+            INSERT INTO transaction_inputs
+                SELECT new.rowid,
+                       json_extract(value, '$.fulfills.transaction_id'),
+                       json_extract(value, '$.fulfills.output_index')
+                FROM json_each(new.doc, '$.inputs')
+                WHERE json_type(value, '$.fulfills') = 'object';
+            INSERT INTO transaction_outputs
+                SELECT DISTINCT new.rowid, public_keys.value,
+                       json_array_length(outputs.value, '$.public_keys') = 1
+                FROM json_each(new.doc, '$.outputs') AS outputs,
+                     json_each(outputs.value, '$.public_keys') AS public_keys;
+        END;
+        CREATE TRIGGER IF NOT EXISTS transactions_delete
+        AFTER DELETE ON transactions
+        BEGIN
+            DELETE FROM transaction_inputs WHERE tx_rowid = old.rowid;
+            DELETE FROM transaction_outputs WHERE tx_rowid = old.rowid;
+        END;
+    ''',
+    'assets': '''
+        CREATE TABLE IF NOT EXISTS assets (id NOT NULL, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS assets_asset_id ON assets (id);
+    ''' + TEXT_INDEX.format(table='assets'),
+    'blocks': '''
+        CREATE TABLE IF NOT EXISTS blocks (
+            height INTEGER PRIMARY KEY, doc TEXT NOT NULL);
+
+        CREATE TABLE IF NOT EXISTS block_transactions (
+            transaction_id NOT NULL, height INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS blocks_transactions
+            ON block_transactions (transaction_id);
+
+        CREATE TRIGGER IF NOT EXISTS blocks_insert AFTER INSERT ON blocks
+        BEGIN
+            INSERT INTO block_transactions
+                SELECT value, new.height
+                FROM json_each(new.doc, '$.transactions');
+        END;
+    ''',
+    'metadata': '''
+        CREATE TABLE IF NOT EXISTS metadata (id NOT NULL, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS metadata_transaction_id
+            ON metadata (id);
+    ''' + TEXT_INDEX.format(table='metadata'),
+    'utxos': '''
+        CREATE TABLE IF NOT EXISTS utxos (
+            transaction_id NOT NULL, output_index NOT NULL,
+            doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS utxos_utxo
+            ON utxos (transaction_id, output_index);
+    ''',
+    'pre_commit': '''
+        CREATE TABLE IF NOT EXISTS pre_commit (
+            commit_id NOT NULL, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS pre_commit_pre_commit_id
+            ON pre_commit (commit_id);
+    ''',
+    'elections': '''
+        CREATE TABLE IF NOT EXISTS elections (
+            election_id NOT NULL, height INTEGER, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS elections_election_id
+            ON elections (election_id);
+    ''',
+    'validators': '''
+        CREATE TABLE IF NOT EXISTS validators (
+            height INTEGER NOT NULL, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS validators_height
+            ON validators (height);
+    ''',
+    'abci_chains': '''
+        CREATE TABLE IF NOT EXISTS abci_chains (
+            height INTEGER NOT NULL, chain_id NOT NULL, doc TEXT NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS abci_chains_height
+            ON abci_chains (height);
+        CREATE UNIQUE INDEX IF NOT EXISTS abci_chains_chain_id
+            ON abci_chains (chain_id);
+    ''',
+    'vote_tallies': '''
+        CREATE TABLE IF NOT EXISTS vote_tallies (
+            election_id NOT NULL, votes INTEGER NOT NULL);
+        CREATE UNIQUE INDEX IF NOT EXISTS vote_tallies_election_id
+            ON vote_tallies (election_id);
+    ''',
+}
+
+
+def _connect(conn, dbname):
+    """Return a connection to the database file ``dbname``, which may not
+    be the one of ``conn``."""
+
+    if dbname == conn.dbname:
+        return conn
+    return LocalSQLiteConnection(dbname=dbname,
+                                 connection_timeout=conn.connection_timeout,
+                                 max_tries=conn.max_tries)
+
+
+@register_schema(LocalSQLiteConnection)
+def create_database(conn, dbname):
+    logger.info('Create database `%s`.', dbname)
+    # Opening the database creates the file
+    _connect(conn, dbname).conn
+
+
+@register_schema(LocalSQLiteConnection)
+def create_tables(conn, dbname):
+    conn = _connect(conn, dbname)
+    for table_name in backend.schema.TABLES:
+        logger.info(f'Create `{table_name}` table.')
+        conn.run(lambda db: db.executescript(TABLES[table_name]))
+
+
+@register_schema(LocalSQLiteConnection)
+def drop_database(conn, dbname):
+    if not os.path.exists(dbname):
+        raise DatabaseDoesNotExist(f'Database `{dbname}` does not exist')
+
+    _connect(conn, dbname).close()
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(dbname + suffix)
+        except FileNotFoundError:
+            pass
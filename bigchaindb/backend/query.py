@@ -164,6 +164,21 @@ def get_block(connection, block_id):
     raise NotImplementedError
 
 
+@singledispatch
+def get_blocks(connection, from_height, limit):
+    """Get the blocks from a height, in ascending order of height.
+
+    Args:
+        from_height (int): the height of the first block to get.
+        limit (int): the maximum number of blocks to get.
+
+    Returns:
+        A list of blocks, with at most ``limit`` of them.
+    """
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_block_with_transaction(connection, txid):
     """Get a block containing transaction id `txid`
@@ -375,6 +390,48 @@ def get_election(conn, election_id):
     raise NotImplementedError
 
 
+@singledispatch
+def increment_vote_tallies(conn, votes):
+    """Add votes to the tallies of elections.
+
+    Args:
+        votes (dict): the number of votes to add, by election id.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def store_vote_tally(conn, tally):
+    """Replace the tally of the votes of an election.
+
+    Args:
+        tally (dict): the ``election_id`` and the number of ``votes``.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def insert_vote_tally(conn, tally):
+    """Store the tally of the votes of an election, unless it has one
+    already.
+
+    Args:
+        tally (dict): the ``election_id`` and the number of ``votes``.
+    """
+
+    raise NotImplementedError
+
+
+@singledispatch
+def get_vote_tally(conn, election_id):
+    """Return the tally of the committed votes of an election, or
+    ``None`` if it has none."""
+
+    raise NotImplementedError
+
+
 @singledispatch
 def get_asset_tokens_for_public_key(connection, asset_id, public_key):
     """Retrieve a list of tokens of type `asset_id` that are owned by the `public_key`.
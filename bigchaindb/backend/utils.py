@@ -2,6 +2,11 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import re
+import unicodedata
+
+SEARCH_TOKENS = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
 
 class ModuleDispatchRegistrationError(Exception):
     """Raised when there is a problem registering dispatched functions for a
@@ -24,3 +29,34 @@ def module_dispatch_registrar(module):
                          func=func_name, module=module.__name__)) from ex
         return wrapper
     return dispatch_wrapper
+
+
+def parse_search(search):
+    """Split a MongoDB ``$search`` string in phrases, terms and negated
+    terms.
+
+    Like in MongoDB, documents match if they contain all the phrases, or
+    any of the terms if there are no phrases, and none of the negated
+    terms.
+    """
+
+    phrases, terms, negations = [], [], []
+    for negated_phrase, phrase, negated_term, term in SEARCH_TOKENS.findall(search):
+        if negated_phrase or negated_term:
+            negations.append(phrase or term)
+        elif term:
+            terms.append(term)
+        else:
+            phrases.append(phrase)
+    return phrases, terms, negations
+
+
+def fold(text, case_sensitive=False, diacritic_sensitive=False):
+    """Normalize ``text`` to compare it in a text search."""
+
+    if not case_sensitive:
+        text = text.casefold()
+    text = unicodedata.normalize('NFKD', text)
+    if not diacritic_sensitive:
+        text = ''.join(c for c in text if not unicodedata.combining(c))
+    return text
@@ -16,6 +16,7 @@ import sys
 from bigchaindb.utils import load_node_key
 from bigchaindb.common.exceptions import (DatabaseDoesNotExist,
                                           ValidationError)
+from bigchaindb.elections.election import Election
 from bigchaindb.elections.vote import Vote
 import bigchaindb
 from bigchaindb import (backend, ValidatorElection,
@@ -258,7 +259,13 @@ def run_recover(b):
         # NOTE: the pre-commit state can only be ahead of the commited state
         # by 1 block
         if latest_block and (latest_block['height'] < pre_commit['height']):
+            # The votes of the transactions may have been tallied already
+            election_ids = {tx['asset']['id'] for tx
+                            in query.get_transactions(b.connection, pre_commit['transactions'])
+                            if tx['operation'] == Vote.OPERATION}
             query.delete_transactions(b.connection, pre_commit['transactions'])
+            for election_id in election_ids:
+                Election.recount_votes(b, election_id)
 
 
 @configure_bigchaindb
@@ -297,12 +304,12 @@ def create_parser():
                                           help='Prepare the config file.')
 
     config_parser.add_argument('backend',
-                               choices=['localmongodb'],
+                               choices=['localmongodb', 'localsqlite'],
                                default='localmongodb',
                                const='localmongodb',
                                nargs='?',
-                               help='The backend to use. It can only be '
-                               '"localmongodb", currently.')
+                               help='The backend to use. It can be '
+                               '"localmongodb" or "localsqlite".')
 
     # parser for managing elections
     election_parser = subparsers.add_parser('election',
@@ -27,6 +27,7 @@ from bigchaindb.common.exceptions import (KeypairMismatchException,
                                           InvalidHash, InvalidSignature,
                                           AmountError, AssetIdMismatch,
                                           ThresholdTooDeep)
+from bigchaindb.common import verification_cache
 from bigchaindb.common.utils import serialize
 from .memoize import memoize_from_dict, memoize_to_dict
 
@@ -1032,7 +1033,7 @@ class Transaction(object):
         """
         ccffill = input_.fulfillment
         try:
-            parsed_ffill = Fulfillment.from_uri(ccffill.serialize_uri())
+            fulfillment_uri = ccffill.serialize_uri()
         except (TypeError, ValueError,
                 ParsingError, ASN1DecodeError, ASN1EncodeError):
             return False
@@ -1048,13 +1049,32 @@ class Transaction(object):
         if input_.fulfills:
             message.update('{}{}'.format(
                 input_.fulfills.txid, input_.fulfills.output).encode())
+        message = message.digest()
+
+        # NOTE: The same fulfillment might have already been verified by
+        #       another process of the node, e.g. by the web API before
+        #       the transaction reached `check_tx`.
+        cache_key = None
+        if verification_cache.enabled():
+            cache_key = verification_cache.key('fulfillment',
+                                               fulfillment_uri, message)
+            if verification_cache.contains(cache_key):
+                return output_valid
+
+        try:
+            parsed_ffill = Fulfillment.from_uri(fulfillment_uri)
+        except (TypeError, ValueError,
+                ParsingError, ASN1DecodeError, ASN1EncodeError):
+            return False
 
         # NOTE: We pass a timestamp to `.validate`, as in case of a timeout
         #       condition we'll have to validate against it
 
         # cryptoconditions makes no assumptions of the encoding of the
         # message to sign or verify. It only accepts bytestrings
-        ffill_valid = parsed_ffill.validate(message=message.digest())
+        ffill_valid = parsed_ffill.validate(message=message)
+        if ffill_valid and cache_key:
+            verification_cache.add(cache_key)
         return output_valid and ffill_valid
 
     # This function is required by `lru_cache` to create a key for memoization
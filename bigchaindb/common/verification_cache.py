@@ -0,0 +1,136 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Node-wide cache of the stateless checks a transaction passed.
+
+The web API validates every posted transaction, then Tendermint sends it to
+the ABCI application, which validates it again in ``check_tx`` and
+``deliver_tx``. The signatures and the schema of a transaction do not
+depend on the state of the ledger, so once they have been checked by any
+of those processes there is no need to check them again.
+
+The cache is a fixed-size hash table in an anonymous shared memory
+mapping. It must be created with :func:`enable` before the processes of the
+node are forked, so that all of them share it. Only facts that hold
+forever are stored (e.g. "this fulfillment is valid for this message"), as
+truncated digests, and nothing is ever removed: when a bucket is full a
+random entry is overwritten. Reads take no lock, and a write racing with
+another one can at worst lose one of the two entries.
+"""
+
+import mmap
+import os
+
+from sha3 import sha3_256
+
+
+# Every entry is the first ``DIGEST_SIZE`` bytes of the digest of a key,
+# stored in a bucket of ``BUCKET_SLOTS`` entries (one cache line).
+DIGEST_SIZE = 16
+BUCKET_SLOTS = 4
+BUCKET_SIZE = DIGEST_SIZE * BUCKET_SLOTS
+
+_EMPTY = bytes(DIGEST_SIZE)
+
+_cache = None
+
+
+class VerificationCache:
+    """A set of digests backed by a shared memory mapping."""
+
+    def __init__(self, size):
+        """Create a new cache.
+
+        Args:
+            size (int): the number of entries the cache can hold. It is
+                rounded up to a multiple of ``BUCKET_SLOTS``.
+        """
+
+        self.buckets = max(1, -(-size // BUCKET_SLOTS))
+        self.size = self.buckets * BUCKET_SLOTS
+        # Anonymous mappings are shared with the forked children.
+        self._map = mmap.mmap(-1, self.buckets * BUCKET_SIZE)
+
+    def _locate(self, digest):
+        bucket = int.from_bytes(digest[DIGEST_SIZE:DIGEST_SIZE + 8], 'little')
+        return (bucket % self.buckets) * BUCKET_SIZE, digest[:DIGEST_SIZE]
+
+    def __contains__(self, digest):
+        offset, entry = self._locate(digest)
+        bucket = self._map[offset:offset + BUCKET_SIZE]
+        return any(bucket[i:i + DIGEST_SIZE] == entry
+                   for i in range(0, BUCKET_SIZE, DIGEST_SIZE))
+
+    def add(self, digest):
+        """Add ``digest``, a digest returned by :func:`key`."""
+
+        offset, entry = self._locate(digest)
+        bucket = self._map[offset:offset + BUCKET_SIZE]
+        slots = [bucket[i:i + DIGEST_SIZE]
+                 for i in range(0, BUCKET_SIZE, DIGEST_SIZE)]
+        if entry in slots:
+            return
+        if _EMPTY in slots:
+            slot = slots.index(_EMPTY)
+        else:
+            slot = os.urandom(1)[0] % BUCKET_SLOTS
+        start = offset + slot * DIGEST_SIZE
+        self._map[start:start + DIGEST_SIZE] = entry
+
+    def close(self):
+        self._map.close()
+
+
+def key(*parts):
+    """Return the digest identifying the fact described by ``parts``, a
+    sequence of ``bytes`` or ``str``. The first part should name the kind
+    of check, e.g. ``'signature'``.
+    """
+
+    digest = sha3_256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+        digest.update(len(part).to_bytes(8, 'little'))
+        digest.update(part)
+    return digest.digest()
+
+
+def enable(size):
+    """Create the cache shared by this process and the processes it will
+    fork. If ``size`` is ``0`` the cache is disabled.
+    """
+
+    global _cache
+    disable()
+    if size:
+        _cache = VerificationCache(size)
+
+
+def disable():
+    """Stop using the cache in this process."""
+
+    global _cache
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def enabled():
+    """Return ``True`` if the cache is in use in this process."""
+
+    return _cache is not None
+
+
+def contains(digest):
+    """Return ``True`` if the check identified by ``digest`` passed."""
+
+    return _cache is not None and digest in _cache
+
+
+def add(digest):
+    """Record that the check identified by ``digest`` passed."""
+
+    if _cache is not None:
+        _cache.add(digest)
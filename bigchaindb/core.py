@@ -6,7 +6,9 @@
 with Tendermint.
 """
 import logging
+import random
 import sys
+import time
 
 from abci.application import BaseApplication
 from abci.types_pb2 import (
@@ -19,7 +21,8 @@ from abci.types_pb2 import (
     ResponseCommit,
 )
 
-from bigchaindb import BigchainDB
+from bigchaindb import BigchainDB, metrics
+from bigchaindb.events import EventTypes, Event
 from bigchaindb.tendermint_utils import (decode_transaction,
                                          calculate_hash)
 from bigchaindb.lib import Block, PreCommitState
@@ -41,8 +44,26 @@ class App(BaseApplication):
     State Machine.
     """
 
-    def __init__(self, bigchaindb=None):
+    def __init__(self, bigchaindb=None, events_queue=None,
+                 tx_events_queue=None, tx_events_sample_rate=1):
+        """Create a new instance.
+
+        Args:
+            bigchaindb (:class:`~bigchaindb.lib.BigchainDB`): the node.
+            events_queue (multiprocessing.Queue): if given, a
+                ``BLOCK_VALID`` event is put in it for each committed
+                block with transactions, once the block is stored.
+            tx_events_queue (multiprocessing.Queue): if given, a
+                ``TX_ACCEPTED`` or ``TX_REJECTED`` event is put in it for
+                a sample of the transactions checked by :meth:`check_tx`
+                and :meth:`deliver_tx`.
+            tx_events_sample_rate (float): the probability for a check
+                to be sampled.
+        """
         self.bigchaindb = bigchaindb or BigchainDB()
+        self.events_queue = events_queue
+        self.tx_events_queue = tx_events_queue
+        self.tx_events_sample_rate = tx_events_sample_rate
         self.block_txn_ids = []
         self.block_txn_hash = ''
         self.block_transactions = []
@@ -137,7 +158,11 @@ class App(BaseApplication):
         logger.benchmark('CHECK_TX_INIT')
         logger.debug('check_tx: %s', raw_transaction)
         transaction = decode_transaction(raw_transaction)
-        if self.bigchaindb.is_valid_transaction(transaction):
+        start = self.tx_event_start()
+        valid, error = self.bigchaindb.check_transaction(transaction)
+        if start is not None:
+            self.put_tx_event('check_tx', transaction, error, start)
+        if valid:
             logger.debug('check_tx: VALID')
             logger.benchmark('CHECK_TX_END, tx_id:%s', transaction['id'])
             return ResponseCheckTx(code=CodeTypeOk)
@@ -146,6 +171,27 @@ class App(BaseApplication):
             logger.benchmark('CHECK_TX_END, tx_id:%s', transaction['id'])
             return ResponseCheckTx(code=CodeTypeError)
 
+    def tx_event_start(self):
+        """Return the time the check of a transaction starts at if it is
+        sampled for a transaction event, else ``None``."""
+
+        if (self.tx_events_queue is not None and
+                random.random() < self.tx_events_sample_rate):
+            return time.perf_counter()
+
+    def put_tx_event(self, stage, transaction, error, start):
+        """Put the event of a transaction checked from ``start``, rejected
+        because of an ``error`` if any."""
+
+        data = {'transaction_id': transaction.get('id'),
+                'stage': stage,
+                'latency': metrics.bucket(time.perf_counter() - start)}
+        if error is None:
+            event = Event(EventTypes.TX_ACCEPTED, data)
+        else:
+            event = Event(EventTypes.TX_REJECTED, dict(data, error=error))
+        self.tx_events_queue.put(event)
+
     def begin_block(self, req_begin_block):
         """Initialize list of transaction.
         Args:
@@ -173,8 +219,12 @@ class App(BaseApplication):
         self.abort_if_abci_chain_is_not_synced()
 
         logger.debug('deliver_tx: %s', raw_transaction)
-        transaction = self.bigchaindb.is_valid_transaction(
-            decode_transaction(raw_transaction), self.block_transactions)
+        decoded = decode_transaction(raw_transaction)
+        start = self.tx_event_start()
+        transaction, error = self.bigchaindb.check_transaction(
+            decoded, self.block_transactions)
+        if start is not None:
+            self.put_tx_event('deliver_tx', decoded, error, start)
 
         if not transaction:
             logger.debug('deliver_tx: INVALID')
@@ -230,6 +280,18 @@ class App(BaseApplication):
 
         data = self.block_txn_hash.encode('utf-8')
 
+        # The transactions are stored without their asset and metadata,
+        # so copy them for the event first
+        # The events carry the Tendermint height of the block, like the
+        # ones read from Tendermint
+        event = None
+        if self.events_queue and self.block_txn_ids:
+            chain_shift = 0 if self.chain is None else self.chain['height']
+            event = Event(EventTypes.BLOCK_VALID, {
+                'height': self.new_height - chain_shift,
+                'transactions': [dict(tx.tx_dict) if tx.tx_dict else tx.to_dict()
+                                 for tx in self.block_transactions]})
+
         # register a new block only when new transactions are received
         if self.block_txn_ids:
             self.bigchaindb.store_bulk_transactions(self.block_transactions)
@@ -240,6 +302,8 @@ class App(BaseApplication):
         # NOTE: storing the block should be the last operation during commit
         # this effects crash recovery. Refer BEP#8 for details
         self.bigchaindb.store_block(block._asdict())
+        if event:
+            self.events_queue.put(event)
 
         logger.debug('Commit-ing new block with hash: apphash=%s ,'
                      'height=%s, txn ids=%s', data, self.new_height,
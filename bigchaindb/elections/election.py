@@ -176,13 +176,54 @@ class Election(Transaction):
                         votes = votes + int(getter(output, 'amount'))
         return votes
 
-    def get_commited_votes(self, bigchain, election_pk=None):
-        if election_pk is None:
-            election_pk = self.to_public_key(self.id)
+    @classmethod
+    def tally_votes(cls, transactions):
+        """Return the number of votes cast by ``transactions``, by
+        election id."""
+
+        votes = {}
+        for txn in transactions:
+            if txn.operation == Vote.OPERATION:
+                election_id = txn.asset['id']
+                count = cls.count_votes(cls.to_public_key(election_id), [txn])
+                if count:
+                    votes[election_id] = votes.get(election_id, 0) + count
+        return votes
+
+    @classmethod
+    def count_committed_votes(cls, bigchain, election_id):
+        """Count the committed votes of an election from its vote
+        transactions."""
+
+        election_pk = cls.to_public_key(election_id)
         txns = list(backend.query.get_asset_tokens_for_public_key(bigchain.connection,
-                                                                  self.id,
+                                                                  election_id,
                                                                   election_pk))
-        return self.count_votes(election_pk, txns, dict.get)
+        return cls.count_votes(election_pk, txns, dict.get)
+
+    @classmethod
+    def recount_votes(cls, bigchain, election_id):
+        """Count the committed votes of an election from its vote
+        transactions, and store the tally."""
+
+        votes = cls.count_committed_votes(bigchain, election_id)
+        backend.query.store_vote_tally(bigchain.connection,
+                                       {'election_id': election_id, 'votes': votes})
+        return votes
+
+    def get_commited_votes(self, bigchain):
+        """Return the number of committed votes, from the tally updated
+        as the votes are stored.
+
+        An election whose votes were all stored before the tallies existed
+        has none, its votes are then counted, but the tally is only stored
+        when its next vote is.
+        """
+
+        tally = backend.query.get_vote_tally(bigchain.connection, self.id)
+        if tally is None:
+            return self.count_committed_votes(bigchain, self.id)
+        return tally['votes']
 
     @classmethod
     def has_concluded(cls, bigchain, election_id, current_votes=[], height=None):
@@ -196,7 +237,7 @@ class Election(Transaction):
 
         if election:
             election_pk = election.to_public_key(election.id)
-            votes_committed = election.get_commited_votes(bigchain, election_pk)
+            votes_committed = election.get_commited_votes(bigchain)
             votes_current = election.count_votes(election_pk, current_votes)
             current_validators = election.get_validators(bigchain, height)
 
@@ -5,13 +5,16 @@
 import asyncio
 import json
 import logging
-import time
+import random
+from concurrent.futures import CancelledError
+from functools import partial
 
 import aiohttp
 
-from bigchaindb import config
+from bigchaindb import backend, config, metrics
 from bigchaindb.common.utils import gen_timestamp
 from bigchaindb.events import EventTypes, Event
+from bigchaindb.lib import read_committed_blocks
 from bigchaindb.tendermint_utils import decode_transaction_base64
 
 
@@ -19,44 +22,159 @@ HOST = config['tendermint']['host']
 PORT = config['tendermint']['port']
 URL = 'ws://{}:{}/websocket'.format(HOST, PORT)
 
-logger = logging.getLogger(__name__)
-
-
-@asyncio.coroutine
-def connect_and_recv(event_queue):
-    session = aiohttp.ClientSession()
-    ws = yield from session.ws_connect(URL)
+# The bounds of the delay before reconnecting to Tendermint, in seconds
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
 
-    logger.info('Connected to tendermint ws server')
+# The number of stored blocks read at once to fill a gap
+BACKFILL_BATCH_SIZE = 100
 
-    stream_id = 'bigchaindb_stream_{}'.format(gen_timestamp())
-    yield from subscribe_events(ws, stream_id)
-
-    while True:
-        msg = yield from ws.receive()
-        process_event(event_queue, msg.data, stream_id)
+logger = logging.getLogger(__name__)
 
-        if msg.type in (aiohttp.WSMsgType.CLOSED,
-                        aiohttp.WSMsgType.ERROR):
-            session.close()
-            raise aiohttp.ClientConnectionError()
 
+def parse_new_block(event, stream_id):
+    """Return the height and the decoded transactions of a ``NewBlock``
+    event of the stream ``stream_id``, or ``None`` for other messages."""
 
-def process_event(event_queue, event, stream_id):
     event_stream_id = stream_id + '#event'
     event = json.loads(event)
 
     if (event['id'] == event_stream_id and event['result']['query'] == 'tm.event=\'NewBlock\''):
         block = event['result']['data']['value']['block']
-        block_id = block['header']['height']
-        block_txs = block['data']['txs']
+        block_txs = block['data']['txs'] or []
+        return {'height': int(block['header']['height']),
+                'transactions': [decode_transaction_base64(txn) for txn in block_txs]}
+
+
+def process_event(event_queue, event, stream_id):
+    new_block = parse_new_block(event, stream_id)
+
+    # Only push non empty blocks
+    if new_block and new_block['transactions']:
+        event_queue.put(Event(EventTypes.BLOCK_VALID, new_block))
+
+
+def backoff(attempt):
+    """Return the seconds to wait before the reconnection ``attempt``
+    (from 0): a random delay up to an exponentially growing bound, so that
+    nodes restarted together don't reconnect together."""
+
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class EventClient:
+    """Forward the blocks committed by Tendermint to an event queue.
+
+    The client reconnects whenever the connection fails, after a delay
+    given by :func:`backoff`. It remembers the height of the last block
+    it got, and when a block comes after a gap, e.g. because the blocks
+    were committed while it was disconnected, it first reads the missing
+    ones from the stored blocks.
+    """
+
+    def __init__(self, event_queue, read_blocks, *, url=None, loop=None):
+        """Create a new client.
+
+        Args:
+            event_queue: the queue to put the events in.
+            read_blocks (callable): a function like
+                :func:`~bigchaindb.lib.read_committed_blocks` without its ``connection``
+                argument. It is run in a thread.
+            url (str): the URL of the websocket of Tendermint.
+        """
+
+        self.event_queue = event_queue
+        self.read_blocks = read_blocks
+        self.url = url or URL
+        self.loop = loop or asyncio.get_event_loop()
+        self.last_height = None
+        self.connected = False
+
+    @asyncio.coroutine
+    def run(self):
+        """Forward the blocks, reconnecting forever."""
+
+        attempt = 0
+        while True:
+            self.connected = False
+            try:
+                yield from self.connect_and_recv()
+            except CancelledError:
+                raise
+            except Exception as e:
+                logger.warning('WebSocket connection failed with exception %s', e)
+
+            if self.connected:
+                attempt = 0
+            delay = backoff(attempt)
+            attempt += 1
+            metrics.counter('event_stream.reconnects').inc()
+            logger.info('Reconnecting to Tendermint in %.1f seconds', delay)
+            yield from asyncio.sleep(delay, loop=self.loop)
+
+    @asyncio.coroutine
+    def connect_and_recv(self):
+        session = aiohttp.ClientSession(loop=self.loop)
+        try:
+            ws = yield from session.ws_connect(self.url)
+            logger.info('Connected to tendermint ws server')
+
+            stream_id = 'bigchaindb_stream_{}'.format(gen_timestamp())
+            yield from subscribe_events(ws, stream_id)
+            self.connected = True
+
+            while True:
+                msg = yield from ws.receive()
+                if msg.type in (aiohttp.WSMsgType.CLOSED,
+                                aiohttp.WSMsgType.ERROR):
+                    raise aiohttp.ClientConnectionError()
+
+                new_block = parse_new_block(msg.data, stream_id)
+                if new_block:
+                    yield from self.deliver(new_block)
+        finally:
+            yield from session.close()
+
+    @asyncio.coroutine
+    def deliver(self, block):
+        """Put the event of a block in the queue, after the ones of the
+        blocks missed since the last one, if any."""
+
+        height = block['height']
+        if self.last_height is not None:
+            if height <= self.last_height:
+                return
+            if height > self.last_height + 1:
+                yield from self.backfill(height)
 
         # Only push non empty blocks
-        if block_txs:
-            block_txs = [decode_transaction_base64(txn) for txn in block_txs]
-            new_block = {'height': block_id, 'transactions': block_txs}
-            event = Event(EventTypes.BLOCK_VALID, new_block)
-            event_queue.put(event)
+        if block['transactions']:
+            self.event_queue.put(Event(EventTypes.BLOCK_VALID, block))
+        self.last_height = height
+
+    @asyncio.coroutine
+    def backfill(self, height):
+        """Put the events of the stored blocks after the last one, up to
+        ``height`` excluded."""
+
+        start = self.last_height + 1
+        logger.info('Reading the blocks from height %s to %s', start, height - 1)
+        while start < height:
+            limit = min(BACKFILL_BATCH_SIZE, height - start)
+            blocks = yield from self.loop.run_in_executor(
+                None, self.read_blocks, start, limit)
+            for block in blocks:
+                if block['transactions']:
+                    self.event_queue.put(Event(EventTypes.BLOCK_VALID, block))
+                    metrics.counter('event_stream.backfilled_blocks').inc()
+                self.last_height = block['height']
+            if len(blocks) < limit:
+                break
+            start = self.last_height + 1
+
+        if self.last_height < height - 1:
+            logger.warning('Missed the blocks from height %s to %s, which '
+                           'are not stored', self.last_height + 1, height - 1)
 
 
 @asyncio.coroutine
@@ -70,20 +188,13 @@ def subscribe_events(ws, stream_id):
     yield from ws.send_str(json.dumps(payload))
 
 
-@asyncio.coroutine
-def try_connect_and_recv(event_queue):
-    try:
-        yield from connect_and_recv(event_queue)
-
-    except Exception as e:
-        logger.warning('WebSocket connection failed with exception %s', e)
-        time.sleep(3)
-        yield from try_connect_and_recv(event_queue)
-
-
 def start(event_queue):
+    metrics.start_logging(logger, 'Tendermint event stream')
     loop = asyncio.get_event_loop()
+    client = EventClient(event_queue, partial(read_committed_blocks,
+                                              backend.connect(), full=True),
+                         loop=loop)
     try:
-        loop.run_until_complete(try_connect_and_recv(event_queue))
+        loop.run_until_complete(client.run())
     except (KeyboardInterrupt, SystemExit):
         logger.info('Shutting down Tendermint event stream connection')
@@ -2,13 +2,44 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import asyncio
+import logging
+import mmap
+import multiprocessing
+import os
+import pickle
+import select
+import struct
+import time
+from collections import namedtuple
 from queue import Empty
-from collections import defaultdict
-from multiprocessing import Queue
 
+from bigchaindb import metrics
 
+
+logger = logging.getLogger(__name__)
 POISON_PILL = 'POISON_PILL'
 
+# The default size of the buffer of an exchange, in bytes
+BUFFER_SIZE = 64 * 1024 * 1024
+# The header of the buffer, see :class:`Exchange`
+HEADER = struct.Struct('<6Q')
+VERSION = struct.Struct('<Q')
+HEADER_SIZE = 64
+# Each event is written as its size and type, then pickled
+RECORD = struct.Struct('<II')
+TYPE_MASK = 0xffffffff
+# The bounds of the backoff of a reader waiting for a publisher to finish
+# updating the header, and how long it waits, in seconds
+HEADER_MIN_BACKOFF = 0.00001
+HEADER_MAX_BACKOFF = 0.001
+HEADER_TIMEOUT = 5
+# How long a publisher waits for the lock before taking it over, in seconds
+LOCK_TIMEOUT = 1
+
+Header = namedtuple('Header', ('version', 'head', 'head_seq', 'tail',
+                               'tail_seq', 'started'))
+
 
 class EventTypes:
     """Container class that holds all the possible
@@ -20,9 +51,10 @@ class EventTypes:
     ALL = ~0
     BLOCK_VALID = 1
     BLOCK_INVALID = 2
-    # NEW_EVENT = 4
-    # NEW_EVENT = 8
-    # NEW_EVENT = 16...
+    TX_ACCEPTED = 4
+    TX_REJECTED = 8
+    # NEW_EVENT = 16
+    # NEW_EVENT = 32...
 
 
 class Event:
@@ -42,67 +74,319 @@ class Event:
 
 
 class Exchange:
-    """Dispatch events to subscribers."""
+    """Dispatch events to subscribers, through a ring buffer in memory
+    shared by the processes forked after the exchange is created.
+
+    Each event is pickled once by the publisher and written to the
+    buffer, after the previous one. Every subscriber reads the events
+    from the buffer with its own cursor, and is woken up by a byte
+    written to a pipe of its own. When the buffer is full, the oldest
+    events are overwritten: a subscriber lagging behind by more than
+    the size of the buffer loses them.
+
+    Several processes may publish, the events of each one are written
+    in turn, under a lock. Writing an event takes far less than
+    ``LOCK_TIMEOUT``: a publisher waiting longer for the lock assumes the
+    publisher holding it died, and takes the lock over rather than
+    stalling the others forever.
 
-    def __init__(self):
-        self.publisher_queue = Queue()
-        self.started_queue = Queue()
+    The header of the buffer holds:
 
-        # Map <event_types -> queues>
-        self.queues = defaultdict(list)
+    - ``version``: odd while a publisher updates the header.
+    - ``head``, ``head_seq``: the position after the last event, and the
+      number of published events.
+    - ``tail``, ``tail_seq``: the position and the sequence number of the
+      oldest event still in the buffer.
+    - ``started``: whether an event was published.
+
+    Positions only grow, the offset of a position in the buffer is its
+    remainder by the size of the buffer.
+    """
+
+    def __init__(self, size=BUFFER_SIZE):
+        """Create a new exchange.
+
+        Args:
+            size (int): the size of the buffer, in bytes. It must hold the
+                largest event.
+        """
+
+        self.size = size
+        self.buffer = mmap.mmap(-1, HEADER_SIZE + size)
+        self.lock = multiprocessing.Lock()
+        # The write ends of the pipes of the subscribers
+        self.wakeups = []
 
     def get_publisher_queue(self):
-        """Get the queue used by the publisher.
+        """Get the queue used by a publisher.
 
         Returns:
-            a :class:`multiprocessing.Queue`.
+            the :class:`Exchange` itself, to :meth:`put` events in.
         """
 
-        return self.publisher_queue
+        return self
 
     def get_subscriber_queue(self, event_types=None):
         """Create a new queue for a specific combination of event types
         and return it.
 
         Returns:
-            a :class:`multiprocessing.Queue`.
+            an :class:`EventReader`.
         Raises:
-            RuntimeError if called after `run`
+            RuntimeError if called after an event was published
         """
 
-        try:
-            self.started_queue.get(timeout=1)
+        return self.get_subscriber_queues(1, event_types)[0]
+
+    def get_subscriber_queues(self, count, event_types=None):
+        """Create ``count`` new queues for a specific combination of event
+        types and return them.
+
+        The queues must be created before the publisher process is forked,
+        so that it wakes their readers up.
+
+        Returns:
+            a list of :class:`EventReader`.
+        Raises:
+            RuntimeError if called after an event was published
+        """
+
+        if self.header().started:
             raise RuntimeError('Cannot create a new subscriber queue while Exchange is running.')
-        except Empty:
-            pass
 
         if event_types is None:
             event_types = EventTypes.ALL
 
-        queue = Queue()
-        self.queues[event_types].append(queue)
-        return queue
+        return [EventReader(self, event_types) for _ in range(count)]
+
+    def put(self, event, lock_timeout=LOCK_TIMEOUT):
+        """Publish an event to all the subscribers of its type.
+
+        Args:
+            event: an :class:`Event`, or any picklable object, sent to
+                all the subscribers.
+            lock_timeout (float): the number of seconds to wait for the
+                lock before taking it over.
+        Raises:
+            ValueError if the event doesn't fit in the buffer
+        """
+
+        event_type = event.type if isinstance(event, Event) else EventTypes.ALL
+        payload = pickle.dumps(event, pickle.HIGHEST_PROTOCOL)
+        size = RECORD.size + len(payload)
+        if size > self.size:
+            raise ValueError('The event takes {} bytes, the buffer only {}'
+                             .format(size, self.size))
+
+        if not self.lock.acquire(timeout=lock_timeout):
+            logger.error('The lock of the event buffer was held for more than %s s, '
+                         'taking it over from its dead publisher', lock_timeout)
+        try:
+            # The header is only written under the lock: its fields are
+            # the last ones written, even by a publisher which died while
+            # updating them. Its events are then partly overwritten, or
+            # not published.
+            version, head, head_seq, tail, tail_seq, _ = HEADER.unpack_from(self.buffer)
+            version += version % 2
+            while head + size - tail > self.size:
+                length, _ = RECORD.unpack(self.read(tail, RECORD.size))
+                tail += RECORD.size + length
+                tail_seq += 1
+
+            # Move the tail before overwriting the oldest events, so that
+            # their readers notice it
+            VERSION.pack_into(self.buffer, 0, version + 1)
+            struct.pack_into('<2Q', self.buffer, 24, tail, tail_seq)
+            self.write(head, RECORD.pack(len(payload), event_type & TYPE_MASK))
+            self.write(head + RECORD.size, payload)
+            struct.pack_into('<2Q', self.buffer, 8, head + size, head_seq + 1)
+            struct.pack_into('<Q', self.buffer, 40, 1)
+            VERSION.pack_into(self.buffer, 0, version + 2)
+        finally:
+            self.lock.release()
+
+        for wakeup in self.wakeups:
+            try:
+                os.write(wakeup, b'\0')
+            except BlockingIOError:
+                # The subscriber wasn't woken up by the previous events yet
+                pass
+
+    def header(self, timeout=HEADER_TIMEOUT):
+        """Return a consistent :class:`Header` of the buffer.
+
+        Args:
+            timeout (float): the maximum number of seconds to wait for a
+                publisher updating the header.
+        Raises:
+            RuntimeError if the header is still being updated after
+            ``timeout``, e.g. because its publisher died meanwhile.
+        """
+
+        delay, deadline = 0, None
+        while True:
+            header = Header._make(HEADER.unpack_from(self.buffer))
+            if (not header.version % 2 and
+                    VERSION.unpack_from(self.buffer)[0] == header.version):
+                return header
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise RuntimeError('The header of the event buffer is still being '
+                                   'updated after {} s'.format(timeout))
+            time.sleep(delay)
+            delay = min(max(delay * 2, HEADER_MIN_BACKOFF), HEADER_MAX_BACKOFF)
+
+    def read(self, position, length):
+        offset = position % self.size
+        if offset + length <= self.size:
+            return self.buffer[HEADER_SIZE + offset:HEADER_SIZE + offset + length]
+        first = self.size - offset
+        return (self.buffer[HEADER_SIZE + offset:] +
+                self.buffer[HEADER_SIZE:HEADER_SIZE + length - first])
 
-    def dispatch(self, event):
-        """Given an event, send it to all the subscribers.
+    def write(self, position, data):
+        offset = position % self.size
+        if offset + len(data) <= self.size:
+            self.buffer[HEADER_SIZE + offset:HEADER_SIZE + offset + len(data)] = data
+            return
+        data = memoryview(data)
+        first = self.size - offset
+        self.buffer[HEADER_SIZE + offset:] = data[:first]
+        self.buffer[HEADER_SIZE:HEADER_SIZE + len(data) - first] = data[first:]
+
+
+class EventReader:
+    """A subscriber of an :class:`Exchange`, reading the events published
+    after it was created, with the interface of a queue.
+
+    A reader must only be used by one process. A process forked from it
+    starts from its position at the time of the fork.
+    """
 
-        Args
-            event (:class:`~bigchaindb.events.EventTypes`): the event to
-                dispatch to all the subscribers.
+    def __init__(self, exchange, event_types):
+        self.exchange = exchange
+        self.event_types = event_types & TYPE_MASK
+        header = exchange.header()
+        self.position, self.seq = header.head, header.head_seq
+        self.fd, wakeup = os.pipe()
+        os.set_blocking(self.fd, False)
+        os.set_blocking(wakeup, False)
+        exchange.wakeups.append(wakeup)
+
+    def seek_to_head(self):
+        """Skip the events published so far, e.g. in a process forked
+        from one which never read them."""
+
+        header = self.exchange.header()
+        self.position, self.seq = header.head, header.head_seq
+        self.clear()
+
+    def fileno(self):
+        """The file descriptor that gets readable when events are
+        published."""
+
+        return self.fd
+
+    def get(self, block=True, timeout=None):
+        """Remove and return the next event.
+
+        Args:
+            block (bool): wait for an event if there is none.
+            timeout (float): the maximum number of seconds to wait.
+        Raises:
+            queue.Empty if there is no event
         """
 
-        for event_types, queues in self.queues.items():
-            if event.type & event_types:
-                for queue in queues:
-                    queue.put(event)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.clear()
+            try:
+                return self.get_nowait()
+            except Empty:
+                if not block:
+                    raise
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise Empty
+            select.select([self.fd], [], [], remaining)
 
-    def run(self):
-        """Start the exchange"""
-        self.started_queue.put('STARTED')
+    def get_nowait(self):
+        """Remove and return the next event, or raise
+        :exc:`queue.Empty`."""
 
+        exchange = self.exchange
         while True:
-            event = self.publisher_queue.get()
-            if event == POISON_PILL:
-                return
-            else:
-                self.dispatch(event)
+            header = exchange.header()
+            if self.position < header.tail:
+                self._skip_lost(header)
+            if self.seq == header.head_seq:
+                raise Empty
+
+            length, event_type = RECORD.unpack(exchange.read(self.position, RECORD.size))
+            payload = None
+            if event_type & self.event_types and length <= exchange.size:
+                payload = exchange.read(self.position + RECORD.size, length)
+            if self.position < exchange.header().tail:
+                # Overwritten while reading it
+                continue
+
+            self.position += RECORD.size + length
+            self.seq += 1
+            if payload is not None:
+                return pickle.loads(payload)
+
+    def qsize(self):
+        """Return the approximate number of events left to read."""
+
+        exchange = self.exchange
+        header = exchange.header()
+        position, size = max(self.position, header.tail), 0
+        while position < header.head:
+            length, event_type = RECORD.unpack(exchange.read(position, RECORD.size))
+            size += bool(event_type & self.event_types)
+            position += RECORD.size + length
+        return size
+
+    def clear(self):
+        """Consume the wake ups of the published events."""
+
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _skip_lost(self, header):
+        lost = header.tail_seq - self.seq
+        logger.warning('Lost %s events, overwritten before being read', lost)
+        metrics.counter('events.lost').inc(lost)
+        self.position, self.seq = header.tail, header.tail_seq
+
+
+class AsyncEventReader:
+    """Read the events of an :class:`EventReader` in an asyncio loop,
+    with the interface of an :class:`asyncio.Queue`."""
+
+    def __init__(self, reader, loop):
+        self.reader = reader
+        self.loop = loop
+
+    @asyncio.coroutine
+    def get(self):
+        """Remove and return the next event, waiting for it."""
+
+        while True:
+            self.reader.clear()
+            try:
+                return self.reader.get_nowait()
+            except Empty:
+                pass
+
+            readable = self.loop.create_future()
+            self.loop.add_reader(self.reader.fileno(),
+                                 lambda: readable.done() or readable.set_result(None))
+            try:
+                yield from readable
+            finally:
+                self.loop.remove_reader(self.reader.fileno())
@@ -20,18 +20,24 @@ except ImportError:
 import requests
 
 import bigchaindb
-from bigchaindb import backend, config_utils, fastquery
+from bigchaindb import backend, config_utils, fastquery, tendermint_rpc
 from bigchaindb.models import Transaction
+from bigchaindb.elections.election import Election
 from bigchaindb.common.exceptions import (SchemaValidationError,
                                           ValidationError,
                                           DoubleSpend)
-from bigchaindb.tendermint_utils import encode_transaction, merkleroot
+from bigchaindb.tendermint_utils import (encode_transaction,
+                                         encode_raw_transaction, merkleroot)
 from bigchaindb import exceptions as core_exceptions
 from bigchaindb.consensus import BaseConsensusRules
 
 
 logger = logging.getLogger(__name__)
 
+# The outcome of writing a transaction rejected by Tendermint's `check_tx`
+# (or `deliver_tx` in `commit` mode).
+TX_REJECTED = (500, 'Transaction validation failed')
+
 
 class BigchainDB(object):
     """Bigchain API
@@ -63,6 +69,14 @@ class BigchainDB(object):
         self.tendermint_host = bigchaindb.config['tendermint']['host']
         self.tendermint_port = bigchaindb.config['tendermint']['port']
         self.endpoint = 'http://{}:{}/'.format(self.tendermint_host, self.tendermint_port)
+        tendermint_config = bigchaindb.config['tendermint']
+        self.rpc = tendermint_rpc.get_client(
+            self.endpoint,
+            pool_size=tendermint_config['rpc_pool_size'],
+            connect_timeout=tendermint_config['rpc_connect_timeout'],
+            read_timeout=tendermint_config['rpc_read_timeout'],
+            retries=tendermint_config['rpc_retries'],
+            backoff_factor=tendermint_config['rpc_backoff_factor'])
 
         consensusPlugin = bigchaindb.config.get('consensus_plugin')
 
@@ -73,33 +87,92 @@ class BigchainDB(object):
 
         self.connection = connection if connection else backend.connect(**bigchaindb.config['database'])
 
-    def post_transaction(self, transaction, mode):
-        """Submit a valid transaction to the mempool."""
+    def post_transaction(self, transaction, mode, raw_transaction=None):
+        """Submit a valid transaction to the mempool.
+
+        Args:
+            transaction (Transaction): the transaction to submit.
+            mode (str): one of :attr:`mode_list`.
+            raw_transaction (bytes): (Optional) ``transaction`` already
+                serialized with
+                :func:`~bigchaindb.tendermint_utils.serialize_transaction`.
+                If given, it is sent as is instead of serializing
+                ``transaction`` again.
+        """
         if not mode or mode not in self.mode_list:
             raise ValidationError('Mode must be one of the following {}.'
                                   .format(', '.join(self.mode_list)))
 
-        tx_dict = transaction.tx_dict if transaction.tx_dict else transaction.to_dict()
+        if raw_transaction is None:
+            tx_dict = transaction.tx_dict if transaction.tx_dict else transaction.to_dict()
+            encoded_transaction = encode_transaction(tx_dict)
+        else:
+            encoded_transaction = encode_raw_transaction(raw_transaction)
+
         payload = {
             'method': mode,
             'jsonrpc': '2.0',
-            'params': [encode_transaction(tx_dict)],
+            'params': [encoded_transaction],
+            'id': str(uuid4())
+        }
+        return self.rpc.post(payload)
+
+    def get_mempool_size(self):
+        """Return the number of transactions in Tendermint's mempool.
+
+        Raises:
+            :exc:`requests.exceptions.RequestException`: if Tendermint
+                could not be reached.
+        """
+        payload = {
+            'method': 'num_unconfirmed_txs',
+            'jsonrpc': '2.0',
+            'params': {},
             'id': str(uuid4())
         }
-        # TODO: handle connection errors!
-        return requests.post(self.endpoint, json=payload)
+        response = self.rpc.post(payload).json()
+        return int(response['result']['n_txs'])
 
-    def write_transaction(self, transaction, mode):
+    def write_transaction(self, transaction, mode, raw_transaction=None):
         # This method offers backward compatibility with the Web API.
         """Submit a valid transaction to the mempool."""
-        response = self.post_transaction(transaction, mode)
+        try:
+            response = self.post_transaction(transaction, mode, raw_transaction)
+        except requests.exceptions.RequestException:
+            return (503, 'Tendermint is unreachable')
         return self._process_post_response(response.json(), mode)
 
+    def write_transactions(self, transactions, mode):
+        """Submit valid transactions to the mempool, in order.
+
+        Tendermint does not support JSON-RPC batch requests, so the
+        transactions are sent one after the other over the pooled
+        connections of :attr:`rpc`. If Tendermint is unreachable, the
+        remaining transactions are not sent.
+
+        Args:
+            transactions (list): the transactions to submit.
+            mode (str): one of :attr:`mode_list`.
+
+        Returns:
+            A list with a ``(status_code, message)`` tuple for each
+            transaction.
+        """
+        results = []
+        for transaction in transactions:
+            if results and results[-1][0] == 503:
+                results.append(results[-1])
+            else:
+                results.append(self.write_transaction(transaction, mode))
+        return results
+
     def _process_post_response(self, response, mode):
         logger.debug(response)
 
         error = response.get('error')
         if error:
+            if 'mempool is full' in str(error).lower():
+                return (429, 'Mempool is full')
             return (500, error)
 
         result = response['result']
@@ -111,7 +184,7 @@ class BigchainDB(object):
             error_code = result.get('code', 0)
 
         if error_code:
-            return (500, 'Transaction validation failed')
+            return TX_REJECTED
 
         return (202, '')
 
@@ -122,8 +195,7 @@ class BigchainDB(object):
         for t in transactions:
             transaction = t.tx_dict if t.tx_dict else rapidjson.loads(rapidjson.dumps(t.to_dict()))
             if transaction['operation'] == t.CREATE:
-                asset = transaction.pop('asset')
-                asset['id'] = transaction['id']
+                asset = dict(transaction.pop('asset'), id=transaction['id'])
                 assets.append(asset)
 
             metadata = transaction.pop('metadata')
@@ -134,7 +206,23 @@ class BigchainDB(object):
         backend.query.store_metadatas(self.connection, txn_metadatas)
         if assets:
             backend.query.store_assets(self.connection, assets)
-        return backend.query.store_transactions(self.connection, txns)
+        stored = backend.query.store_transactions(self.connection, txns)
+
+        # Tally the votes once they are stored, see ``run_recover``
+        votes = Election.tally_votes(transactions)
+        for election_id in list(votes):
+            # Votes stored before the tallies existed must be counted too,
+            # so the tally of an election without one is created from all
+            # its stored votes. It is only inserted, an existing tally
+            # never being overwritten.
+            if backend.query.get_vote_tally(self.connection, election_id) is None:
+                tally = {'election_id': election_id,
+                         'votes': Election.count_committed_votes(self, election_id)}
+                backend.query.insert_vote_tally(self.connection, tally)
+                del votes[election_id]
+        if votes:
+            backend.query.increment_vote_tallies(self.connection, votes)
+        return stored
 
     def update_utxoset(self, transaction):
         """Update the UTXO set given ``transaction``. That is, remove
@@ -224,7 +312,7 @@ class BigchainDB(object):
         transaction = backend.query.get_transaction(self.connection, transaction_id)
         return bool(transaction)
 
-    def get_transaction(self, transaction_id):
+    def _get_stored_transaction(self, transaction_id):
         transaction = backend.query.get_transaction(self.connection, transaction_id)
 
         if transaction:
@@ -240,10 +328,33 @@ class BigchainDB(object):
 
                 transaction.update({'metadata': metadata})
 
+        return transaction
+
+    def get_transaction(self, transaction_id):
+        transaction = self._get_stored_transaction(transaction_id)
+
+        if transaction:
             transaction = Transaction.from_dict(transaction)
 
         return transaction
 
+    def get_transaction_dict(self, transaction_id):
+        """Return the committed transaction with id ``transaction_id`` as a
+        ``dict`` laid out exactly like :meth:`Transaction.to_dict` would,
+        or ``None`` if there is no such transaction.
+
+        Unlike :meth:`get_transaction`, the stored documents are not turned
+        into a :class:`~bigchaindb.models.Transaction`, so no fulfillment or
+        condition gets parsed. Use it when the transaction is only going
+        to be serialized again.
+        """
+        transaction = self._get_stored_transaction(transaction_id)
+
+        if transaction:
+            transaction = _layout_transaction(transaction)
+
+        return transaction
+
     def get_transactions_filtered(self, asset_id, operation=None):
         """Get a list of transactions filtered on some criteria
         """
@@ -374,11 +485,37 @@ class BigchainDB(object):
     def is_valid_transaction(self, tx, current_transactions=[]):
         # NOTE: the function returns the Transaction object in case
         # the transaction is valid
+        return self.check_transaction(tx, current_transactions)[0]
+
+    def check_transaction(self, tx, current_transactions=[]):
+        """Validate a transaction like :meth:`is_valid_transaction`, and
+        tell why it is invalid.
+
+        Returns:
+            tuple: the :class:`~bigchaindb.models.Transaction` and
+            ``None`` if it is valid, or ``False`` and the name of the
+            class of the error making it invalid.
+        """
+
+        transaction = tx
         try:
-            return self.validate_transaction(tx, current_transactions)
+            # Parsed here rather than by validate_transaction, which would
+            # swallow the error
+            if isinstance(transaction, dict):
+                transaction = Transaction.from_dict(tx)
+            valid = self.validate_transaction(transaction, current_transactions)
+        except SchemaValidationError as e:
+            logger.warning('Invalid transaction schema: %s', e.__cause__.message)
+            return False, type(e).__name__
         except ValidationError as e:
             logger.warning('Invalid transaction (%s): %s', type(e).__name__, e)
-            return False
+            return False, type(e).__name__
+
+        # Some validations fail without raising
+        if not valid:
+            logger.warning('Invalid transaction: %s', transaction.id)
+            return False, ValidationError.__name__
+        return valid, None
 
     def text_search(self, search, *, limit=0, table='assets'):
         """Return an iterator of assets that match the text search
@@ -483,6 +620,101 @@ class BigchainDB(object):
                                                                       'election_id': election.id})
 
 
+def read_blocks(connection, from_height, limit, full=False):
+    """Return the committed blocks from a height with their transactions,
+    like in ``BLOCK_VALID`` events.
+
+    Args:
+        from_height (int): the height of the first block.
+        limit (int): the maximum number of blocks.
+        full (bool): also read the assets and the metadata of the
+        transactions. Without them, the transactions of ``CREATE``
+        operations have no asset, and none has metadata.
+    """
+
+    blocks = backend.query.get_blocks(connection, from_height, limit)
+    txids = [txid for block in blocks for txid in block['transactions']]
+    transactions = {}
+    if txids:
+        transactions = {tx['id']: tx for tx
+                        in backend.query.get_transactions(connection, txids)}
+    if txids and full:
+        for asset in backend.query.get_assets(connection, txids):
+            transactions[asset.pop('id')]['asset'] = asset
+        for metadata in backend.query.get_metadata(connection, txids):
+            transactions[metadata['id']]['metadata'] = metadata['metadata']
+    return [{'height': block['height'],
+             'transactions': [transactions[txid]
+                              for txid in block['transactions']]}
+            for block in blocks]
+
+
+def read_committed_blocks(connection, from_height, limit, full=False):
+    """Return the stored blocks from a Tendermint height, like
+    :func:`read_blocks`.
+
+    The blocks of the current chain are stored at their Tendermint height
+    shifted by the height of the chain, since a chain migration restarts
+    the Tendermint heights.
+    """
+
+    chain = backend.query.get_latest_abci_chain(connection)
+    chain_shift = 0 if chain is None else chain['height']
+    blocks = read_blocks(connection, from_height + chain_shift, limit, full)
+    for block in blocks:
+        block['height'] -= chain_shift
+    return blocks
+
+
+def _layout_transaction(tx):
+    """Return the stored transaction ``tx`` with its keys in the order
+    used by :meth:`~bigchaindb.common.transaction.Transaction.to_dict`.
+    """
+    return {
+        'inputs': [{
+            'owners_before': input_['owners_before'],
+            'fulfills': _layout_fulfills(input_['fulfills']),
+            'fulfillment': input_['fulfillment'],
+        } for input_ in tx['inputs']],
+        'outputs': [{
+            'public_keys': output['public_keys'],
+            'condition': {
+                'details': _layout_details(output['condition']['details']),
+                'uri': output['condition']['uri'],
+            },
+            'amount': output['amount'],
+        } for output in tx['outputs']],
+        'operation': tx['operation'],
+        'metadata': tx['metadata'],
+        'asset': tx['asset'],
+        'version': tx['version'],
+        'id': tx['id'],
+    }
+
+
+def _layout_fulfills(fulfills):
+    if fulfills is None:
+        return None
+    return {
+        'transaction_id': fulfills['transaction_id'],
+        'output_index': fulfills['output_index'],
+    }
+
+
+def _layout_details(details):
+    if details['type'] == 'threshold-sha-256':
+        return {
+            'type': details['type'],
+            'threshold': details['threshold'],
+            'subconditions': [_layout_details(subcondition)
+                              for subcondition in details['subconditions']],
+        }
+    return {
+        'type': details['type'],
+        'public_key': details['public_key'],
+    }
+
+
 Block = namedtuple('Block', ('app_hash', 'height', 'transactions'))
 
 PreCommitState = namedtuple('PreCommitState', ('commit_id', 'height', 'transactions'))
@@ -0,0 +1,195 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Process-local metrics.
+
+Metrics are plain counters, gauges and histograms kept in memory by the process
+that records them, e.g. each web worker has its own set. Use
+:func:`snapshot` to read them, and :func:`start_logging` to have a process
+log them periodically.
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+# Upper bounds (in seconds) of the default latency buckets.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# How often :func:`start_logging` logs the metrics, in seconds.
+LOG_INTERVAL = 60
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+class Counter:
+    """A monotonically increasing value."""
+
+    def __init__(self, name):
+        self.name = name
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def to_dict(self):
+        return {'value': self.value}
+
+
+class Gauge:
+    """A value that can go up and down, e.g. the length of a queue."""
+
+    def __init__(self, name):
+        self.name = name
+        self._value = 0
+        self._function = None
+
+    @property
+    def value(self):
+        if self._function is not None:
+            return self._function()
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def set_function(self, function):
+        """Compute the value with ``function`` when it is read, for values
+        too costly to keep up to date."""
+
+        self._function = function
+
+    def to_dict(self):
+        return {'value': self.value}
+
+
+class Histogram:
+    """Counts observed values into cumulative buckets, and keeps track of
+    their sum and maximum.
+    """
+
+    def __init__(self, name, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = tuple(sorted(buckets))
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+        self._bucket_counts = [0] * (len(self.buckets) + 1)
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self.max = max(self.max, value)
+            self._bucket_counts[bisect_left(self.buckets, value)] += 1
+
+    @contextmanager
+    def time(self):
+        """Observe the wall-clock time spent in the ``with`` block."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def to_dict(self):
+        with self._lock:
+            cumulative, total = {}, 0
+            for bound, count in zip(self.buckets + ('+Inf',),
+                                    self._bucket_counts):
+                total += count
+                cumulative[str(bound)] = total
+            return {'count': self.count, 'sum': self.sum,
+                    'max': self.max, 'buckets': cumulative}
+
+
+def _get_or_create(cls, name, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, **kwargs)
+        elif not isinstance(metric, cls):
+            raise TypeError('Metric {} is a {}, not a {}'.format(
+                name, type(metric).__name__, cls.__name__))
+        return metric
+
+
+def counter(name):
+    """Return the :class:`Counter` called ``name``, creating it if
+    needed."""
+
+    return _get_or_create(Counter, name)
+
+
+def gauge(name):
+    """Return the :class:`Gauge` called ``name``, creating it if needed."""
+
+    return _get_or_create(Gauge, name)
+
+
+def histogram(name, buckets=DEFAULT_BUCKETS):
+    """Return the :class:`Histogram` called ``name``, creating it if
+    needed."""
+
+    return _get_or_create(Histogram, name, buckets=buckets)
+
+
+def bucket(value, buckets=DEFAULT_BUCKETS):
+    """Return the upper bound of the bucket of ``value``, named like in
+    :meth:`Histogram.to_dict`."""
+
+    position = bisect_left(buckets, value)
+    return str(buckets[position]) if position < len(buckets) else '+Inf'
+
+
+def snapshot():
+    """Return the current value of every metric as a ``dict``."""
+
+    with _registry_lock:
+        metrics = list(_registry.values())
+    return {metric.name: metric.to_dict() for metric in metrics}
+
+
+def log_snapshot(logger, process):
+    """Log the :func:`snapshot` of the metrics of ``process`` (a name
+    for the logs), if any metric was recorded."""
+
+    values = snapshot()
+    if values:
+        logger.info('Metrics of %s: %s', process,
+                    json.dumps(values, sort_keys=True))
+
+
+def start_logging(logger, process, interval=None):
+    """Call :func:`log_snapshot` every ``interval`` seconds (default:
+    :data:`LOG_INTERVAL`) from a daemon thread.
+
+    Returns:
+        a :class:`threading.Event`, set it to stop logging.
+    """
+
+    stopped = threading.Event()
+
+    def run():
+        while not stopped.wait(interval or LOG_INTERVAL):
+            log_snapshot(logger, process)
+
+    threading.Thread(target=run, name='metrics_log', daemon=True).start()
+    return stopped
+
+
+def reset():
+    """Forget every metric. Mostly useful for tests."""
+
+    with _registry_lock:
+        _registry.clear()
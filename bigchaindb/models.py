@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+from bigchaindb.common import verification_cache
 from bigchaindb.common.exceptions import (InvalidSignature,
                                           DuplicateTransaction)
 from bigchaindb.common.transaction import Transaction
@@ -46,10 +47,16 @@ class Transaction(Transaction):
     @classmethod
     def validate_schema(cls, tx_body):
         cls.validate_id(tx_body)
+        # NOTE: A valid id is the hash of the whole body, so it identifies
+        #       a body that might have been validated by another process.
+        cache_key = verification_cache.key('schema', tx_body['id'])
+        if verification_cache.contains(cache_key):
+            return
         validate_transaction_schema(tx_body)
         validate_txn_obj('asset', tx_body['asset'], 'data', validate_key)
         validate_txn_obj('metadata', tx_body, 'metadata', validate_key)
         validate_language_key(tx_body['asset'], 'data')
+        verification_cache.add(cache_key)
 
 
 class FastTransaction:
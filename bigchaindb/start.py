@@ -3,13 +3,17 @@
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
 import logging
+from functools import partial
+
 import setproctitle
 
 import bigchaindb
+from bigchaindb import backend
 from bigchaindb.lib import BigchainDB
 from bigchaindb.core import App
-from bigchaindb.web import server, websocket_server
+from bigchaindb.web import async_server, server, websocket_server
 from bigchaindb import event_stream
+from bigchaindb.common import verification_cache
 from bigchaindb.events import Exchange, EventTypes
 from bigchaindb.utils import Process
 
@@ -36,36 +40,70 @@ BANNER = """
 
 
 def start():
-    # Exchange object for event stream api
     logger.info('Starting BigchainDB')
+    # The verification cache must be created before forking, so that the
+    # web API and the ABCI application share it.
+    verification_cache.enable(bigchaindb.config['verification_cache']['size'])
+    # Exchange object for event stream api. Its subscriber queues must
+    # be created before the process publishing events is forked.
     exchange = Exchange()
-    # start the web api
-    app_server = server.create_server(
+    # start the web api. The aiohttp server checks transactions on a pool
+    # of child processes, which a daemonic process can't have.
+    if bigchaindb.config['server'].get('engine') == 'aiohttp':
+        create_server = async_server.create_server
+        daemon = False
+    else:
+        create_server = server.create_server
+        daemon = True
+    # The web API reads through its own connection profile, so that heavy
+    # queries don't slow down the ABCI application. The connection is only
+    # opened on first use, by each worker.
+    api_connection = backend.connect(role='api')
+    app_server = create_server(
         settings=bigchaindb.config['server'],
         log_config=bigchaindb.config['log'],
-        bigchaindb_factory=BigchainDB)
-    p_webapi = Process(name='bigchaindb_webapi', target=app_server.run, daemon=True)
+        bigchaindb_factory=partial(BigchainDB, connection=api_connection),
+        exchange=exchange)
+    p_webapi = Process(name='bigchaindb_webapi', target=app_server.run, daemon=daemon)
     p_webapi.start()
 
     # start message
     logger.info(BANNER.format(bigchaindb.config['server']['bind']))
 
-    # start websocket server
-    p_websocket_server = Process(name='bigchaindb_ws',
-                                 target=websocket_server.start,
-                                 daemon=True,
-                                 args=(exchange.get_subscriber_queue(EventTypes.BLOCK_VALID),))
-    p_websocket_server.start()
-
-    # connect to tendermint event stream
-    p_websocket_client = Process(name='bigchaindb_ws_to_tendermint',
-                                 target=event_stream.start,
-                                 daemon=True,
-                                 args=(exchange.get_publisher_queue(),))
-    p_websocket_client.start()
-
-    p_exchange = Process(name='bigchaindb_exchange', target=exchange.run, daemon=True)
-    p_exchange.start()
+    # start websocket server. Each worker process reads the events from
+    # the exchange, and they share the port.
+    ws_workers = bigchaindb.config['wsserver']['workers']
+    ws_event_queues = exchange.get_subscriber_queues(
+        ws_workers,
+        EventTypes.BLOCK_VALID | EventTypes.TX_ACCEPTED | EventTypes.TX_REJECTED)
+    for worker, event_queue in enumerate(ws_event_queues):
+        p_websocket_server = Process(name='bigchaindb_ws' if ws_workers == 1 else
+                                     'bigchaindb_ws_{}'.format(worker),
+                                     target=websocket_server.start,
+                                     daemon=True,
+                                     args=(event_queue,),
+                                     kwargs={'worker': worker,
+                                             'reuse_port': ws_workers > 1})
+        p_websocket_server.start()
+
+    # Block events are either published by the ABCI application once
+    # the blocks are stored, or read from the Tendermint event stream
+    events_queue = None
+    if bigchaindb.config['wsserver']['event_source'] == 'commit':
+        events_queue = exchange.get_publisher_queue()
+    else:
+        p_websocket_client = Process(name='bigchaindb_ws_to_tendermint',
+                                     target=event_stream.start,
+                                     daemon=True,
+                                     args=(exchange.get_publisher_queue(),))
+        p_websocket_client.start()
+
+    # The ABCI application also publishes the events of a sample of the
+    # transactions it checks
+    tx_events_queue = None
+    tx_events_sample_rate = bigchaindb.config['wsserver']['tx_events_sample_rate']
+    if tx_events_sample_rate > 0:
+        tx_events_queue = exchange.get_publisher_queue()
 
     # We need to import this after spawning the web server
     # because import ABCIServer will monkeypatch all sockets
@@ -75,7 +113,10 @@ def start():
     setproctitle.setproctitle('bigchaindb')
 
     # Start the ABCIServer
-    app = ABCIServer(app=App())
+    app = ABCIServer(app=App(BigchainDB(backend.connect(role='consensus')),
+                             events_queue=events_queue,
+                             tx_events_queue=tx_events_queue,
+                             tx_events_sample_rate=tx_events_sample_rate))
     app.run()
 
 
@@ -0,0 +1,95 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Client for the Tendermint RPC server."""
+
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from bigchaindb import metrics
+
+
+logger = logging.getLogger(__name__)
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+class TendermintRPC:
+    """An HTTP client for the Tendermint RPC server.
+
+    Connections are kept alive in a pool and reused between calls. Calls
+    failing to connect are retried with an exponential backoff; requests
+    that reached Tendermint are never retried.
+    """
+
+    def __init__(self, endpoint, *, pool_size=10, connect_timeout=5,
+                 read_timeout=30, retries=3, backoff_factor=0.1):
+        """Create a new client.
+
+        Args:
+            endpoint (str): the URL of the Tendermint RPC server.
+            pool_size (int): the number of connections to keep alive.
+            connect_timeout (float): seconds to wait for a connection.
+            read_timeout (float): seconds to wait for a response. It must
+                be larger than Tendermint's ``timeout_broadcast_tx_commit``.
+            retries (int): how many times to retry on connection errors.
+            backoff_factor (float): the base of the exponential backoff
+                between retries, in seconds.
+        """
+
+        self.endpoint = endpoint
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        # Tendermint is a local service: don't look up proxy settings and
+        # netrc files in the environment on every call.
+        self.session.trust_env = False
+        retry = Retry(total=retries, connect=retries, read=0, status=0,
+                      backoff_factor=backoff_factor)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, payload):
+        """Send the JSON-RPC ``payload`` and return the
+        :class:`requests.Response`.
+
+        Raises:
+            :exc:`requests.exceptions.RequestException`: if Tendermint
+                could not be reached.
+        """
+
+        method = payload.get('method', 'unknown')
+        with metrics.histogram('tendermint_rpc.{}.latency'.format(method)).time():
+            try:
+                return self.session.post(self.endpoint, json=payload,
+                                         timeout=self.timeout)
+            except requests.exceptions.RequestException as exc:
+                metrics.counter('tendermint_rpc.errors').inc()
+                logger.warning('Tendermint RPC call %s failed: %s', method, exc)
+                raise
+
+
+def get_client(endpoint, **kwargs):
+    """Return the :class:`TendermintRPC` client for ``endpoint``.
+
+    Clients are shared by all the threads of a process, and are never
+    shared with forked children, so that each worker has its own pool of
+    connections.
+    """
+
+    key = (os.getpid(), endpoint)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            for stale in [k for k in _clients if k[0] != key[0]]:
+                del _clients[stale]
+            client = _clients[key] = TendermintRPC(endpoint, **kwargs)
+        return client
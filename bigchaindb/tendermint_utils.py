@@ -4,31 +4,45 @@
 
 import base64
 import hashlib
-import json
 from binascii import hexlify
 
+import rapidjson
+
 try:
     from hashlib import sha3_256
 except ImportError:
     from sha3 import sha3_256
 
 
+def serialize_transaction(value):
+    """Serialize a transaction (dict) to the JSON (bytes) sent to
+    Tendermint."""
+
+    return rapidjson.dumps(value).encode('utf8')
+
+
 def encode_transaction(value):
     """Encode a transaction (dict) to Base64."""
 
-    return base64.b64encode(json.dumps(value).encode('utf8')).decode('utf8')
+    return encode_raw_transaction(serialize_transaction(value))
+
+
+def encode_raw_transaction(raw):
+    """Encode a transaction already serialized to JSON (bytes) to Base64."""
+
+    return base64.b64encode(raw).decode('utf8')
 
 
 def decode_transaction(raw):
     """Decode a transaction from bytes to a dict."""
 
-    return json.loads(raw.decode('utf8'))
+    return rapidjson.loads(raw)
 
 
 def decode_transaction_base64(value):
     """Decode a transaction from Base64."""
 
-    return json.loads(base64.b64decode(value.encode('utf8')).decode('utf8'))
+    return rapidjson.loads(base64.b64decode(value.encode('utf8')))
 
 
 def calculate_hash(key_list):
@@ -0,0 +1,153 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Admission control of the transactions posted to the API.
+
+When Tendermint can't keep up, validating posted transactions only to see
+them rejected by a saturated mempool is wasted work. The
+:class:`AdmissionController` sheds load before any validation happens, so
+that the node's capacity goes to transactions that can be committed.
+Every worker process holds its own controller.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+
+from bigchaindb import metrics
+from bigchaindb.lib import TX_REJECTED
+
+
+logger = logging.getLogger(__name__)
+
+# How often the size of the mempool is sampled, in seconds.
+MEMPOOL_SAMPLE_INTERVAL = 1
+
+# The rejection rate is computed over the outcomes of the last
+# ``REJECTION_WINDOW`` seconds, if there are at least
+# ``REJECTION_MIN_SAMPLES`` of them.
+REJECTION_WINDOW = 10
+REJECTION_MIN_SAMPLES = 20
+
+
+class AdmissionController:
+    """Decide whether to accept new transactions, based on the size of
+    Tendermint's mempool, the number of transactions being processed, and
+    how many of the recent ones Tendermint rejected.
+    """
+
+    def __init__(self, mempool_size=None, *, max_mempool_size=0,
+                 max_in_flight=0, max_rejection_rate=0, retry_after=2):
+        """Create a new controller. A threshold set to ``0`` is ignored.
+
+        Args:
+            mempool_size (callable): a function returning the number of
+                transactions in Tendermint's mempool. If not given, the
+                caller is in charge of updating :attr:`last_mempool_size`.
+            max_mempool_size (int): shed load while the mempool holds more
+                transactions than this.
+            max_in_flight (int): the maximum number of transactions being
+                processed at once.
+            max_rejection_rate (float): shed load while Tendermint's
+                ``check_tx`` rejects a larger fraction of the transactions
+                sent to it, see :meth:`record`.
+            retry_after (int): the seconds clients are told to wait before
+                retrying.
+        """
+
+        self.mempool_size = mempool_size
+        self.max_mempool_size = max_mempool_size
+        self.max_in_flight = max_in_flight
+        self.max_rejection_rate = max_rejection_rate
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.last_mempool_size = 0
+        self._sampled_at = None
+        self._outcomes = deque()
+        self._lock = threading.Lock()
+        self._sampling = threading.Lock()
+
+    def admit(self, count=1):
+        """Try to admit ``count`` transactions. Admitted transactions must
+        be released with :meth:`release` once processed.
+
+        Returns:
+            ``None`` if the transactions are admitted, otherwise the reason
+            why they are not.
+        """
+
+        reason = None
+        if (self.max_mempool_size and
+                self._sample_mempool() > self.max_mempool_size):
+            reason = 'the mempool is full'
+
+        with self._lock:
+            if reason is None:
+                if (self.max_in_flight and
+                        self.in_flight + count > self.max_in_flight):
+                    reason = 'too many transactions are being processed'
+                elif (self.max_rejection_rate and
+                        self._rejection_rate() > self.max_rejection_rate):
+                    reason = 'too many transactions are being rejected'
+                else:
+                    self.in_flight += count
+
+        if reason:
+            metrics.counter('admission.shed').inc(count)
+        return reason
+
+    def release(self, count=1):
+        """Release ``count`` transactions admitted with :meth:`admit`."""
+
+        with self._lock:
+            self.in_flight -= count
+
+    def record(self, mode, status_code, message):
+        """Record the ``(status_code, message)`` outcome of sending a
+        transaction to Tendermint in ``mode``.
+
+        Only the verdicts of ``check_tx`` are recorded: Tendermint answers
+        ``broadcast_tx_async`` before checking the transaction, and the
+        other errors (e.g. Tendermint being unreachable, the transaction
+        being in its cache already, or a full mempool) don't tell whether
+        the transactions are valid.
+        """
+
+        if not self.max_rejection_rate or mode == 'broadcast_tx_async':
+            return
+        if status_code == 202:
+            rejected = False
+        elif (status_code, message) == TX_REJECTED:
+            rejected = True
+        else:
+            return
+        with self._lock:
+            self._outcomes.append((time.monotonic(), rejected))
+
+    def _rejection_rate(self):
+        horizon = time.monotonic() - REJECTION_WINDOW
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+        if len(self._outcomes) < REJECTION_MIN_SAMPLES:
+            return 0
+        return sum(rejected for _, rejected in self._outcomes) / len(self._outcomes)
+
+    def _sample_mempool(self):
+        # A single request samples the mempool when the last sample is too
+        # old, the others use the last one instead of waiting.
+        if not self.mempool_size:
+            return self.last_mempool_size
+        now = time.monotonic()
+        stale = (self._sampled_at is None or
+                 now - self._sampled_at >= MEMPOOL_SAMPLE_INTERVAL)
+        if stale and self._sampling.acquire(blocking=False):
+            try:
+                self._sampled_at = now
+                self.last_mempool_size = self.mempool_size()
+            except Exception as exc:
+                logger.warning('Could not sample the mempool size: %s', exc)
+            finally:
+                self._sampling.release()
+        return self.last_mempool_size
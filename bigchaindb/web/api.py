@@ -0,0 +1,319 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""The logic of the HTTP API endpoints, shared by the Flask views of
+:mod:`bigchaindb.web.views` and the aiohttp server of
+:mod:`bigchaindb.web.async_server`.
+
+The functions taking the ``state`` of an application read it from the
+config of the Flask app, or from the aiohttp app: both hold the same keys,
+e.g. ``bigchain_pool`` or ``commit_registry``. They are blocking, the
+aiohttp server runs them on its thread pool.
+"""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import rapidjson
+
+from bigchaindb.backend.exceptions import OperationError
+from bigchaindb.common.exceptions import SchemaValidationError, ValidationError
+from bigchaindb.lib import TX_REJECTED
+from bigchaindb.models import Transaction
+
+
+# The maximum number of transactions accepted by a single batch.
+MAX_BATCH_SIZE = 1000
+
+# The number of threads validating the transactions of a batch.
+BATCH_VALIDATION_THREADS = 8
+
+# The longest a status request can wait for a transaction to be committed,
+# in seconds. It must be shorter than the Gunicorn worker timeout.
+MAX_STATUS_WAIT = 20
+
+# The message of the ``503`` responses to the status requests which can't
+# wait for the commit of their transaction.
+WAIT_REFUSED_MESSAGE = ('Can\'t wait for the transaction to be committed, '
+                        'retry later')
+
+# The outcome of a new submission failing unexpectedly.
+INTERNAL_ERROR = (500, 'Internal Server Error')
+
+# The outcome of a duplicate submission which was still in flight after
+# the commit timeout of the app.
+DEDUPE_TIMEOUT = (504, 'Timed out waiting for an identical submission')
+
+# The outcome of a transaction posted in ``commit`` mode which wasn't
+# committed within the commit timeout of the app.
+COMMIT_TIMEOUT = (500, 'Timed out waiting for tx to be included in a block')
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/ndjson')
+
+_batch_executor = None
+
+
+def parse_transaction(tx):
+    """Parse the transaction ``tx`` received by the API.
+
+    Returns:
+        A tuple ``(transaction, error)``, where ``error`` is a message
+        describing why ``tx`` is invalid, or ``None``.
+    """
+
+    if not isinstance(tx, dict):
+        return None, 'Invalid transaction: expected an object'
+
+    try:
+        return Transaction.from_dict(tx), None
+    except SchemaValidationError as e:
+        return None, 'Invalid transaction schema: {}'.format(e.__cause__.message)
+    except ValidationError as e:
+        return None, 'Invalid transaction ({}): {}'.format(type(e).__name__, e)
+
+
+def check_transaction(bigchain, tx_obj, current_transactions=[]):
+    """Validate ``tx_obj`` against the current state of the database, see
+    :func:`parse_transaction` for the return value.
+    """
+
+    try:
+        bigchain.validate_transaction(tx_obj, current_transactions)
+    except ValidationError as e:
+        return None, 'Invalid transaction ({}): {}'.format(type(e).__name__, e)
+    return tx_obj, None
+
+
+def submission_key(tx, raw_tx, mode):
+    """Return the key of the submission of the transaction ``tx``,
+    serialized as ``raw_tx``, in the dedupe table, or ``None`` if it can't
+    be deduplicated."""
+
+    if isinstance(tx, dict) and 'id' in tx:
+        return (str(tx['id']), hashlib.sha256(raw_tx).digest(), mode)
+    return None
+
+
+def write_transaction(state, tx, raw_tx, mode):
+    """Validate the transaction ``tx``, serialized as ``raw_tx``, and send
+    it to Tendermint in ``mode``.
+
+    In ``commit`` mode, the transaction is registered before sending it, so
+    that its block event can't be missed, and sent with
+    ``broadcast_tx_sync``. The caller then waits for ``pending`` to be
+    committed, outside of the pool, and calls :func:`commit_outcome`.
+
+    Returns:
+        A ``(status_code, message, pending)`` tuple, where ``pending`` is
+        the :class:`~bigchaindb.web.commit_registry.PendingCommit` to wait
+        for, if any.
+    """
+
+    tx_obj, error = parse_transaction(tx)
+    if error:
+        return 400, error, None
+
+    registry = state['commit_registry']
+    pending = None
+    with state['bigchain_pool']() as bigchain:
+        tx_obj, error = check_transaction(bigchain, tx_obj)
+        if error:
+            return 400, error, None
+        if mode == bigchain.mode_commit and registry.running:
+            pending = registry.register(tx_obj.id)
+            mode = 'broadcast_tx_sync'
+        status_code, message = bigchain.write_transaction(tx_obj, mode,
+                                                          raw_tx)
+    state['admission'].record(mode, status_code, message)
+    return status_code, message, pending
+
+
+def batch_error(txs):
+    """Return the ``(status_code, message)`` error for the batch ``txs``
+    if it is empty or too large, otherwise ``None``."""
+
+    if not txs:
+        return 400, 'Invalid batch: no transactions'
+    if len(txs) > MAX_BATCH_SIZE:
+        return 413, 'Batches are limited to {} transactions'.format(MAX_BATCH_SIZE)
+    return None
+
+
+def write_batch(state, txs, mode):
+    """Validate the transactions of a batch, and send the valid ones to
+    Tendermint in ``mode``, see :func:`write_transaction`.
+
+    Returns:
+        A ``(results, written, pending)`` tuple, see
+        :func:`batch_statuses`. ``pending`` lists what to wait for in
+        ``commit`` mode, one per transaction written.
+    """
+
+    registry = state['commit_registry']
+    pending = []
+    with state['bigchain_pool']() as bigchain:
+        results = validate_batch(bigchain, txs)
+        accepted = [tx_obj for tx_obj, error in results if not error]
+        if mode == bigchain.mode_commit and registry.running:
+            pending = [registry.register(tx_obj.id) for tx_obj in accepted]
+            mode = 'broadcast_tx_sync'
+        written = bigchain.write_transactions(accepted, mode)
+    for status_code, message in written:
+        state['admission'].record(mode, status_code, message)
+    return results, written, pending
+
+
+def commit_outcome(state, pending, height):
+    """Return the ``(status_code, message)`` ``broadcast_tx_commit`` would
+    have led to for the transaction of ``pending``, once the wait for its
+    block ended with ``height`` (``None`` if the wait timed out)."""
+
+    if height is None:
+        return COMMIT_TIMEOUT
+    # Block events contain the transactions failing `deliver_tx` as well.
+    if not is_committed(state, pending.tx_id):
+        return TX_REJECTED
+    return 202, ''
+
+
+def is_committed(state, tx_id):
+    """Return whether the transaction ``tx_id`` is stored."""
+
+    with state['bigchain_pool']() as bigchain:
+        return bigchain.is_committed(tx_id)
+
+
+def needs_wait(pending):
+    """Return whether a status request has to wait for the block event of
+    ``pending``, a transaction which was not committed when checked after
+    registering it."""
+
+    # A block event received already was for a transaction failing
+    # `deliver_tx`, there is nothing left to wait for.
+    return pending.wait(0) is None
+
+
+def text_search(state, search, limit=None, table='assets'):
+    """Search the ``table`` for ``search``.
+
+    Returns:
+        A tuple ``(results, error)``, where ``error`` is a message
+        describing why the search failed, or ``None``.
+    """
+
+    kwargs = {'table': table}
+    if limit:
+        kwargs['limit'] = limit
+    with state['bigchain_pool']() as bigchain:
+        try:
+            # This only works with MongoDB as the backend
+            return list(bigchain.text_search(search, **kwargs)), None
+        except OperationError as e:
+            return None, '({}): {}'.format(type(e).__name__, e)
+
+
+def batch_statuses(txs, results, written):
+    """Return the status of every transaction of a batch.
+
+    Args:
+        txs (list): the transactions of the batch.
+        results (list): their validation results, see
+            :func:`validate_batch`.
+        written (list): the ``(status_code, message)`` tuples of the valid
+            transactions sent to Tendermint.
+    """
+
+    written = iter(written)
+    statuses = []
+    for tx, (tx_obj, error) in zip(txs, results):
+        if error:
+            status_code, message = 400, error
+        else:
+            status_code, message = next(written)
+        status = {'id': tx.get('id') if isinstance(tx, dict) else None,
+                  'status': status_code}
+        if message:
+            status['message'] = message
+        statuses.append(status)
+    return statuses
+
+
+def parse_batch(body, mimetype):
+    """Return the list of transactions in the request ``body``.
+
+    Raises:
+        ValueError: if the body is neither a JSON array nor NDJSON.
+    """
+
+    if mimetype in NDJSON_MIMETYPES:
+        return [rapidjson.loads(line) for line in body.splitlines()
+                if line.strip()]
+
+    txs = rapidjson.loads(body)
+    if not isinstance(txs, list):
+        raise ValueError('expected an array of transactions')
+    return txs
+
+
+def validate_batch(bigchain, txs):
+    """Validate the transactions in ``txs`` concurrently.
+
+    Every transaction can depend on the valid ones preceding it in the
+    batch. A transaction spending an output of a preceding transaction
+    which turned out to be invalid is invalid as well.
+
+    Returns:
+        A list of ``(transaction, error)`` tuples, see
+        :func:`parse_transaction`.
+    """
+
+    executor = _get_batch_executor()
+    parsed = list(executor.map(parse_transaction, txs))
+
+    def check(index):
+        tx_obj, error = parsed[index]
+        if error:
+            return parsed[index]
+        preceding = [tx_obj for tx_obj, _ in parsed[:index] if tx_obj]
+        # ``bigchain`` is shared by the threads: it holds no state besides
+        # the database connection, which is thread-safe.
+        return check_transaction(bigchain, tx_obj, preceding)
+
+    results = list(executor.map(check, range(len(txs))))
+
+    # The concurrent checks count every preceding transaction, the invalid
+    # ones as well: an invalid transaction spending the same output as a
+    # later one makes the later one a double spend. Once a transaction is
+    # rejected, the invalid ones following it are checked again against
+    # the accepted transactions only.
+    accepted = []
+    rejected = set()
+    for index, (tx_obj, error) in enumerate(results):
+        if error and rejected and parsed[index][0]:
+            tx_obj, error = results[index] = check_transaction(
+                bigchain, parsed[index][0], accepted)
+        if error:
+            if parsed[index][0]:
+                rejected.add(parsed[index][0].id)
+            continue
+        dependencies = {input_.fulfills.txid for input_ in tx_obj.inputs
+                        if input_.fulfills}
+        if dependencies & rejected:
+            rejected.add(tx_obj.id)
+            results[index] = (None, 'Invalid transaction: it depends on a '
+                                    'rejected transaction of the batch')
+        else:
+            accepted.append(tx_obj)
+
+    return results
+
+
+def _get_batch_executor():
+    # The executor is created lazily so that every worker process gets its
+    # own threads.
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = ThreadPoolExecutor(
+            max_workers=BATCH_VALIDATION_THREADS)
+    return _batch_executor
@@ -0,0 +1,622 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Asynchronous HTTP API server.
+
+An alternative to the Gunicorn server of :mod:`bigchaindb.web.server`,
+serving the same routes and JSON from a single aiohttp event loop, so that
+requests waiting for I/O (e.g. for a transaction to be committed) don't pin
+a whole worker process.
+
+The database and Tendermint clients are blocking, so queries and RPC calls
+run on a pool of threads. The stateless checks of the posted transactions
+(id, schema and signatures) are CPU-bound and run on a pool of processes.
+Their results reach the server through the node's
+:mod:`~bigchaindb.common.verification_cache`, so the process pool is only
+used when the cache is enabled.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import rapidjson
+from aiohttp import web
+
+from bigchaindb import BigchainDB, metrics, utils
+from bigchaindb.common import verification_cache
+from bigchaindb.common.transaction import Transaction
+from bigchaindb.events import EventTypes
+from bigchaindb.tendermint_utils import serialize_transaction
+from bigchaindb.web import api
+from bigchaindb.web.admission import AdmissionController, MEMPOOL_SAMPLE_INTERVAL
+from bigchaindb.web.commit_registry import CommitRegistry
+from bigchaindb.web.dedupe import DedupeTable
+from bigchaindb.web.response_cache import CACHE_CONTROL, ResponseCache
+from bigchaindb.web.views import parameters
+from bigchaindb.web.views.info import get_api_v1_info, get_root_info
+
+
+logger = logging.getLogger(__name__)
+
+# The default number of threads running database queries and Tendermint
+# RPC calls.
+DEFAULT_THREADS = 16
+
+# The message of Flask-RESTful for missing query parameters.
+MISSING_PARAMETER = ('Missing required parameter in the JSON body or the '
+                     'post body or the query string')
+
+
+def make_error(status_code, message=None):
+    """Return the same error response as
+    :func:`bigchaindb.web.views.base.make_error`."""
+
+    if status_code == 404 and message is None:
+        message = 'Not found'
+    logger.error('HTTP API error: %s - %s', status_code, message)
+    return web.json_response({'status': status_code, 'message': message},
+                             status=status_code)
+
+
+def _error_response(request, status_code, message):
+    response = make_error(status_code, message)
+    if status_code == 429:
+        response.headers['Retry-After'] = str(
+            request.app['admission'].retry_after)
+    return response
+
+
+def _parse_args(request, *arguments, strict=False):
+    """Parse the query string of ``request`` like Flask-RESTful's
+    ``RequestParser`` does.
+
+    Args:
+        *arguments: ``(name, type, required)`` tuples.
+        strict (bool): reject unknown arguments.
+
+    Raises:
+        :exc:`aiohttp.web.HTTPBadRequest`: if an argument is invalid.
+    """
+
+    args = {}
+    for name, type_, required in arguments:
+        value = request.query.get(name)
+        if value is None:
+            if required:
+                raise _bad_request({name: MISSING_PARAMETER})
+            args[name] = None
+            continue
+        try:
+            args[name] = type_(value)
+        except (TypeError, ValueError) as e:
+            raise _bad_request({name: str(e)})
+
+    if strict:
+        unknown = [name for name in request.query if name not in args]
+        if unknown:
+            raise _bad_request('Unknown arguments: {}'.format(', '.join(unknown)))
+    return args
+
+
+def _bad_request(message):
+    return web.HTTPBadRequest(text=json.dumps({'message': message}),
+                              content_type='application/json')
+
+
+async def _in_thread(app, func, *args):
+    """Run ``func`` on the thread pool of ``app``."""
+
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(app['thread_pool'], func, *args)
+
+
+async def _with_bigchain(app, func, *args):
+    """Run ``func`` on the thread pool of ``app``, passing a
+    :class:`~bigchaindb.BigchainDB` instance as first argument."""
+
+    def run():
+        with app['bigchain_pool']() as bigchain:
+            return func(bigchain, *args)
+
+    return await _in_thread(app, run)
+
+
+async def _immutable_response(request, key, loader):
+    """Asynchronous version of
+    :func:`bigchaindb.web.response_cache.immutable_response`, taking the
+    ``loader`` to run with :func:`_with_bigchain`."""
+
+    cache = request.app['response_cache']
+    entry = cache.get(key)
+
+    if entry is None:
+        data = await _with_bigchain(request.app, loader)
+        if data is None:
+            return make_error(404)
+        entry = cache.put(key, (json.dumps(data) + '\n').encode())
+
+    headers = {'ETag': '"{}"'.format(entry.etag),
+               'Cache-Control': CACHE_CONTROL}
+    if _etag_matches(request.headers.get('If-None-Match', ''), entry.etag):
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=entry.body, headers=headers,
+                        content_type='application/json')
+
+
+def _etag_matches(if_none_match, etag):
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate in ('*', '"{}"'.format(etag)):
+            return True
+    return False
+
+
+async def _wait_for(pending, timeout):
+    """Wait up to ``timeout`` seconds for ``pending``, a
+    :class:`~bigchaindb.web.commit_registry.PendingCommit` or a
+    :class:`~bigchaindb.web.dedupe.Submission`, without blocking a thread.
+
+    Returns:
+        The value ``pending`` is resolved with (the height of the block
+        the transaction was committed in, or the outcome of the
+        submission), or ``None`` if ``timeout`` expired.
+    """
+
+    loop = asyncio.get_event_loop()
+    done = loop.create_future()
+
+    def resolve(value):
+        if not done.done():
+            done.set_result(value)
+
+    def callback(value):
+        loop.call_soon_threadsafe(resolve, value)
+
+    pending.add_done_callback(callback)
+    try:
+        return await asyncio.wait_for(done, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        # A transaction or a submission can be waited for many times,
+        # the callbacks of the requests done waiting mustn't pile up.
+        pending.remove_done_callback(callback)
+
+
+async def _wait_for_commit(request, pending, status_code, message, deadline):
+    """Asynchronous version of
+    :func:`bigchaindb.web.views.transactions._wait_for_commit`."""
+
+    app = request.app
+    try:
+        if status_code != 202:
+            return status_code, message
+        height = await _wait_for(pending, max(deadline - time.monotonic(), 0))
+    finally:
+        app['commit_registry'].discard(pending)
+    return await _in_thread(app, api.commit_outcome, app, pending, height)
+
+
+def _check_stateless(tx):
+    """Run the checks of ``tx`` which don't depend on the ledger.
+
+    This runs on the process pool: the checks passed are recorded in the
+    verification cache, and skipped when the server validates ``tx``.
+    """
+
+    tx_obj, error = api.parse_transaction(tx)
+    if tx_obj and tx_obj.operation == Transaction.CREATE:
+        tx_obj.inputs_valid()
+    return error
+
+
+async def _precheck(app, txs):
+    """Run :func:`_check_stateless` on the process pool for every
+    transaction in ``txs``, if there is a process pool."""
+
+    process_pool = app['process_pool']
+    if process_pool is None:
+        return [None] * len(txs)
+    loop = asyncio.get_event_loop()
+    return await asyncio.gather(*[
+        loop.run_in_executor(process_pool, _check_stateless, tx)
+        for tx in txs])
+
+
+async def _submit_transaction(request, tx, raw_tx, mode):
+    [error] = await _precheck(request.app, [tx])
+    if error:
+        return 400, error
+
+    status_code, message, pending = await _in_thread(
+        request.app, api.write_transaction, request.app, tx, raw_tx, mode)
+    if pending:
+        deadline = time.monotonic() + request.app['commit_timeout']
+        status_code, message = await _wait_for_commit(
+            request, pending, status_code, message, deadline)
+    return status_code, message
+
+
+async def root_index(request):
+    return web.json_response(get_root_info())
+
+
+async def api_v1_index(request):
+    return web.json_response(get_api_v1_info('/'))
+
+
+async def _text_search(request, table):
+    args = _parse_args(request, ('search', str, True), ('limit', int, False))
+    if not args['search']:
+        return make_error(400, 'text_search cannot be empty')
+
+    results, error = await _in_thread(request.app, api.text_search,
+                                      request.app, args['search'],
+                                      args['limit'], table)
+    if error:
+        return make_error(400, error)
+    return web.json_response(results)
+
+
+async def get_assets(request):
+    return await _text_search(request, 'assets')
+
+
+async def get_metadata(request):
+    return await _text_search(request, 'metadata')
+
+
+async def get_block(request):
+    block_id = int(request.match_info['block_id'])
+
+    def load(bigchain):
+        return bigchain.get_block(block_id=block_id)
+
+    return await _immutable_response(request, ('blocks', block_id), load)
+
+
+async def get_blocks(request):
+    args = _parse_args(request, ('transaction_id', str, True), strict=True)
+    blocks = await _with_bigchain(request.app,
+                                  BigchainDB.get_block_containing_tx,
+                                  args['transaction_id'])
+    return web.json_response(blocks)
+
+
+async def get_transaction(request):
+    tx_id = request.match_info['tx_id']
+
+    def load(bigchain):
+        return bigchain.get_transaction_dict(tx_id)
+
+    return await _immutable_response(request, ('transactions', tx_id), load)
+
+
+async def get_transaction_status(request):
+    tx_id = request.match_info['tx_id']
+    args = _parse_args(request, ('wait', parameters.valid_wait, False))
+    wait = min(args['wait'] or 0, api.MAX_STATUS_WAIT)
+
+    app = request.app
+    registry = app['commit_registry']
+    # Registering first ensures a commit happening right after the
+    # database lookup below is not missed.
+    pending = registry.register(tx_id)
+    refused = False
+    try:
+        committed = await _in_thread(app, api.is_committed, app, tx_id)
+        if not committed and wait and api.needs_wait(pending):
+            if not registry.running:
+                metrics.counter('status.waits_refused').inc()
+                refused = True
+            # Block events contain the transactions failing `deliver_tx`
+            # as well.
+            elif await _wait_for(pending, wait) is not None:
+                committed = await _in_thread(app, api.is_committed, app,
+                                             tx_id)
+    finally:
+        registry.discard(pending)
+
+    if refused:
+        return make_error(503, api.WAIT_REFUSED_MESSAGE)
+    if not committed:
+        return make_error(404)
+    return web.json_response({'id': tx_id, 'status': 'committed'})
+
+
+async def get_transactions(request):
+    args = _parse_args(request,
+                       ('operation', parameters.valid_operation, False),
+                       ('asset_id', parameters.valid_txid, True))
+
+    def load(bigchain):
+        return [tx.to_dict() for tx
+                in bigchain.get_transactions_filtered(**args)]
+
+    return web.json_response(await _with_bigchain(request.app, load))
+
+
+async def post_transaction(request):
+    args = _parse_args(request, ('mode', parameters.valid_mode, False))
+    mode = args['mode'] or 'broadcast_tx_async'
+
+    # Load is shed before any work is spent on the transaction.
+    admission = request.app['admission']
+    reason = admission.admit()
+    if reason:
+        return _error_response(request, 429,
+                               'Too many requests: {}'.format(reason))
+    try:
+        return await _post_transaction(request, mode)
+    finally:
+        admission.release()
+
+
+async def _post_transaction(request, mode):
+    try:
+        tx = rapidjson.loads(await request.read())
+    except ValueError as e:
+        return make_error(400, 'Invalid JSON: {}'.format(e))
+    # The same bytes are sent to Tendermint and back to the client.
+    raw_tx = serialize_transaction(tx)
+
+    key = api.submission_key(tx, raw_tx, mode)
+    if key:
+        # Identical submissions of a transaction share the outcome of the
+        # first one while it is in flight or recently accepted.
+        dedupe = request.app['dedupe_table']
+        submission, new = dedupe.claim(key)
+        if new:
+            outcome = api.INTERNAL_ERROR
+            try:
+                outcome = await _submit_transaction(request, tx, raw_tx, mode)
+            finally:
+                dedupe.complete(key, submission, outcome,
+                                accepted=outcome[0] == 202)
+        else:
+            metrics.counter('dedupe.suppressed').inc()
+            outcome = (await _wait_for(submission,
+                                       request.app['commit_timeout']) or
+                       api.DEDUPE_TIMEOUT)
+        status_code, message = outcome
+    else:
+        status_code, message = await _submit_transaction(request, tx, raw_tx,
+                                                         mode)
+
+    if status_code == 202:
+        return web.Response(body=raw_tx, status=202,
+                            content_type='application/json')
+    return _error_response(request, status_code, message)
+
+
+async def post_transaction_batch(request):
+    args = _parse_args(request, ('mode', parameters.valid_mode, False))
+    mode = args['mode'] or 'broadcast_tx_async'
+
+    try:
+        txs = api.parse_batch(await request.read(), request.content_type)
+    except ValueError as e:
+        return make_error(400, 'Invalid batch: {}'.format(e))
+
+    error = api.batch_error(txs)
+    if error:
+        return make_error(*error)
+
+    admission = request.app['admission']
+    reason = admission.admit(len(txs))
+    if reason:
+        return _error_response(request, 429,
+                               'Too many requests: {}'.format(reason))
+    try:
+        await _precheck(request.app, txs)
+        results, written, pending = await _in_thread(
+            request.app, api.write_batch, request.app, txs, mode)
+    finally:
+        admission.release(len(txs))
+
+    if pending:
+        deadline = time.monotonic() + request.app['commit_timeout']
+        written = await asyncio.gather(*[
+            _wait_for_commit(request, pending_commit, status_code, message,
+                             deadline)
+            for pending_commit, (status_code, message)
+            in zip(pending, written)])
+
+    return web.json_response(api.batch_statuses(txs, results, written))
+
+
+async def get_outputs(request):
+    args = _parse_args(request,
+                       ('public_key', parameters.valid_ed25519, True),
+                       ('spent', parameters.valid_bool, False),
+                       strict=True)
+
+    def load(bigchain):
+        return [{'transaction_id': output.txid, 'output_index': output.output}
+                for output in bigchain.get_outputs_filtered(args['public_key'],
+                                                            args['spent'])]
+
+    return web.json_response(await _with_bigchain(request.app, load))
+
+
+async def get_validators(request):
+    return web.json_response(
+        await _with_bigchain(request.app, BigchainDB.get_validators))
+
+
+ROUTES_API_V1 = [
+    ('GET', '', api_v1_index),
+    ('GET', 'assets', get_assets),
+    ('GET', 'metadata', get_metadata),
+    ('GET', r'blocks/{block_id:\d+}', get_block),
+    ('GET', 'blocks', get_blocks),
+    ('POST', 'transactions/batch', post_transaction_batch),
+    ('GET', 'transactions/{tx_id}/status', get_transaction_status),
+    ('GET', 'transactions/{tx_id}', get_transaction),
+    ('GET', 'transactions', get_transactions),
+    ('POST', 'transactions', post_transaction),
+    ('GET', 'outputs', get_outputs),
+    ('GET', 'validators', get_validators),
+]
+
+
+def add_routes(app):
+    """Add the routes of :mod:`bigchaindb.web.routes` to ``app``. Like
+    there, trailing slashes are optional."""
+
+    app.router.add_get('/', root_index)
+    for method, pattern, handler in ROUTES_API_V1:
+        path = '/api/v1/' + pattern
+        app.router.add_route(method, path.rstrip('/') or '/', handler)
+        app.router.add_route(method, path.rstrip('/') + '/', handler)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    """Allow cross-origin requests, like Flask-CORS does for the Flask
+    app."""
+
+    if request.method == 'OPTIONS':
+        response = web.Response(headers={
+            'Access-Control-Allow-Methods': request.headers.get(
+                'Access-Control-Request-Method', 'GET, POST'),
+            'Access-Control-Allow-Headers': request.headers.get(
+                'Access-Control-Request-Headers', '*'),
+        })
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+async def _sample_mempool(app):
+    """Keep the mempool size of the admission controller up to date."""
+
+    admission = app['admission']
+    while True:
+        try:
+            admission.last_mempool_size = await _with_bigchain(
+                app, BigchainDB.get_mempool_size)
+        except Exception as exc:
+            logger.warning('Could not sample the mempool size: %s', exc)
+        await asyncio.sleep(MEMPOOL_SAMPLE_INTERVAL)
+
+
+async def _on_startup(app):
+    # The processes are forked before any thread is started.
+    if app['processes'] and verification_cache.enabled():
+        app['process_pool'] = ProcessPoolExecutor(app['processes'])
+        await asyncio.get_event_loop().run_in_executor(app['process_pool'],
+                                                       int)
+    app['metrics_logging'] = metrics.start_logging(logger, 'web server')
+    if app['commit_registry'].queues:
+        app['commit_registry'].start(0)
+    if app['admission'].max_mempool_size:
+        app['mempool_sampler'] = asyncio.ensure_future(_sample_mempool(app))
+
+
+async def _on_cleanup(app):
+    if app.get('mempool_sampler'):
+        app['mempool_sampler'].cancel()
+    if app.get('metrics_logging'):
+        app['metrics_logging'].set()
+    app['thread_pool'].shutdown(wait=False)
+    if app['process_pool']:
+        app['process_pool'].shutdown(wait=False)
+
+
+def create_app(settings=None, *, bigchaindb_factory=None,
+               commit_registry=None):
+    """Return an instance of the aiohttp application.
+
+    Args:
+        settings (dict): the ``server`` settings, see
+            :func:`bigchaindb.web.server.create_app` for the ones related
+            to the API. ``threads`` is the number of threads running
+            database queries and Tendermint RPC calls (default: 16), and
+            ``workers`` the number of processes checking posted
+            transactions (default: the number of CPUs).
+        bigchaindb_factory: a callable returning a
+            :class:`~bigchaindb.BigchainDB` instance.
+        commit_registry (:class:`~bigchaindb.web.commit_registry.CommitRegistry`):
+            the registry used to wait for transactions posted in
+            ``commit`` mode. If it has a queue, it is started with the
+            application.
+
+    Return:
+        an instance of the aiohttp application.
+    """
+
+    settings = settings or {}
+    threads = settings.get('threads') or DEFAULT_THREADS
+
+    app = web.Application(middlewares=[cors_middleware])
+    app['bigchain_pool'] = utils.pool(bigchaindb_factory or BigchainDB,
+                                      size=threads)
+    app['thread_pool'] = ThreadPoolExecutor(max_workers=threads)
+    app['processes'] = settings.get('workers') or multiprocessing.cpu_count()
+    app['process_pool'] = None
+    app['response_cache'] = ResponseCache(
+        settings.get('response_cache_size', 1024))
+    app['commit_registry'] = commit_registry or CommitRegistry()
+    app['commit_timeout'] = settings.get('commit_timeout', 10)
+    app['dedupe_table'] = DedupeTable(settings.get('dedupe_ttl', 30))
+    app['admission'] = AdmissionController(
+        max_mempool_size=settings.get('admission_max_mempool_size', 0),
+        max_in_flight=settings.get('admission_max_in_flight', 0),
+        max_rejection_rate=settings.get('admission_max_rejection_rate', 0),
+        retry_after=settings.get('admission_retry_after', 2))
+    app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
+
+    add_routes(app)
+
+    return app
+
+
+class AsyncServer:
+    """Run the aiohttp application on the address given by the ``bind``
+    setting."""
+
+    def __init__(self, app, bind):
+        self.app = app
+        self.host, self.port = bind.rsplit(':', 1)
+
+    def run(self):
+        # The process running the server can't be daemonic, as the
+        # processes of its pool are its children, see
+        # :func:`bigchaindb.start.start`.
+        web.run_app(self.app, host=self.host, port=int(self.port),
+                    print=None)
+
+
+def create_server(settings, log_config=None, bigchaindb_factory=None,
+                  exchange=None):
+    """Wrap and return an application ready to be run, like
+    :func:`bigchaindb.web.server.create_server` does.
+
+    Args:
+        settings (dict): the ``server`` settings.
+        exchange (:class:`~bigchaindb.events.Exchange`): if given, the
+            server subscribes to its block events to wait for the
+            transactions posted in ``commit`` mode.
+
+    Return:
+        an :class:`AsyncServer`.
+    """
+
+    commit_registry = None
+    if exchange:
+        commit_registry = CommitRegistry(exchange.get_subscriber_queues(
+            1, EventTypes.BLOCK_VALID))
+
+    app = create_app(settings, bigchaindb_factory=bigchaindb_factory,
+                     commit_registry=commit_registry)
+    return AsyncServer(app, settings['bind'])
@@ -0,0 +1,206 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Registry of the transactions the web workers are waiting for.
+
+Instead of keeping a connection to Tendermint open with
+``broadcast_tx_commit`` until a transaction is committed, a worker sends
+it with ``broadcast_tx_sync`` and waits on the registry, which is fed by
+the block events of the :class:`~bigchaindb.events.Exchange`.
+
+Every worker process needs its own subscriber queue, but the queues must
+be created before the exchange starts, i.e. before the workers are
+forked. The registry is therefore created with a fixed number of queues
+(one per worker), and the Gunicorn hooks :meth:`CommitRegistry.pre_fork`,
+:meth:`CommitRegistry.post_fork` and :meth:`CommitRegistry.child_exit`
+assign them to the workers. A worker without a queue (e.g. when the number
+of workers has been increased at runtime) is not running its registry,
+and falls back to ``broadcast_tx_commit``.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+from bigchaindb.events import EventReader, POISON_PILL
+
+
+logger = logging.getLogger(__name__)
+
+
+class PendingCommit:
+    """A transaction waited for by one or more requests."""
+
+    def __init__(self, tx_id):
+        self.tx_id = tx_id
+        self.height = None
+        self.waiters = 0
+        self._committed = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def resolve(self, height):
+        with self._lock:
+            self.height = height
+            self._committed.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(height)
+
+    def add_done_callback(self, callback):
+        """Call ``callback`` with the height of the block the transaction
+        is committed in, from the thread resolving it. If the transaction
+        is already committed, ``callback`` is called right away.
+        """
+
+        with self._lock:
+            if not self._committed.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self.height)
+
+    def remove_done_callback(self, callback):
+        """Stop calling ``callback`` once the transaction is committed,
+        e.g. when waiting for it timed out."""
+
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout=None):
+        """Wait until the transaction is committed.
+
+        Returns:
+            The height of the block the transaction was committed in, or
+            ``None`` if ``timeout`` expired.
+        """
+
+        self._committed.wait(timeout)
+        return self.height
+
+
+class CommitRegistry:
+    """Map the ids of the transactions being waited for to a
+    :class:`PendingCommit`, and resolve them as blocks are committed.
+    """
+
+    def __init__(self, queues=(), recent_size=10000):
+        """Create a new registry.
+
+        Args:
+            queues (list): the subscriber queues of the block events, one
+                per worker.
+            recent_size (int): the number of recently committed
+                transactions to remember, so that a transaction committed
+                right before it is waited for is not missed.
+        """
+
+        self.queues = list(queues)
+        self.recent_size = recent_size
+        self.slot = None
+        self._pending = {}
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+        self._used_slots = set()
+
+    @property
+    def running(self):
+        """``True`` if the registry is fed with block events."""
+
+        return self.slot is not None
+
+    def register(self, tx_id):
+        """Start waiting for the transaction with id ``tx_id``.
+
+        Register the transaction *before* sending it to Tendermint, then
+        call :meth:`PendingCommit.wait` and finally :meth:`discard`.
+
+        Returns:
+            :class:`PendingCommit`
+        """
+
+        with self._lock:
+            pending = self._pending.get(tx_id)
+            if pending is None:
+                pending = self._pending[tx_id] = PendingCommit(tx_id)
+                height = self._recent.get(tx_id)
+                if height is not None:
+                    pending.resolve(height)
+            pending.waiters += 1
+            return pending
+
+    def discard(self, pending):
+        """Stop waiting for ``pending``."""
+
+        with self._lock:
+            pending.waiters -= 1
+            if not pending.waiters:
+                self._pending.pop(pending.tx_id, None)
+
+    def resolve(self, height, tx_ids):
+        """Mark the transactions ``tx_ids`` as committed at ``height``."""
+
+        with self._lock:
+            for tx_id in tx_ids:
+                self._recent[tx_id] = height
+                pending = self._pending.get(tx_id)
+                if pending:
+                    pending.resolve(height)
+            while len(self._recent) > self.recent_size:
+                self._recent.popitem(last=False)
+
+    def committed_height(self, tx_id):
+        """Return the height ``tx_id`` was recently committed at, or
+        ``None`` if the registry doesn't know about it."""
+
+        with self._lock:
+            return self._recent.get(tx_id)
+
+    def consume(self, queue):
+        """Resolve the transactions of the blocks read from ``queue``,
+        until a ``POISON_PILL`` is read."""
+
+        while True:
+            event = queue.get()
+            if event == POISON_PILL:
+                return
+            try:
+                block = event.data
+                self.resolve(block['height'],
+                             [tx['id'] for tx in block['transactions']])
+            except Exception:
+                logger.exception('Invalid block event')
+
+    def start(self, slot):
+        """Feed the registry with the events of the queue ``slot``."""
+
+        self.slot = slot
+        threading.Thread(target=self.consume, args=(self.queues[slot],),
+                         name='commit_registry', daemon=True).start()
+
+    def pre_fork(self, server, worker):
+        """Gunicorn hook assigning a free queue to ``worker``."""
+
+        free = [slot for slot in range(len(self.queues))
+                if slot not in self._used_slots]
+        worker.commit_registry_slot = free[0] if free else None
+        if free:
+            self._used_slots.add(free[0])
+
+    def post_fork(self, server, worker):
+        """Gunicorn hook starting the registry in ``worker``."""
+
+        if worker.commit_registry_slot is not None:
+            # A worker replacing one which exited is forked from the
+            # arbiter, whose reader still points at the events published
+            # before the first workers started
+            queue = self.queues[worker.commit_registry_slot]
+            if isinstance(queue, EventReader):
+                queue.seek_to_head()
+            self.start(worker.commit_registry_slot)
+
+    def child_exit(self, server, worker):
+        """Gunicorn hook freeing the queue of ``worker``."""
+
+        self._used_slots.discard(worker.commit_registry_slot)
@@ -0,0 +1,132 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Table of the transaction submissions in flight or recently accepted.
+
+Client retries and replays often post the very same transaction several
+times within seconds. The first submission is processed as usual, while
+identical submissions wait for its outcome (if it is still in flight) or
+get it straight from the table (if it was accepted), without validating
+the transaction again or sending it to Tendermint. Every worker process
+holds its own table.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class Submission:
+    """A submission, and its outcome once processed."""
+
+    def __init__(self):
+        self.outcome = None
+        self.expires = None
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def resolve(self, outcome):
+        with self._lock:
+            self.outcome = outcome
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(outcome)
+
+    def add_done_callback(self, callback):
+        """Call ``callback`` with the outcome of the submission, from the
+        thread processing it. If it is processed already, ``callback`` is
+        called right away.
+        """
+
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self.outcome)
+
+    def remove_done_callback(self, callback):
+        """Stop calling ``callback`` once the submission is processed,
+        e.g. when waiting for it timed out."""
+
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, timeout=None):
+        """Wait for the submission to be processed, and return its
+        outcome, or ``None`` if ``timeout`` expired."""
+
+        self._done.wait(timeout)
+        return self.outcome
+
+
+class DedupeTable:
+    """A thread-safe mapping from a submission key to a
+    :class:`Submission`. Accepted submissions are kept for ``ttl``
+    seconds.
+    """
+
+    def __init__(self, ttl, size=10000):
+        """Create a new table.
+
+        Args:
+            ttl (float): how many seconds to keep accepted submissions.
+                If ``0`` nothing is deduplicated.
+            size (int): the maximum number of submissions to keep.
+        """
+
+        self.ttl = ttl
+        self.size = size
+        self._submissions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._submissions)
+
+    def claim(self, key):
+        """Return the :class:`Submission` for ``key``, and whether it is a
+        new one. The caller must process a new submission and then call
+        :meth:`complete`.
+        """
+
+        if not self.ttl:
+            return Submission(), True
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            submission = self._submissions.get(key)
+            if submission is not None:
+                return submission, False
+            submission = self._submissions[key] = Submission()
+            return submission, True
+
+    def complete(self, key, submission, outcome, accepted):
+        """Record the ``outcome`` of a new ``submission``. Only accepted
+        submissions are kept, any other one is forgotten, so that the next
+        identical submission is processed again.
+        """
+
+        with self._lock:
+            if accepted and self.ttl:
+                submission.expires = time.monotonic() + self.ttl
+                self._submissions.pop(key, None)
+                self._submissions[key] = submission
+            elif self._submissions.get(key) is submission:
+                del self._submissions[key]
+        submission.resolve(outcome)
+
+    def _expire(self, now):
+        # Accepted submissions are moved to the end when completed, and
+        # they all have the same ttl, so the ones that expired are first.
+        while self._submissions:
+            key, submission = next(iter(self._submissions.items()))
+            if submission.expires is None or submission.expires > now:
+                if len(self._submissions) < self.size:
+                    break
+                # The table is full of submissions in flight or still valid
+                # ones: forget the oldest, at worst a duplicate is processed.
+            self._submissions.popitem(last=False)
@@ -0,0 +1,107 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Cache for the serialized responses of immutable resources.
+
+Committed transactions and blocks never change, so once they have been
+serialized the resulting bytes can be served again without touching the
+database. Every worker process holds its own cache.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from flask import current_app, request
+from flask_restful.representations.json import output_json
+
+from bigchaindb.web.views.base import make_error
+
+
+# One year is the maximum value recommended by RFC 7234.
+CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+CachedResponse = namedtuple('CachedResponse', ('body', 'etag'))
+
+
+class ResponseCache:
+    """A thread-safe LRU mapping from a resource key to its serialized
+    body and strong ETag.
+    """
+
+    def __init__(self, size):
+        """Create a new cache.
+
+        Args:
+            size (int): the maximum number of responses to keep. If ``0``
+                nothing is stored.
+        """
+
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the :class:`CachedResponse` stored for ``key``, or
+        ``None`` if there is none.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body):
+        """Store ``body`` under ``key`` and return the resulting
+        :class:`CachedResponse`.
+        """
+
+        entry = CachedResponse(body=body, etag=hashlib.sha256(body).hexdigest())
+        if not self.size:
+            return entry
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return entry
+
+
+def immutable_response(key, loader):
+    """Return the response for the immutable resource identified by ``key``.
+
+    The resource is loaded with ``loader`` only if it is not already
+    cached. If ``loader`` returns ``None`` a ``404`` is returned and nothing
+    is cached, since the resource might still be committed later.
+
+    Args:
+        key (tuple): a key identifying the resource.
+        loader (callable): a function returning the resource as a
+            JSON-serializable object, or ``None`` if it does not exist.
+    """
+
+    cache = current_app.config['response_cache']
+    entry = cache.get(key)
+
+    if entry is None:
+        data = loader()
+        if data is None:
+            return make_error(404)
+        entry = cache.put(key, output_json(data, 200).get_data())
+
+    response = current_app.response_class(entry.body,
+                                          mimetype='application/json')
+    response.set_etag(entry.etag)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response.make_conditional(request)
@@ -34,6 +34,8 @@ ROUTES_API_V1 = [
     r('metadata/', metadata.MetadataApi),
     r('blocks/<int:block_id>', blocks.BlockApi),
     r('blocks/', blocks.BlockListApi),
+    r('transactions/batch', tx.TransactionBatchApi),
+    r('transactions/<string:tx_id>/status', tx.TransactionStatusApi),
     r('transactions/<string:tx_id>', tx.TransactionApi),
     r('transactions', tx.TransactionListApi),
     r('outputs/', outputs.OutputListApi),
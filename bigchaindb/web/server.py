@@ -8,18 +8,32 @@ The application is implemented in Flask and runs using Gunicorn.
 """
 
 import copy
+import logging
 import multiprocessing
+import os
+import threading
 
 from flask import Flask
 from flask_cors import CORS
 import gunicorn.app.base
 
-from bigchaindb import utils
+from bigchaindb import metrics, utils
 from bigchaindb import BigchainDB
+from bigchaindb.events import EventTypes
+from bigchaindb.web.admission import AdmissionController
+from bigchaindb.web.commit_registry import CommitRegistry
+from bigchaindb.web.dedupe import DedupeTable
 from bigchaindb.web.routes import add_routes
+from bigchaindb.web.response_cache import ResponseCache
 from bigchaindb.web.strip_content_type_middleware import StripContentTypeMiddleware
 
 
+logger = logging.getLogger(__name__)
+
+# The default number of threads of a worker process.
+DEFAULT_THREADS = 4
+
+
 # TODO: Figure out if we do we need all this boilerplate.
 class StandaloneApplication(gunicorn.app.base.BaseApplication):
     """Run a **wsgi** app wrapping it in a Gunicorn Base Application.
@@ -59,13 +73,42 @@ class StandaloneApplication(gunicorn.app.base.BaseApplication):
         return self.application
 
 
-def create_app(*, debug=False, threads=1, bigchaindb_factory=None):
+def create_app(*, debug=False, threads=DEFAULT_THREADS,
+               bigchaindb_factory=None, response_cache_size=1024,
+               commit_registry=None, commit_timeout=10, status_max_waiters=2,
+               dedupe_ttl=30, admission_max_mempool_size=0,
+               admission_max_in_flight=0, admission_max_rejection_rate=0,
+               admission_retry_after=2):
     """Return an instance of the Flask application.
 
     Args:
         debug (bool): a flag to activate the debug mode for the app
             (default: False).
-        threads (int): number of threads to use
+        threads (int): number of threads to use (default: 4).
+        response_cache_size (int): number of serialized transactions and
+            blocks to cache in each worker (default: 1024).
+        commit_registry (:class:`~bigchaindb.web.commit_registry.CommitRegistry`):
+            the registry used to wait for transactions posted in
+            ``commit`` mode. If not given, they are posted with
+            ``broadcast_tx_commit``.
+        commit_timeout (float): seconds to wait for a transaction posted
+            in ``commit`` mode to be committed (default: 10).
+        status_max_waiters (int): the maximum number of status requests
+            waiting for a commit at once, capped to ``threads - 1``
+            (default: 2). The others get a ``503``.
+        dedupe_ttl (float): seconds during which identical submissions of
+            an accepted transaction get the same response without being
+            processed again (default: 30).
+        admission_max_mempool_size (int): reject new transactions with a
+            ``429`` while Tendermint's mempool holds more transactions
+            than this (default: 0, no limit).
+        admission_max_in_flight (int): the maximum number of transactions
+            each worker processes at once (default: 0, no limit).
+        admission_max_rejection_rate (float): reject new transactions
+            while Tendermint rejects a larger fraction of the ones sent
+            to it (default: 0, no limit).
+        admission_retry_after (int): the ``Retry-After`` of the ``429``
+            responses, in seconds (default: 2).
     Return:
         an instance of the Flask application.
     """
@@ -81,18 +124,46 @@ def create_app(*, debug=False, threads=1, bigchaindb_factory=None):
     app.debug = debug
 
     app.config['bigchain_pool'] = utils.pool(bigchaindb_factory, size=threads)
+    app.config['response_cache'] = ResponseCache(response_cache_size)
+    app.config['commit_registry'] = commit_registry or CommitRegistry()
+    app.config['commit_timeout'] = commit_timeout
+    app.config['dedupe_table'] = DedupeTable(dedupe_ttl)
+    # A thread is always left to serve the requests that don't wait.
+    app.config['status_waiters'] = threading.BoundedSemaphore(
+        max(min(status_max_waiters, threads - 1), 0))
+
+    def mempool_size():
+        with app.config['bigchain_pool']() as bigchain:
+            return bigchain.get_mempool_size()
+
+    app.config['admission'] = AdmissionController(
+        mempool_size,
+        max_mempool_size=admission_max_mempool_size,
+        max_in_flight=admission_max_in_flight,
+        max_rejection_rate=admission_max_rejection_rate,
+        retry_after=admission_retry_after)
 
     add_routes(app)
 
     return app
 
 
-def create_server(settings, log_config=None, bigchaindb_factory=None):
+def post_fork(server, worker):
+    """Gunicorn hook making ``worker`` log its metrics periodically."""
+
+    metrics.start_logging(logger, 'web worker {}'.format(os.getpid()))
+
+
+def create_server(settings, log_config=None, bigchaindb_factory=None,
+                  exchange=None):
     """Wrap and return an application ready to be run.
 
     Args:
         settings (dict): a dictionary containing the settings, more info
             here http://docs.gunicorn.org/en/latest/settings.html
+        exchange (:class:`~bigchaindb.events.Exchange`): if given, the
+            workers subscribe to its block events to wait for the
+            transactions posted in ``commit`` mode.
 
     Return:
         an initialized instance of the application.
@@ -104,14 +175,42 @@ def create_server(settings, log_config=None, bigchaindb_factory=None):
         settings['workers'] = (multiprocessing.cpu_count() * 2) + 1
 
     if not settings.get('threads'):
-        # Note: Threading is not recommended currently, as the frontend workload
-        # is largely CPU bound and parallisation across Python threads makes it
-        # slower.
-        settings['threads'] = 1
+        # Validating transactions is CPU bound and doesn't get faster with
+        # more threads, but waiting for a transaction posted in `commit`
+        # mode (or for a status) doesn't use the CPU: a worker with a single
+        # thread would serve nothing else meanwhile.
+        settings['threads'] = DEFAULT_THREADS
+
+    commit_registry = None
+    settings['post_fork'] = post_fork
+    if exchange:
+        commit_registry = CommitRegistry(exchange.get_subscriber_queues(
+            settings['workers'], EventTypes.BLOCK_VALID))
+
+        def post_fork_with_registry(server, worker):
+            commit_registry.post_fork(server, worker)
+            post_fork(server, worker)
+
+        settings['pre_fork'] = commit_registry.pre_fork
+        settings['post_fork'] = post_fork_with_registry
+        settings['child_exit'] = commit_registry.child_exit
 
     settings['custom_log_config'] = log_config
     app = create_app(debug=settings.get('debug', False),
                      threads=settings['threads'],
-                     bigchaindb_factory=bigchaindb_factory)
+                     bigchaindb_factory=bigchaindb_factory,
+                     response_cache_size=settings.get('response_cache_size', 1024),
+                     commit_registry=commit_registry,
+                     commit_timeout=settings.get('commit_timeout', 10),
+                     status_max_waiters=settings.get('status_max_waiters', 2),
+                     dedupe_ttl=settings.get('dedupe_ttl', 30),
+                     admission_max_mempool_size=settings.get(
+                         'admission_max_mempool_size', 0),
+                     admission_max_in_flight=settings.get(
+                         'admission_max_in_flight', 0),
+                     admission_max_rejection_rate=settings.get(
+                         'admission_max_rejection_rate', 0),
+                     admission_retry_after=settings.get(
+                         'admission_retry_after', 2))
     standalone = StandaloneApplication(app, options=settings)
     return standalone
@@ -9,7 +9,7 @@ For more information please refer to the documentation: http://bigchaindb.com/ht
 from flask import current_app
 from flask_restful import Resource, reqparse
 
-from bigchaindb.web.views.base import make_error
+from bigchaindb.web.response_cache import immutable_response
 
 
 class BlockApi(Resource):
@@ -25,13 +25,11 @@ class BlockApi(Resource):
 
         pool = current_app.config['bigchain_pool']
 
-        with pool() as bigchain:
-            block = bigchain.get_block(block_id=block_id)
-
-        if not block:
-            return make_error(404)
+        def load():
+            with pool() as bigchain:
+                return bigchain.get_block(block_id=block_id)
 
-        return block
+        return immutable_response(('blocks', block_id), load)
 
 
 class BlockListApi(Resource):
@@ -14,18 +14,7 @@ from bigchaindb.web.websocket_server import EVENTS_ENDPOINT
 
 class RootIndex(Resource):
     def get(self):
-        docs_url = [
-            'https://docs.bigchaindb.com/projects/server/en/v',
-            version.__version__ + '/'
-        ]
-        return flask.jsonify({
-            'api': {
-                'v1': get_api_v1_info('/api/v1/')
-            },
-            'docs': ''.join(docs_url),
-            'software': 'BigchainDB',
-            'version': version.__version__,
-        })
+        return flask.jsonify(get_root_info())
 
 
 class ApiV1Index(Resource):
@@ -33,6 +22,22 @@ class ApiV1Index(Resource):
         return flask.jsonify(get_api_v1_info('/'))
 
 
+def get_root_info():
+    """Return a dict with the information about the node and its APIs."""
+    docs_url = [
+        'https://docs.bigchaindb.com/projects/server/en/v',
+        version.__version__ + '/'
+    ]
+    return {
+        'api': {
+            'v1': get_api_v1_info('/api/v1/')
+        },
+        'docs': ''.join(docs_url),
+        'software': 'BigchainDB',
+        'version': version.__version__,
+    }
+
+
 def get_api_v1_info(api_prefix):
     """Return a dict with all the information specific for the v1 of the
     api.
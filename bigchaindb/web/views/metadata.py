@@ -11,7 +11,7 @@ import logging
 from flask_restful import reqparse, Resource
 from flask import current_app
 
-from bigchaindb.backend.exceptions import OperationError
+from bigchaindb.web import api
 from bigchaindb.web.views.base import make_error
 
 logger = logging.getLogger(__name__)
@@ -35,20 +35,8 @@ class MetadataApi(Resource):
 
         if not args['search']:
             return make_error(400, 'text_search cannot be empty')
-        if not args['limit']:
-            del args['limit']
-
-        pool = current_app.config['bigchain_pool']
-
-        with pool() as bigchain:
-            args['table'] = 'metadata'
-            metadata = bigchain.text_search(**args)
-
-        try:
-            # This only works with MongoDB as the backend
-            return list(metadata)
-        except OperationError as e:
-            return make_error(
-                400,
-                '({}): {}'.format(type(e).__name__, e)
-            )
+        results, error = api.text_search(current_app.config, args['search'],
+                                         args['limit'], table='metadata')
+        if error:
+            return make_error(400, error)
+        return results
@@ -36,6 +36,13 @@ def valid_operation(op):
     raise ValueError('Operation must be "CREATE" or "TRANSFER"')
 
 
+def valid_height(height):
+    height = int(height)
+    if height < 0:
+        raise ValueError('Height must be a non-negative integer')
+    return height
+
+
 def valid_mode(mode):
     if mode == 'async':
         return 'broadcast_tx_async'
@@ -44,3 +51,10 @@ def valid_mode(mode):
     if mode == 'commit':
         return 'broadcast_tx_commit'
     raise ValueError('Mode must be "async", "sync" or "commit"')
+
+
+def valid_wait(wait):
+    wait = float(wait)
+    if not 0 <= wait < float('inf'):
+        raise ValueError('Wait must be a non-negative number of seconds')
+    return wait
@@ -7,14 +7,18 @@
 For more information please refer to the documentation: http://bigchaindb.com/http-api
 """
 import logging
+import time
 
-from flask import current_app, request, jsonify
+import rapidjson
+from flask import current_app, request
 from flask_restful import Resource, reqparse
 
-from bigchaindb.common.exceptions import SchemaValidationError, ValidationError
+from bigchaindb import metrics
+from bigchaindb.web import api
 from bigchaindb.web.views.base import make_error
 from bigchaindb.web.views import parameters
-from bigchaindb.models import Transaction
+from bigchaindb.web.response_cache import immutable_response
+from bigchaindb.tendermint_utils import serialize_transaction
 
 
 logger = logging.getLogger(__name__)
@@ -32,13 +36,63 @@ class TransactionApi(Resource):
         """
         pool = current_app.config['bigchain_pool']
 
-        with pool() as bigchain:
-            tx = bigchain.get_transaction(tx_id)
+        def load():
+            with pool() as bigchain:
+                return bigchain.get_transaction_dict(tx_id)
 
-        if not tx:
-            return make_error(404)
+        return immutable_response(('transactions', tx_id), load)
+
+
+class TransactionStatusApi(Resource):
+    def get(self, tx_id):
+        """API endpoint to get whether a transaction is committed.
 
-        return tx.to_dict()
+        If it is not, the request waits up to ``wait`` seconds for the
+        block event of the transaction, and then checks the database
+        again. At most ``status_waiters`` requests of a worker wait at
+        once, the others get a ``503``.
+
+        Args:
+            tx_id (str): the id of the transaction.
+
+        Return:
+            A JSON string containing the status of the transaction.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('wait', type=parameters.valid_wait, default=0)
+        args = parser.parse_args()
+        wait = min(args['wait'], api.MAX_STATUS_WAIT)
+
+        state = current_app.config
+        registry = state['commit_registry']
+        waiters = state['status_waiters']
+        # Registering first ensures a commit happening right after the
+        # database lookup below is not missed.
+        pending = registry.register(tx_id)
+        refused = False
+        try:
+            committed = api.is_committed(state, tx_id)
+            if not committed and wait and api.needs_wait(pending):
+                if registry.running and waiters.acquire(blocking=False):
+                    try:
+                        height = pending.wait(wait)
+                    finally:
+                        waiters.release()
+                    # Block events contain the transactions failing
+                    # `deliver_tx` as well.
+                    if height is not None:
+                        committed = api.is_committed(state, tx_id)
+                else:
+                    metrics.counter('status.waits_refused').inc()
+                    refused = True
+        finally:
+            registry.discard(pending)
+
+        if refused:
+            return make_error(503, api.WAIT_REFUSED_MESSAGE)
+        if not committed:
+            return make_error(404)
+        return {'id': tx_id, 'status': 'committed'}
 
 
 class TransactionListApi(Resource):
@@ -66,40 +120,150 @@ class TransactionListApi(Resource):
         args = parser.parse_args()
         mode = str(args['mode'])
 
-        pool = current_app.config['bigchain_pool']
-
-        # `force` will try to format the body of the POST request even if the
-        # `content-type` header is not set to `application/json`
-        tx = request.get_json(force=True)
+        # Load is shed before any work is spent on the transaction.
+        admission = current_app.config['admission']
+        reason = admission.admit()
+        if reason:
+            return _error_response(429, 'Too many requests: {}'.format(reason))
+        try:
+            return self._post(mode)
+        finally:
+            admission.release()
 
+    def _post(self, mode):
+        # The body is parsed regardless of the `content-type` header.
         try:
-            tx_obj = Transaction.from_dict(tx)
-        except SchemaValidationError as e:
-            return make_error(
-                400,
-                message='Invalid transaction schema: {}'.format(
-                    e.__cause__.message)
-            )
-        except ValidationError as e:
-            return make_error(
-                400,
-                'Invalid transaction ({}): {}'.format(type(e).__name__, e)
-            )
-
-        with pool() as bigchain:
-            try:
-                bigchain.validate_transaction(tx_obj)
-            except ValidationError as e:
-                return make_error(
-                    400,
-                    'Invalid transaction ({}): {}'.format(type(e).__name__, e)
-                )
+            tx = rapidjson.loads(request.get_data())
+        except ValueError as e:
+            return make_error(400, 'Invalid JSON: {}'.format(e))
+        # The transaction is serialized once, and the same bytes are sent
+        # to Tendermint and back to the client, however the client
+        # formatted the body.
+        raw_tx = serialize_transaction(tx)
+
+        key = api.submission_key(tx, raw_tx, mode)
+        if key:
+            # Identical submissions of a transaction share the outcome of
+            # the first one while it is in flight or recently accepted.
+            dedupe = current_app.config['dedupe_table']
+            submission, new = dedupe.claim(key)
+            if new:
+                outcome = api.INTERNAL_ERROR
+                try:
+                    outcome = _submit_transaction(tx, raw_tx, mode)
+                finally:
+                    dedupe.complete(key, submission, outcome,
+                                    accepted=outcome[0] == 202)
             else:
-                status_code, message = bigchain.write_transaction(tx_obj, mode)
+                metrics.counter('dedupe.suppressed').inc()
+                outcome = (submission.wait(current_app.config['commit_timeout']) or
+                           api.DEDUPE_TIMEOUT)
+            status_code, message = outcome
+        else:
+            status_code, message = _submit_transaction(tx, raw_tx, mode)
 
         if status_code == 202:
-            response = jsonify(tx)
-            response.status_code = 202
-            return response
+            return current_app.response_class(raw_tx, status=202,
+                                              mimetype='application/json')
         else:
-            return make_error(status_code, message)
+            return _error_response(status_code, message)
+
+
+class TransactionBatchApi(Resource):
+    def post(self):
+        """API endpoint to push many transactions at once.
+
+        The body is either a JSON array of transactions or, if the
+        ``Content-Type`` is ``application/x-ndjson``, one transaction per
+        line. Transactions are validated concurrently, and the valid ones
+        are sent to Tendermint in the order they were given.
+
+        Return:
+            A ``list`` with the status of every transaction, in order.
+        """
+        parser = reqparse.RequestParser()
+        parser.add_argument('mode', type=parameters.valid_mode,
+                            default='broadcast_tx_async')
+        args = parser.parse_args()
+        mode = str(args['mode'])
+
+        try:
+            txs = api.parse_batch(request.get_data(), request.mimetype)
+        except ValueError as e:
+            return make_error(400, 'Invalid batch: {}'.format(e))
+
+        error = api.batch_error(txs)
+        if error:
+            return make_error(*error)
+
+        admission = current_app.config['admission']
+        reason = admission.admit(len(txs))
+        if reason:
+            return _error_response(429, 'Too many requests: {}'.format(reason))
+        try:
+            return self._post(mode, txs)
+        finally:
+            admission.release(len(txs))
+
+    def _post(self, mode, txs):
+        results, written, pending = api.write_batch(current_app.config, txs,
+                                                    mode)
+        if pending:
+            deadline = time.monotonic() + current_app.config['commit_timeout']
+            written = [_wait_for_commit(pending_commit, status_code, message,
+                                        deadline)
+                       for pending_commit, (status_code, message)
+                       in zip(pending, written)]
+        return api.batch_statuses(txs, results, written)
+
+
+def _error_response(status_code, message):
+    """Return the error response for ``status_code``, telling clients when
+    to retry if the node is overloaded."""
+
+    response = make_error(status_code, message)
+    if status_code == 429:
+        response.headers['Retry-After'] = str(
+            current_app.config['admission'].retry_after)
+    return response
+
+
+def _submit_transaction(tx, raw_tx, mode):
+    """Validate the transaction ``tx``, serialized as ``raw_tx``, send it
+    to Tendermint in ``mode``, and wait for it to be committed in
+    ``commit`` mode, see :func:`~bigchaindb.web.api.write_transaction`.
+
+    Returns:
+        A ``(status_code, message)`` tuple.
+    """
+
+    status_code, message, pending = api.write_transaction(
+        current_app.config, tx, raw_tx, mode)
+    if pending:
+        status_code, message = _wait_for_commit(pending, status_code,
+                                                message)
+    return status_code, message
+
+
+def _wait_for_commit(pending, status_code, message, deadline=None):
+    """Wait for the transaction of ``pending``, sent with
+    ``broadcast_tx_sync``, to be committed. ``status_code`` and ``message``
+    are the result of the broadcast. The wait ends after the
+    ``commit_timeout`` of the app, or at ``deadline`` (see
+    :func:`time.monotonic`) if given.
+
+    Returns:
+        The ``(status_code, message)`` ``broadcast_tx_commit`` would have
+        led to.
+    """
+
+    registry = current_app.config['commit_registry']
+    try:
+        if status_code != 202:
+            return status_code, message
+        if deadline is None:
+            deadline = time.monotonic() + current_app.config['commit_timeout']
+        height = pending.wait(max(deadline - time.monotonic(), 0))
+    finally:
+        registry.discard(pending)
+    return api.commit_outcome(current_app.config, pending, height)
@@ -18,34 +18,59 @@
 import json
 import asyncio
 import logging
-import threading
+from collections import Counter, deque
+from functools import partial
 from uuid import uuid4
 from concurrent.futures import CancelledError
 
 import aiohttp
 from aiohttp import web
 
-from bigchaindb import config
-from bigchaindb.events import EventTypes
+from bigchaindb import backend, config, metrics
+from bigchaindb.events import AsyncEventReader, EventTypes
+from bigchaindb.lib import read_committed_blocks
+from bigchaindb.web.views import parameters
 
 
 logger = logging.getLogger(__name__)
 POISON_PILL = 'POISON_PILL'
 EVENTS_ENDPOINT = '/api/v1/streams/valid_transactions'
-
-
-def _multiprocessing_to_asyncio(in_queue, out_queue, loop):
-    """Bridge between a synchronous multiprocessing queue
-    and an asynchronous asyncio queue.
-
-    Args:
-        in_queue (multiprocessing.Queue): input queue
-        out_queue (asyncio.Queue): output queue
-    """
-
-    while True:
-        value = in_queue.get()
-        loop.call_soon_threadsafe(out_queue.put_nowait, value)
+ADMISSIONS_ENDPOINT = '/api/v1/streams/admissions'
+
+# What to do with a new event when the queue of a subscriber is full
+DROP_OLDEST = 'drop_oldest'
+DISCONNECT = 'disconnect'
+OVERFLOW_POLICIES = (DROP_OLDEST, DISCONNECT)
+# Sent to subscribers disconnected by the ``disconnect`` policy
+OVERFLOW_CLOSE_CODE = aiohttp.WSCloseCode.TRY_AGAIN_LATER
+# Seconds to wait for a disconnected subscriber to get the close frame
+CLOSE_TIMEOUT = 5
+# Number of blocks read at once to replay them
+REPLAY_BATCH_SIZE = 100
+# Seconds between two logs of the metrics of a worker process
+METRICS_LOG_INTERVAL = 60
+# What subscribers get: the ids of each transaction, each transaction, or
+# the transactions of each block in one message
+IDS = 'ids'
+TRANSACTION = 'transaction'
+BLOCK = 'block'
+PAYLOADS = (IDS, TRANSACTION, BLOCK)
+# The query string arguments subscribers can filter transactions with,
+# and how to parse them
+FILTERS = {
+    'asset_id': parameters.valid_txid,
+    'operation': parameters.valid_operation,
+    'public_key': parameters.valid_ed25519,
+}
+
+
+def filter_values(tx, tx_event):
+    """Return the values of a transaction for each of :data:`FILTERS`."""
+
+    return {'asset_id': (tx_event['asset_id'],),
+            'operation': (tx['operation'],),
+            'public_key': {public_key for output in tx['outputs']
+                           for public_key in output['public_keys']}}
 
 
 def eventify_block(block):
@@ -59,41 +84,440 @@ def eventify_block(block):
                'transaction_id': tx['id']}
 
 
+def transaction_message(tx, tx_event, payload):
+    """Serialize the event of a transaction for subscribers of the
+    ``ids`` or ``transaction`` payload."""
+
+    if payload == TRANSACTION:
+        return json.dumps(dict(tx_event, transaction=tx))
+    return json.dumps(tx_event)
+
+
+def block_message(height, transactions):
+    """Serialize some transactions of a block for subscribers of the
+    ``block`` payload."""
+
+    return json.dumps({'height': height, 'transactions': transactions})
+
+
+class Subscriber:
+    """A websocket, with a bounded queue of the messages to send to it
+    and its own task sending them, so that a slow client only delays
+    itself.
+
+    Depending on its ``payload``, a subscriber gets the ids of each
+    transaction, each full transaction, or one message for each block
+    with its transactions.
+
+    A subscriber created with a ``from_height`` first gets the
+    transactions of the committed blocks from that height, read with
+    ``read_blocks``. The live messages published meanwhile are held, then
+    queued if they are from a later block than the replayed ones.
+    """
+
+    def __init__(self, websocket, *, queue_size, overflow, loop,
+                 filters=None, from_height=None, read_blocks=None,
+                 payload=IDS):
+        self.websocket = websocket
+        self.filters = filters or {}
+        self.payload = payload
+        self.queue = asyncio.Queue(maxsize=queue_size, loop=loop)
+        self.overflow = overflow
+        self.closed = False
+        self.loop = loop
+        # Live messages from lower heights were replayed
+        self.next_height = from_height or 0
+        self.writer = loop.create_task(self.write())
+        if from_height is None:
+            self.held = None
+            self.replayer = None
+        else:
+            self.held = deque()
+            self.replayer = loop.create_task(self.replay(read_blocks))
+
+    def matches(self, values):
+        """Tell whether a transaction matches the filters.
+
+        Args:
+            values (dict): the values of the transaction, by filter.
+        """
+
+        return all(not self.filters[name].isdisjoint(values[name])
+                   for name in self.filters)
+
+    def block_messages(self, block):
+        """Serialize the transactions of a block matching the filters."""
+
+        matching = [(tx, tx_event) for tx, tx_event
+                    in zip(block['transactions'], eventify_block(block))
+                    if self.matches(filter_values(tx, tx_event))]
+        if self.payload != BLOCK:
+            return [transaction_message(tx, tx_event, self.payload)
+                    for tx, tx_event in matching]
+        if matching:
+            return [block_message(block['height'],
+                                  [tx for tx, _ in matching])]
+        return []
+
+    def put(self, message, height=None):
+        """Enqueue a message without waiting.
+
+        Args:
+            message (str): the message.
+            height (int): the height of the block of the message, if any.
+
+        Return:
+            The number of messages dropped because the queue is full.
+        """
+
+        if self.closed or (height is not None and height < self.next_height):
+            return 0
+
+        if self.held is not None:
+            self.held.append((message, height))
+            if len(self.held) <= self.queue.maxsize:
+                return 0
+        else:
+            try:
+                self.queue.put_nowait(message)
+                return 0
+            except asyncio.QueueFull:
+                pass
+
+        # Dropping a held message would leave a gap in the replayed
+        # history, so a replay is always cut short with a disconnection
+        if self.overflow == DISCONNECT or self.held is not None:
+            dropped = self.queue.qsize() + (
+                1 if self.held is None else len(self.held))
+            self.close(code=OVERFLOW_CLOSE_CODE, message=b'Too many pending events')
+            return dropped
+
+        self.queue.get_nowait()
+        self.queue.put_nowait(message)
+        return 1
+
+    @asyncio.coroutine
+    def replay(self, read_blocks):
+        """Queue the transactions of the committed blocks from
+        ``next_height``, then the held messages."""
+
+        try:
+            while True:
+                blocks = yield from self.loop.run_in_executor(
+                    None, read_blocks, self.next_height, REPLAY_BATCH_SIZE,
+                    self.payload != IDS)
+                for block in blocks:
+                    for message in self.block_messages(block):
+                        # Wait for the client rather than drop history
+                        yield from self.queue.put(message)
+                        metrics.counter('websocket.replayed').inc()
+                    self.next_height = block['height'] + 1
+                if len(blocks) < REPLAY_BATCH_SIZE:
+                    break
+        except CancelledError:
+            raise
+        except Exception:
+            logger.exception('Cannot replay the blocks from height %s',
+                             self.next_height)
+            self.replayer = None
+            self.close(code=aiohttp.WSCloseCode.INTERNAL_ERROR,
+                       message=b'Cannot replay the blocks')
+            return
+
+        held, self.held = self.held, None
+        for message, height in held:
+            self.put(message, height)
+
+    @asyncio.coroutine
+    def write(self):
+        """Send the queued messages, until the websocket fails."""
+
+        while True:
+            message = yield from self.queue.get()
+            try:
+                yield from self.websocket.send_str(message)
+            except CancelledError:
+                raise
+            except Exception as e:
+                logger.debug('Websocket exception: %s', str(e))
+                return
+
+    def close(self, **kwargs):
+        """Stop sending messages. If ``kwargs`` are given, also close the
+        websocket with them."""
+
+        self.closed = True
+        self.writer.cancel()
+        if self.replayer:
+            self.replayer.cancel()
+        self.queue = asyncio.Queue(loop=self.loop)
+        if kwargs:
+            self.loop.create_task(self._close_websocket(**kwargs))
+
+    @asyncio.coroutine
+    def _close_websocket(self, **kwargs):
+        # A stalled client may never read the close frame
+        try:
+            yield from asyncio.wait_for(self.websocket.close(**kwargs),
+                                        CLOSE_TIMEOUT, loop=self.loop)
+        except CancelledError:
+            raise
+        except Exception as e:
+            logger.debug('Websocket exception: %s', str(e))
+
+
 class Dispatcher:
     """Dispatch events to websockets.
 
-    This class implements a simple publish/subscribe pattern.
+    This class implements a simple publish/subscribe pattern. Publishing
+    only enqueues messages: each subscriber has a queue of at most
+    ``queue_size`` messages, and a task sending them to its websocket.
+    When the queue of a subscriber is full, either its oldest message is
+    dropped (``overflow='drop_oldest'``), or it is disconnected
+    (``overflow='disconnect'``).
+
+    Subscribers can only get the transactions matching some values of
+    :data:`FILTERS`. The subscribers are indexed by those values, so
+    that finding the ones to send a transaction to only depends on the
+    number of matching subscribers. They can also get the transactions
+    of the blocks committed from a height before the live ones.
+
+    Each message is serialized once, and the same string is queued for
+    all the subscribers of its payload, or for all the ones of the
+    ``block`` payload matching the same transactions of a block.
+
+    Other subscribers get the ``TX_ACCEPTED`` and ``TX_REJECTED`` events
+    instead, at most ``admissions_rate_limit`` per second. Each message
+    tells how many events were skipped since the previous one.
     """
 
-    def __init__(self, event_source):
+    def __init__(self, event_source, *, queue_size=1000,
+                 overflow=DROP_OLDEST, read_blocks=None,
+                 admissions_rate_limit=100, loop=None):
         """Create a new instance.
 
         Args:
             event_source: a source of events. Elements in the queue
             should be strings.
+            queue_size (int): the maximum number of messages waiting to
+            be sent to a subscriber.
+            overflow (str): what to do when the queue of a subscriber is
+            full, one of :data:`OVERFLOW_POLICIES`.
+            read_blocks (callable): a function like
+            :func:`~bigchaindb.lib.read_committed_blocks` without its
+            ``connection`` argument, to replay blocks from a Tendermint
+            height, the height of the live events. It is run in a thread.
+            admissions_rate_limit (int): the maximum number of
+            transaction admission events sent per second.
         """
 
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError('Unknown overflow policy `{}`, expected one of {}'
+                             .format(overflow, ', '.join(OVERFLOW_POLICIES)))
+
         self.event_source = event_source
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.read_blocks = read_blocks
+        self.loop = loop or asyncio.get_event_loop()
         self.subscribers = {}
-
-    def subscribe(self, uuid, websocket):
+        # The uuids of the subscribers without filters by payload, and of
+        # the other ones by filter and value
+        self.unfiltered = {payload: {} for payload in PAYLOADS}
+        self.index = {name: {} for name in FILTERS}
+        # The uuids of the subscribers of the admission events, and the
+        # state of the rate limit: the start of the current second, the
+        # number of events sent and skipped since then
+        self.admissions = {}
+        self.admissions_rate_limit = admissions_rate_limit
+        self.admissions_window = None
+        self.admissions_sent = 0
+        self.admissions_skipped = 0
+
+        metrics.gauge('websocket.subscribers').set_function(
+            lambda: len(self.subscribers))
+        metrics.gauge('websocket.queued').set_function(
+            lambda: sum(self._queue_depths()))
+        metrics.gauge('websocket.max_queue_depth').set_function(
+            lambda: max(self._queue_depths(), default=0))
+
+    def subscribe(self, uuid, websocket, filters=None, from_height=None,
+                  payload=IDS):
         """Add a websocket to the list of subscribers.
 
+        Args:
+            uuid (str): a unique identifier for the websocket.
+            websocket: the websocket to publish information.
+            filters (dict): the values of :data:`FILTERS` the
+            transactions sent to the websocket must match, by filter.
+            A transaction matches a filter if it has any of its values.
+            from_height (int): the height of the first block to send the
+            transactions of, if it is already committed.
+            payload (str): what to send to the websocket, one of
+            :data:`PAYLOADS`.
+        """
+
+        filters = {name: set(values)
+                   for name, values in (filters or {}).items() if values}
+        self.subscribers[uuid] = Subscriber(websocket,
+                                            queue_size=self.queue_size,
+                                            overflow=self.overflow,
+                                            loop=self.loop,
+                                            filters=filters,
+                                            from_height=from_height,
+                                            read_blocks=self.read_blocks,
+                                            payload=payload)
+
+        if not filters:
+            self.unfiltered[payload][uuid] = None
+        for name, values in filters.items():
+            for value in values:
+                self.index[name].setdefault(value, set()).add(uuid)
+
+    def subscribe_admissions(self, uuid, websocket):
+        """Add a websocket to the list of subscribers of the transaction
+        admission events.
+
         Args:
             uuid (str): a unique identifier for the websocket.
             websocket: the websocket to publish information.
         """
 
-        self.subscribers[uuid] = websocket
+        self.subscribers[uuid] = Subscriber(websocket,
+                                            queue_size=self.queue_size,
+                                            overflow=self.overflow,
+                                            loop=self.loop)
+        self.admissions[uuid] = None
 
     def unsubscribe(self, uuid):
         """Remove a websocket from the list of subscribers.
 
         Args:
-            uuid (str): a unique identifier for the websocket.
+            uuid (str): a unique identifier for the websocket. Nothing
+            happens if it was already removed, e.g. because its queue
+            overflowed.
         """
 
-        del self.subscribers[uuid]
+        subscriber = self.subscribers.pop(uuid, None)
+        if subscriber is None:
+            return
+        subscriber.close()
+
+        self.admissions.pop(uuid, None)
+        self.unfiltered[subscriber.payload].pop(uuid, None)
+        for name, values in subscriber.filters.items():
+            index = self.index[name]
+            for value in values:
+                index[value].discard(uuid)
+                if not index[value]:
+                    del index[value]
+
+    def close(self):
+        """Stop sending messages to the subscribers, and remove them."""
+
+        for uuid in list(self.subscribers):
+            self.unsubscribe(uuid)
+
+    def match(self, values):
+        """Return the uuids of the subscribers with filters matching a
+        transaction, by payload.
+
+        Args:
+            values (dict): the values of the transaction, by filter.
+        """
+
+        hits = Counter()
+        for name, index in self.index.items():
+            matching = set()
+            for value in values[name]:
+                matching.update(index.get(value, ()))
+            hits.update(matching)
+
+        matched = {payload: [] for payload in PAYLOADS}
+        for uuid, count in hits.items():
+            subscriber = self.subscribers[uuid]
+            if count == len(subscriber.filters):
+                matched[subscriber.payload].append(uuid)
+        return matched
+
+    def block_messages(self, block):
+        """Yield the messages of the transactions of a block, with the
+        uuids of the subscribers to send each of them to, and the height.
+        """
+
+        height = int(block['height'])
+        transactions = block['transactions']
+        # The indexes of the matching transactions, by subscriber of the
+        # ``block`` payload with filters
+        matching = {}
+        for index, (tx, tx_event) in enumerate(zip(transactions,
+                                                   eventify_block(block))):
+            matched = self.match(filter_values(tx, tx_event))
+            for payload in (IDS, TRANSACTION):
+                uuids = list(self.unfiltered[payload]) + matched[payload]
+                if uuids:
+                    yield transaction_message(tx, tx_event, payload), uuids, height
+            for uuid in matched[BLOCK]:
+                matching.setdefault(uuid, []).append(index)
+
+        subsets = {}
+        if self.unfiltered[BLOCK]:
+            subsets[tuple(range(len(transactions)))] = list(self.unfiltered[BLOCK])
+        for uuid, indexes in matching.items():
+            subsets.setdefault(tuple(indexes), []).append(uuid)
+        for indexes, uuids in subsets.items():
+            yield (block_message(height, [transactions[index] for index in indexes]),
+                   uuids, height)
+
+    def admission_message(self, event):
+        """Serialize a ``TX_ACCEPTED`` or ``TX_REJECTED`` event, or return
+        ``None`` if nobody subscribed to them or if the rate limit is
+        reached."""
+
+        if not self.admissions:
+            return None
+
+        now = self.loop.time()
+        if self.admissions_window is None or now - self.admissions_window >= 1:
+            self.admissions_window, self.admissions_sent = now, 0
+        if self.admissions_sent >= self.admissions_rate_limit:
+            self.admissions_skipped += 1
+            metrics.counter('websocket.admissions_skipped').inc()
+            return None
+
+        status = 'accepted' if event.type == EventTypes.TX_ACCEPTED else 'rejected'
+        message = json.dumps(dict(event.data, status=status,
+                                  skipped=self.admissions_skipped))
+        self.admissions_sent += 1
+        self.admissions_skipped = 0
+        return message
+
+    def enqueue(self, message, uuids=None, height=None):
+        """Enqueue a message for some subscribers, without waiting.
+
+        Args:
+            message (str): the message.
+            uuids (list): the uuids of the subscribers, or ``None`` for all
+            of them. The ones that unsubscribed are skipped.
+            height (int): the height of the block of the message, if any.
+        """
+
+        if uuids is None:
+            uuids = list(self.subscribers)
+        dropped, disconnected = 0, 0
+        for uuid in uuids:
+            subscriber = self.subscribers.get(uuid)
+            if subscriber is None:
+                continue
+            dropped += subscriber.put(message, height)
+            if subscriber.closed:
+                self.unsubscribe(uuid)
+                disconnected += 1
+
+        if dropped:
+            metrics.counter('websocket.dropped').inc(dropped)
+        if disconnected:
+            metrics.counter('websocket.disconnected').inc(disconnected)
 
     @asyncio.coroutine
     def publish(self):
@@ -107,14 +531,63 @@ class Dispatcher:
                 return
 
             if isinstance(event, str):
-                str_buffer.append(event)
+                str_buffer.append((event, None, None))
 
             elif event.type == EventTypes.BLOCK_VALID:
-                str_buffer = map(json.dumps, eventify_block(event.data))
+                str_buffer = self.block_messages(event.data)
+
+            elif event.type in (EventTypes.TX_ACCEPTED, EventTypes.TX_REJECTED):
+                message = self.admission_message(event)
+                if message:
+                    str_buffer.append((message, list(self.admissions), None))
+
+            for str_item, uuids, height in str_buffer:
+                self.enqueue(str_item, uuids, height)
+                # Let the subscribers send it before the next one, so
+                # that only the ones lagging behind fill their queue
+                yield from asyncio.sleep(0, loop=self.loop)
 
-            for str_item in str_buffer:
-                for _, websocket in self.subscribers.items():
-                    yield from websocket.send_str(str_item)
+    def _queue_depths(self):
+        return [subscriber.queue.qsize()
+                for subscriber in list(self.subscribers.values())]
+
+
+def parse_subscription(query):
+    """Return the filters of a subscription, the height to replay the
+    blocks from and the payload, from the query string of its request.
+
+    Raises:
+        :exc:`aiohttp.web.HTTPBadRequest`: if an argument is invalid.
+    """
+
+    unknown = [name for name in query
+               if name not in FILTERS and name not in ('from_height', 'payload')]
+    if unknown:
+        raise _bad_request('Unknown arguments: {}'.format(', '.join(unknown)))
+
+    filters = {}
+    for name, type_ in FILTERS.items():
+        try:
+            filters[name] = {type_(value) for value in query.getall(name, ())}
+        except ValueError as e:
+            raise _bad_request({name: str(e)})
+
+    from_height = None
+    if 'from_height' in query:
+        try:
+            from_height = parameters.valid_height(query['from_height'])
+        except ValueError as e:
+            raise _bad_request({'from_height': str(e)})
+
+    payload = query.get('payload', IDS)
+    if payload not in PAYLOADS:
+        raise _bad_request({'payload': 'Expected one of {}'.format(', '.join(PAYLOADS))})
+    return filters, from_height, payload
+
+
+def _bad_request(message):
+    return web.HTTPBadRequest(text=json.dumps({'message': message}),
+                              content_type='application/json')
 
 
 @asyncio.coroutine
@@ -122,11 +595,38 @@ def websocket_handler(request):
     """Handle a new socket connection."""
 
     logger.debug('New websocket connection.')
+    filters, from_height, payload = parse_subscription(request.query)
+    websocket = web.WebSocketResponse()
+    yield from websocket.prepare(request)
+    uuid = uuid4()
+    metrics.counter('websocket.connections').inc()
+    request.app['dispatcher'].subscribe(uuid, websocket, filters, from_height,
+                                        payload)
+    yield from _receive_until_closed(websocket)
+    request.app['dispatcher'].unsubscribe(uuid)
+    return websocket
+
+
+@asyncio.coroutine
+def admissions_handler(request):
+    """Handle a new socket connection to the transaction admission
+    events."""
+
+    logger.debug('New websocket connection to the admission events.')
+    if request.query:
+        raise _bad_request('Unknown arguments: {}'.format(', '.join(request.query)))
     websocket = web.WebSocketResponse()
     yield from websocket.prepare(request)
     uuid = uuid4()
-    request.app['dispatcher'].subscribe(uuid, websocket)
+    metrics.counter('websocket.connections').inc()
+    request.app['dispatcher'].subscribe_admissions(uuid, websocket)
+    yield from _receive_until_closed(websocket)
+    request.app['dispatcher'].unsubscribe(uuid)
+    return websocket
 
+
+@asyncio.coroutine
+def _receive_until_closed(websocket):
     while True:
         # Consume input buffer
         try:
@@ -144,8 +644,11 @@ def websocket_handler(request):
             logger.debug('Websocket exception: %s', websocket.exception())
             break
 
-    request.app['dispatcher'].unsubscribe(uuid)
-    return websocket
+
+@asyncio.coroutine
+def _close_dispatcher(app):
+    app['publisher'].cancel()
+    app['dispatcher'].close()
 
 
 def init_app(event_source, *, loop=None):
@@ -155,31 +658,57 @@ def init_app(event_source, *, loop=None):
         An aiohttp application.
     """
 
-    dispatcher = Dispatcher(event_source)
-
-    # Schedule the dispatcher
-    loop.create_task(dispatcher.publish())
+    # Replays read with the default settings rather than the ones of the
+    # HTTP API, which may read from lagging secondaries. Like the events,
+    # they count heights from the start of the current chain.
+    dispatcher = Dispatcher(event_source,
+                            queue_size=config['wsserver']['queue_size'],
+                            overflow=config['wsserver']['overflow'],
+                            read_blocks=partial(read_committed_blocks, backend.connect()),
+                            admissions_rate_limit=config['wsserver']['tx_events_rate_limit'],
+                            loop=loop)
 
     app = web.Application(loop=loop)
     app['dispatcher'] = dispatcher
+    # Schedule the dispatcher
+    app['publisher'] = loop.create_task(dispatcher.publish())
+    app.on_shutdown.append(_close_dispatcher)
     app.router.add_get(EVENTS_ENDPOINT, websocket_handler)
+    app.router.add_get(ADMISSIONS_ENDPOINT, admissions_handler)
     return app
 
 
-def start(sync_event_source, loop=None):
-    """Create and start the WebSocket server."""
+@asyncio.coroutine
+def _log_metrics(worker, loop):
+    """Log the metrics of the subscribers of this process."""
+
+    while True:
+        yield from asyncio.sleep(METRICS_LOG_INTERVAL, loop=loop)
+        values = {name: value for name, value in metrics.snapshot().items()
+                  if name.startswith('websocket.')}
+        logger.info('Websocket worker %s: %s', worker,
+                    json.dumps(values, sort_keys=True))
 
-    if not loop:
-        loop = asyncio.get_event_loop()
 
-    event_source = asyncio.Queue(loop=loop)
+def start(sync_event_source, loop=None, *, worker=0, reuse_port=False):
+    """Create and start the WebSocket server.
 
-    bridge = threading.Thread(target=_multiprocessing_to_asyncio,
-                              args=(sync_event_source, event_source, loop),
-                              daemon=True)
-    bridge.start()
+    Args:
+        sync_event_source (:class:`~bigchaindb.events.EventReader`): the
+            subscriber queue of the block and transaction admission events.
+        worker (int): the index of this worker process, for the logs.
+        reuse_port (bool): bind with ``SO_REUSEPORT``, so that several
+            worker processes share the port, and the kernel balances the
+            connections between them.
+    """
+
+    if not loop:
+        loop = asyncio.get_event_loop()
 
+    event_source = AsyncEventReader(sync_event_source, loop)
     app = init_app(event_source, loop=loop)
+    loop.create_task(_log_metrics(worker, loop))
     aiohttp.web.run_app(app,
                         host=config['wsserver']['host'],
-                        port=config['wsserver']['port'])
+                        port=config['wsserver']['port'],
+                        reuse_port=reuse_port)
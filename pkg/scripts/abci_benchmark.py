@@ -0,0 +1,122 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Measure the ABCI validation and commit throughput of a storage backend.
+
+The transactions are sent to the ABCI application in-process, without
+Tendermint: first every one of them to ``check_tx``, then block by block
+to ``begin_block``, ``deliver_tx``, ``end_block`` and ``commit``. This is
+done for CREATE transactions, then for TRANSFER transactions spending
+them.
+
+usage: python abci_benchmark.py BACKEND [BLOCKS [TXS_PER_BLOCK]]
+
+BACKEND is ``localmongodb``, ``localsqlite`` or ``localmemory``. MongoDB
+is reached with the ``BIGCHAINDB_DATABASE_HOST`` and
+``BIGCHAINDB_DATABASE_PORT`` environment variables (``localhost:27017`` by
+default). A new database is created for the run and dropped afterwards.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from types import SimpleNamespace
+
+import bigchaindb
+from bigchaindb import config_utils
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('backend', choices=sorted(bigchaindb._database_map))
+    parser.add_argument('blocks', type=int, nargs='?', default=50)
+    parser.add_argument('per_block', type=int, nargs='?', default=100)
+    return parser.parse_args()
+
+
+def database_config(backend):
+    database = dict(bigchaindb._database_map[backend])
+    if backend == 'localsqlite':
+        database['name'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite')
+    else:
+        database['name'] = 'benchmark_{}'.format(uuid.uuid4().hex[:8])
+    if backend == 'localmongodb':
+        database['host'] = os.environ.get('BIGCHAINDB_DATABASE_HOST', 'localhost')
+        database['port'] = int(os.environ.get('BIGCHAINDB_DATABASE_PORT', 27017))
+    return database
+
+
+def main():
+    args = parse_args()
+    config_utils.set_config({'database': database_config(args.backend)})
+
+    # Import after the config is set, the modules read it when imported
+    from bigchaindb.backend import connect
+    from bigchaindb.backend.schema import drop_database, init_database
+    from bigchaindb.common.crypto import generate_key_pair
+    from bigchaindb.core import App
+    from bigchaindb.lib import BigchainDB, Block
+    from bigchaindb.log import setup_logging
+    from bigchaindb.models import Transaction
+    from bigchaindb.tendermint_utils import serialize_transaction
+
+    # The ABCI application logs with the custom `benchmark` level
+    setup_logging()
+
+    conn = connect()
+    init_database(conn)
+    bigchain = BigchainDB(conn)
+    bigchain.store_block(Block(app_hash='', height=0, transactions=[])._asdict())
+    app = App(bigchain)
+
+    alice = generate_key_pair()
+    creates = [[Transaction.create([alice.public_key], [([alice.public_key], 1)],
+                                   asset={'block': height, 'index': index})
+                .sign([alice.private_key])
+                for index in range(args.per_block)]
+               for height in range(args.blocks)]
+    transfers = [[Transaction.transfer(tx.to_inputs(), [([alice.public_key], 1)], tx.id)
+                  .sign([alice.private_key])
+                  for tx in block]
+                 for block in creates]
+
+    height = 0
+
+    def run(name, blocks):
+        nonlocal height
+        blocks = [[serialize_transaction(tx.to_dict()) for tx in block]
+                  for block in blocks]
+        count = sum(map(len, blocks))
+
+        start = time.perf_counter()
+        for block in blocks:
+            for raw_tx in block:
+                assert app.check_tx(raw_tx).code == 0
+        check_tx = count / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for block in blocks:
+            height += 1
+            header = SimpleNamespace(height=height, num_txs=len(block))
+            app.begin_block(SimpleNamespace(header=header))
+            for raw_tx in block:
+                assert app.deliver_tx(raw_tx).code == 0
+            app.end_block(SimpleNamespace(height=height))
+            app.commit()
+        commit = count / (time.perf_counter() - start)
+
+        print('{:12} {:9} check_tx {:6.0f} tx/s   deliver_tx+commit {:6.0f} tx/s'
+              .format(args.backend, name, check_tx, commit))
+
+    try:
+        run('CREATE', creates)
+        run('TRANSFER', transfers)
+    finally:
+        drop_database(conn, conn.dbname)
+
+
+if __name__ == '__main__':
+    main()
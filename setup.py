@@ -78,6 +78,7 @@ benchmarks_require = [
 install_requires = [
     # TODO Consider not installing the db drivers, or putting them in extras.
     'pymongo~=3.6',
+    'motor~=2.0',
     'pysha3~=1.0.2',
     'cryptoconditions==0.7.2',
     'python-rapidjson~=0.6.0',
@@ -0,0 +1,10 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+
+def pytest_ignore_collect(path, config):
+    # The MongoDB tests need the MongoDB backend to be configured, while the
+    # SQLite ones create their own database file.
+    backend = config.getoption('--database-backend')
+    return path.basename == 'localmongodb' and backend != 'localmongodb'
@@ -0,0 +1,16 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture
+
+
+@fixture
+def conn(request):
+    from bigchaindb.backend import connect, schema
+
+    dbname = request.node.name
+    conn = connect(backend='localmemory', name=dbname)
+    schema.init_database(conn, dbname)
+    yield conn
+    schema.drop_database(conn, dbname)
@@ -0,0 +1,370 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from copy import deepcopy
+
+import pytest
+
+from bigchaindb.backend import query
+
+
+def test_get_txids_filtered(conn, signed_create_tx, signed_transfer_tx):
+    from bigchaindb.models import Transaction
+
+    query.store_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    asset_id = Transaction.get_asset_id([signed_create_tx, signed_transfer_tx])
+
+    # Test get by just asset id
+    txids = query.get_txids_filtered(conn, asset_id)
+    assert txids == [signed_create_tx.id, signed_transfer_tx.id]
+
+    # Test get by asset and CREATE
+    txids = query.get_txids_filtered(conn, asset_id, Transaction.CREATE)
+    assert txids == [signed_create_tx.id]
+
+    # Test get by asset and TRANSFER
+    txids = query.get_txids_filtered(conn, asset_id, Transaction.TRANSFER)
+    assert txids == [signed_transfer_tx.id]
+
+
+def test_store_transactions_rejects_duplicates(conn, signed_create_tx):
+    from bigchaindb.backend.exceptions import DuplicateKeyError
+
+    query.store_transactions(conn, [signed_create_tx.to_dict()])
+
+    with pytest.raises(DuplicateKeyError):
+        query.store_transactions(conn, [signed_create_tx.to_dict()])
+
+    assert query.get_transactions(conn, [signed_create_tx.id]) == [
+        signed_create_tx.to_dict()]
+    assert query.get_transaction(conn, 'a' * 64) is None
+
+
+def test_write_assets(conn):
+    assets = [
+        {'id': 1, 'data': '1'},
+        {'id': 2, 'data': '2'},
+        {'id': 3, 'data': '3'},
+        # Duplicated id. Should not be written to the database
+        {'id': 1, 'data': '1'},
+    ]
+
+    # write the assets
+    for asset in assets:
+        query.store_asset(conn, deepcopy(asset))
+
+    assert query.get_assets(conn, [1, 2, 3]) == assets[:-1]
+    assert query.get_asset(conn, 2) == {'data': '2'}
+
+
+def test_store_assets_writes_all_but_duplicates(conn):
+    from bigchaindb.backend.exceptions import DuplicateKeyError
+
+    query.store_assets(conn, [{'id': 1, 'data': '1'}])
+
+    with pytest.raises(DuplicateKeyError):
+        query.store_assets(conn, [{'id': 1, 'data': 'x'},
+                                  {'id': 2, 'data': '2'}])
+
+    assert query.get_assets(conn, [1, 2]) == [{'id': 1, 'data': '1'},
+                                              {'id': 2, 'data': '2'}]
+
+
+@pytest.mark.parametrize('table', ['assets', 'metadata'])
+def test_text_search(conn, table):
+    # Example data and tests cases taken from the mongodb documentation
+    # https://docs.mongodb.com/manual/reference/operator/query/text/
+    objects = [
+        {'id': 1, 'subject': 'coffee', 'author': 'xyz', 'views': 50},
+        {'id': 2, 'subject': 'Coffee Shopping', 'author': 'efg', 'views': 5},
+        {'id': 3, 'subject': 'Baking a cake', 'author': 'abc', 'views': 90},
+        {'id': 4, 'subject': 'baking', 'author': 'xyz', 'views': 100},
+        {'id': 5, 'subject': 'Café Con Leche', 'author': 'abc', 'views': 200},
+        {'id': 6, 'subject': 'Сырники', 'author': 'jkl', 'views': 80},
+        {'id': 7, 'subject': 'coffee and cream', 'author': 'efg', 'views': 10},
+        {'id': 8, 'subject': 'Cafe con Leche', 'author': 'xyz', 'views': 10}
+    ]
+
+    # insert the objects
+    if table == 'assets':
+        query.store_assets(conn, deepcopy(objects))
+    else:
+        query.store_metadatas(conn, deepcopy(objects))
+
+    def search(*args, **kwargs):
+        return [obj['id'] for obj in
+                query.text_search(conn, *args, table=table, **kwargs)]
+
+    # test search single word
+    assert search('coffee') == [1, 2, 7]
+
+    # match any of the search terms
+    assert set(search('bake coffee cake')) == {1, 2, 3, 4, 7}
+    assert search('bake coffee cake')[0] == 3
+
+    # search for a phrase
+    assert search('\"coffee shop\"') == [2]
+
+    # exclude documents that contain a term
+    assert search('coffee -shop') == [1, 7]
+
+    # case and diacritic insensitive search
+    assert set(search('сы́рники CAFÉS')) == {5, 6, 8}
+
+    # case sensitive search
+    assert search('Coffee', case_sensitive=True) == [2]
+
+    # diacritic sensitive search
+    assert search('CAFÉ', diacritic_sensitive=True) == [5]
+
+    # return text score
+    objs = list(query.text_search(conn, 'coffee', text_score=True, table=table))
+    assert objs[0] == dict(objects[0], score=objs[0]['score'])
+    assert objs[0]['score'] > objs[1]['score'] > 0
+
+    # limit search result
+    assert search('coffee', limit=2) == [1, 2]
+
+    # negated terms alone match nothing
+    assert search('-coffee') == []
+
+
+def test_delete_transactions(conn, signed_create_tx, signed_transfer_tx):
+    create, transfer = signed_create_tx.to_dict(), signed_transfer_tx.to_dict()
+    asset = dict(create.pop('asset'), id=create['id'])
+    query.store_assets(conn, [asset])
+    query.store_metadatas(conn, [{'id': tx['id'], 'metadata': None}
+                                 for tx in (create, transfer)])
+    query.store_transactions(conn, [create, transfer])
+
+    query.delete_transactions(conn, [create['id'], transfer['id']])
+
+    assert query.get_transactions(conn, [create['id'], transfer['id']]) == []
+    assert query.get_assets(conn, [create['id']]) == []
+    assert query.get_metadata(conn, [create['id'], transfer['id']]) == []
+    transactions = conn.conn['transactions']
+    assert not any(transactions.index_maps.values())
+    assert not conn.conn['assets'].words
+
+
+def test_get_metadata(conn):
+    metadata = [
+        {'id': 1, 'metadata': None},
+        {'id': 2, 'metadata': {'key': 'value'}},
+        {'id': 3, 'metadata': '3'},
+    ]
+
+    query.store_metadatas(conn, deepcopy(metadata))
+
+    for meta in metadata:
+        assert query.get_metadata(conn, [meta['id']]) == [meta]
+
+
+def test_get_owned_ids(conn, signed_create_tx, user_pk):
+    query.store_transactions(conn, [signed_create_tx.to_dict()])
+
+    txns = query.get_owned_ids(conn, user_pk)
+
+    assert txns == [signed_create_tx.to_dict()]
+
+
+def test_get_spent_and_spending_transactions(conn, user_pk, user_sk):
+    from bigchaindb.models import Transaction
+
+    out = [([user_pk], 1)]
+    tx1 = Transaction.create([user_pk], out * 3)
+    tx1.sign([user_sk])
+    inputs = tx1.to_inputs()
+    tx2 = Transaction.transfer([inputs[0]], out, tx1.id).sign([user_sk])
+    tx3 = Transaction.transfer([inputs[1]], out, tx1.id).sign([user_sk])
+    tx4 = Transaction.transfer([inputs[2]], out, tx1.id).sign([user_sk])
+    query.store_transactions(conn, [tx.to_dict() for tx in [tx1, tx2, tx3, tx4]])
+
+    links = [inputs[0].fulfills.to_dict(), inputs[2].fulfills.to_dict()]
+    txns = query.get_spending_transactions(conn, links)
+
+    # tx3 not a member because input 1 not asked for
+    assert txns == [tx2.to_dict(), tx4.to_dict()]
+
+    assert query.get_spent(conn, tx1.id, 1) == [tx3.to_dict()]
+    assert query.get_spent(conn, tx2.id, 0) == []
+
+
+def test_get_asset_tokens_for_public_key(conn, signed_create_tx,
+                                         signed_transfer_tx, user_pk):
+    query.store_transactions(conn, [signed_create_tx.to_dict(),
+                                    signed_transfer_tx.to_dict()])
+
+    txns = query.get_asset_tokens_for_public_key(conn, signed_create_tx.id,
+                                                 user_pk)
+    assert txns == [signed_transfer_tx.to_dict()]
+
+
+def test_store_and_get_block(conn):
+    from bigchaindb.lib import Block
+
+    block = Block(app_hash='random_utxo',
+                  height=3,
+                  transactions=['a', 'b'])._asdict()
+
+    assert query.store_block(conn, block) == 1
+    # Storing the block again is a no-op
+    assert query.store_block(conn, block) == 0
+
+    assert query.get_block(conn, 3) == block
+    assert query.get_block(conn, 4) is None
+    assert query.get_latest_block(conn) == block
+    assert query.get_block_with_transaction(conn, 'b') == [{'height': 3}]
+    assert query.get_block_with_transaction(conn, 'c') == []
+
+
+def test_get_blocks(conn):
+    for height in (4, 1, 3, 2):
+        query.store_block(conn, {'height': height, 'transactions': []})
+
+    assert [block['height'] for block in query.get_blocks(conn, 2, 2)] == [2, 3]
+    assert [block['height'] for block in query.get_blocks(conn, 3, 10)] == [3, 4]
+    assert query.get_blocks(conn, 5, 10) == []
+
+
+def test_store_and_delete_unspent_outputs(conn, unspent_outputs):
+    assert query.store_unspent_outputs(conn) is None
+    assert query.store_unspent_outputs(conn, *unspent_outputs) == 3
+    # Duplicates are ignored
+    assert query.store_unspent_outputs(conn, unspent_outputs[0]) == 0
+
+    assert query.get_unspent_outputs(conn) == list(unspent_outputs)
+    assert query.get_unspent_outputs(
+        conn, query={'output_index': 1}) == [unspent_outputs[1]]
+
+    assert query.delete_unspent_outputs(conn) is None
+    assert query.delete_unspent_outputs(conn, *unspent_outputs[::2]) == 2
+    assert query.get_unspent_outputs(conn) == [unspent_outputs[1]]
+
+
+def test_store_pre_commit_state(conn):
+    from bigchaindb.lib import PreCommitState
+
+    state = PreCommitState(commit_id='test',
+                           height=3,
+                           transactions=[])._asdict()
+
+    query.store_pre_commit_state(conn, state)
+    assert query.get_pre_commit_state(conn, 'test') == state
+
+    state['height'] = 4
+    query.store_pre_commit_state(conn, state)
+    assert query.get_pre_commit_state(conn, 'test') == state
+
+
+def test_validator_update(conn):
+    def gen_validator_update(height):
+        return {'data': 'somedata', 'height': height, 'election_id': f'election_id_at_height_{height}'}
+
+    for i in range(1, 100, 10):
+        value = gen_validator_update(i)
+        query.store_validator_set(conn, value)
+
+    v1 = query.get_validator_set(conn, 8)
+    assert v1['height'] == 1
+
+    v41 = query.get_validator_set(conn, 50)
+    assert v41['height'] == 41
+
+    v91 = query.get_validator_set(conn)
+    assert v91['height'] == 91
+
+    assert query.get_validator_set(conn, 0) is None
+
+
+def test_store_election_results(conn):
+    election = {'election_id': 'a', 'height': 1, 'is_concluded': False}
+    query.store_election_results(conn, election)
+    assert query.get_election(conn, 'a') == election
+
+    election['is_concluded'] = True
+    query.store_election_results(conn, election)
+    assert query.get_election(conn, 'a') == election
+    assert query.get_election(conn, 'b') is None
+
+
+def test_vote_tallies(conn):
+    assert query.get_vote_tally(conn, 'a') is None
+
+    query.increment_vote_tallies(conn, {'a': 2, 'b': 1})
+    query.increment_vote_tallies(conn, {'a': 3})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 5}
+    assert query.get_vote_tally(conn, 'b') == {'election_id': 'b', 'votes': 1}
+
+    query.store_vote_tally(conn, {'election_id': 'a', 'votes': 4})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 4}
+
+    query.insert_vote_tally(conn, {'election_id': 'a', 'votes': 1})
+    query.insert_vote_tally(conn, {'election_id': 'c', 'votes': 1})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 4}
+    assert query.get_vote_tally(conn, 'c') == {'election_id': 'c', 'votes': 1}
+
+
+@pytest.mark.parametrize('description,stores,expected', [
+    (
+        'Query empty database.',
+        [],
+        None,
+    ),
+    (
+        'Store one chain with the default value for `is_synced`.',
+        [
+            {'height': 0, 'chain_id': 'some-id'},
+        ],
+        {'height': 0, 'chain_id': 'some-id', 'is_synced': True},
+    ),
+    (
+        'Store one chain, then update it.',
+        [
+            {'height': 0, 'chain_id': 'some-id', 'is_synced': True},
+            {'height': 0, 'chain_id': 'new-id', 'is_synced': False},
+        ],
+        {'height': 0, 'chain_id': 'new-id', 'is_synced': False},
+    ),
+    (
+        'Store a chain, update it, store another chain.',
+        [
+            {'height': 0, 'chain_id': 'some-id', 'is_synced': True},
+            {'height': 0, 'chain_id': 'some-id', 'is_synced': False},
+            {'height': 10, 'chain_id': 'another-id', 'is_synced': True},
+        ],
+        {'height': 10, 'chain_id': 'another-id', 'is_synced': True},
+    ),
+])
+def test_store_abci_chain(conn, description, stores, expected):
+    for store in stores:
+        query.store_abci_chain(conn, **store)
+
+    actual = query.get_latest_abci_chain(conn)
+    assert expected == actual, description
+
+
+def test_unique_index_conflict_keeps_document(conn):
+    from bigchaindb.backend.exceptions import DuplicateKeyError
+
+    query.store_abci_chain(conn, 0, 'some-id')
+    query.store_abci_chain(conn, 10, 'another-id')
+
+    with pytest.raises(DuplicateKeyError):
+        query.store_abci_chain(conn, 10, 'some-id')
+
+    assert query.get_latest_abci_chain(conn) == {
+        'height': 10, 'chain_id': 'another-id', 'is_synced': True}
+
+
+def test_documents_are_copies(conn):
+    block = {'height': 1, 'transactions': ['a']}
+    query.store_block(conn, block)
+
+    block['transactions'].append('b')
+    query.get_latest_block(conn)['transactions'].append('c')
+
+    assert query.get_latest_block(conn) == {'height': 1, 'transactions': ['a']}
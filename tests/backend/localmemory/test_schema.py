@@ -0,0 +1,46 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import pytest
+
+
+def test_init_creates_db_tables(conn):
+    assert set(conn.conn) == {
+        'transactions', 'assets', 'metadata', 'blocks', 'utxos', 'pre_commit',
+        'validators', 'elections', 'abci_chains', 'vote_tallies',
+    }
+    assert set(conn.conn['transactions'].indexes) == {
+        'asset_id', 'inputs', 'outputs', 'sole_outputs'}
+
+
+def test_init_database_is_graceful_if_db_exists(conn):
+    from bigchaindb.backend import query
+    from bigchaindb.backend.schema import init_database
+
+    query.store_block(conn, {'height': 1, 'transactions': []})
+    init_database(conn, conn.dbname)
+    assert query.get_latest_block(conn)['height'] == 1
+
+
+def test_databases_are_shared_by_name(conn):
+    from bigchaindb.backend import connect, query
+
+    query.store_block(conn, {'height': 1, 'transactions': []})
+    other = connect(backend='localmemory', name=conn.dbname)
+    assert query.get_latest_block(other)['height'] == 1
+
+
+def test_drop():
+    from bigchaindb.backend import connect, query, schema
+    from bigchaindb.backend.exceptions import OperationError
+    from bigchaindb.common.exceptions import DatabaseDoesNotExist
+
+    conn = connect(backend='localmemory', name='dropped')
+    schema.init_database(conn, 'dropped')
+    schema.drop_database(conn, 'dropped')
+
+    with pytest.raises(OperationError):
+        query.get_latest_block(conn)
+    with pytest.raises(DatabaseDoesNotExist):
+        schema.drop_database(conn, 'dropped')
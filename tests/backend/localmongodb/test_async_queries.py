@@ -0,0 +1,94 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import asyncio
+
+import pytest
+
+from bigchaindb.backend import connect, query
+
+
+def test_connect_returns_an_async_connection():
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from bigchaindb.backend.localmongodb.connection import (
+        AsyncLocalMongoDBConnection, LocalMongoDBConnection)
+
+    conn = connect(asynchronous=True)
+
+    assert isinstance(conn, AsyncLocalMongoDBConnection)
+    assert not isinstance(conn, LocalMongoDBConnection)
+    assert isinstance(conn.conn, AsyncIOMotorClient)
+
+
+def test_write_queries_are_not_dispatched_to_the_sync_implementation():
+    conn = connect(asynchronous=True)
+
+    with pytest.raises(NotImplementedError):
+        query.store_block(conn, {'height': 1})
+
+
+async def test_connection_error_is_raised_by_the_query():
+    from bigchaindb.backend.exceptions import ConnectionError
+
+    conn = connect(port=1, connection_timeout=50, asynchronous=True)
+
+    with pytest.raises(ConnectionError):
+        await query.get_transactions(conn, ['a' * 64])
+
+
+@pytest.mark.bdb
+async def test_get_transaction(signed_create_tx):
+    connect().db.transactions.insert_one(signed_create_tx.to_dict())
+    conn = connect(asynchronous=True)
+
+    tx = await query.get_transaction(conn, signed_create_tx.id)
+    assert tx == signed_create_tx.to_dict()
+    assert await query.get_transaction(conn, 'a' * 64) is None
+
+
+@pytest.mark.bdb
+async def test_get_txids_filtered(signed_create_tx, signed_transfer_tx):
+    from bigchaindb.models import Transaction
+
+    connect().db.transactions.insert_many([signed_create_tx.to_dict(),
+                                           signed_transfer_tx.to_dict()])
+    conn = connect(asynchronous=True)
+    asset_id = Transaction.get_asset_id([signed_create_tx,
+                                         signed_transfer_tx])
+
+    txids = await query.get_txids_filtered(conn, asset_id)
+    assert set(txids) == {signed_create_tx.id, signed_transfer_tx.id}
+
+    txids = await query.get_txids_filtered(conn, asset_id,
+                                           Transaction.TRANSFER)
+    assert txids == [signed_transfer_tx.id]
+
+
+@pytest.mark.bdb
+async def test_concurrent_queries_share_one_connection():
+    blocks = [{'height': height, 'app_hash': str(height), 'transactions': []}
+              for height in range(10)]
+    connect().db.blocks.insert_many(blocks)
+    conn = connect(asynchronous=True)
+
+    results = await asyncio.gather(*[query.get_block(conn, height)
+                                     for height in range(10)])
+
+    for block in blocks:
+        del block['_id']
+    assert results == blocks
+    assert (await query.get_latest_block(conn))['height'] == 9
+    assert await query.get_blocks(conn, 8, 5) == blocks[8:]
+
+
+@pytest.mark.bdb
+async def test_get_validator_set():
+    validators = [{'height': 1, 'validators': []},
+                  {'height': 10, 'validators': []}]
+    connect().db.validators.insert_many(validators)
+    conn = connect(asynchronous=True)
+
+    assert (await query.get_validator_set(conn))['height'] == 10
+    assert (await query.get_validator_set(conn, 5))['height'] == 1
+    assert await query.get_validator_set(conn, 0) is None
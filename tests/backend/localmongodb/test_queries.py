@@ -262,6 +262,18 @@ def test_get_block():
     assert block['height'] == 3
 
 
+def test_get_blocks():
+    from bigchaindb.backend import connect, query
+    conn = connect()
+
+    conn.db.blocks.insert_many([{'height': height, 'transactions': []}
+                                for height in (4, 1, 3, 2)])
+
+    assert [block['height'] for block in query.get_blocks(conn, 2, 2)] == [2, 3]
+    assert [block['height'] for block in query.get_blocks(conn, 3, 10)] == [3, 4]
+    assert query.get_blocks(conn, 5, 10) == []
+
+
 def test_delete_zero_unspent_outputs(db_context, utxoset):
     from bigchaindb.backend import query
     unspent_outputs, utxo_collection = utxoset
@@ -399,6 +411,25 @@ def test_validator_update():
     assert v91['height'] == 91
 
 
+def test_vote_tallies():
+    conn = connect()
+
+    assert query.get_vote_tally(conn, 'a') is None
+
+    query.increment_vote_tallies(conn, {'a': 2, 'b': 1})
+    query.increment_vote_tallies(conn, {'a': 3})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 5}
+    assert query.get_vote_tally(conn, 'b') == {'election_id': 'b', 'votes': 1}
+
+    query.store_vote_tally(conn, {'election_id': 'a', 'votes': 4})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 4}
+
+    query.insert_vote_tally(conn, {'election_id': 'a', 'votes': 1})
+    query.insert_vote_tally(conn, {'election_id': 'c', 'votes': 1})
+    assert query.get_vote_tally(conn, 'a') == {'election_id': 'a', 'votes': 4}
+    assert query.get_vote_tally(conn, 'c') == {'election_id': 'c', 'votes': 1}
+
+
 @pytest.mark.parametrize('description,stores,expected', [
     (
         'Query empty database.',
@@ -19,7 +19,7 @@ def test_init_creates_db_tables_and_indexes():
     collection_names = conn.conn[dbname].collection_names()
     assert set(collection_names) == {
         'transactions', 'assets', 'metadata', 'blocks', 'utxos', 'pre_commit',
-        'validators', 'elections', 'abci_chains',
+        'validators', 'elections', 'abci_chains', 'vote_tallies',
     }
 
     indexes = conn.conn[dbname]['assets'].index_information().keys()
@@ -47,6 +47,9 @@ def test_init_creates_db_tables_and_indexes():
     indexes = conn.conn[dbname]['elections'].index_information().keys()
     assert set(indexes) == {'_id_', 'election_id'}
 
+    indexes = conn.conn[dbname]['vote_tallies'].index_information().keys()
+    assert set(indexes) == {'_id_', 'election_id'}
+
 
 def test_init_database_is_graceful_if_db_exists():
     import bigchaindb
@@ -78,7 +81,7 @@ def test_create_tables():
     collection_names = conn.conn[dbname].collection_names()
     assert set(collection_names) == {
         'transactions', 'assets', 'metadata', 'blocks', 'utxos', 'validators', 'elections',
-        'pre_commit', 'abci_chains',
+        'pre_commit', 'abci_chains', 'vote_tallies',
     }
 
     indexes = conn.conn[dbname]['assets'].index_information().keys()
@@ -0,0 +1,17 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture
+
+
+@fixture
+def conn(tmpdir):
+    from bigchaindb.backend import connect
+    from bigchaindb.backend.schema import init_database
+
+    dbname = str(tmpdir.join('bigchain.sqlite'))
+    conn = connect(backend='localsqlite', name=dbname)
+    init_database(conn, dbname)
+    yield conn
+    conn.close()
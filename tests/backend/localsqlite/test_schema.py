@@ -0,0 +1,48 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import os
+
+import pytest
+
+
+def names(conn, type_):
+    return {name for name, in conn.conn.execute(
+        'SELECT name FROM sqlite_master WHERE type = ?', (type_,))}
+
+
+def test_init_creates_db_tables_and_indexes(conn):
+    assert names(conn, 'table') >= {
+        'transactions', 'assets', 'metadata', 'blocks', 'utxos', 'pre_commit',
+        'validators', 'elections', 'abci_chains', 'vote_tallies',
+        'transaction_inputs', 'transaction_outputs', 'block_transactions',
+        'assets_text', 'metadata_text',
+    }
+    assert names(conn, 'index') == {
+        'transactions_transaction_id', 'transactions_asset_id',
+        'transactions_inputs', 'transaction_inputs_tx_rowid',
+        'transactions_outputs', 'transaction_outputs_tx_rowid',
+        'assets_asset_id', 'metadata_transaction_id',
+        'blocks_transactions', 'utxos_utxo', 'pre_commit_pre_commit_id',
+        'elections_election_id', 'validators_height',
+        'abci_chains_height', 'abci_chains_chain_id',
+        'vote_tallies_election_id',
+    }
+
+
+def test_init_database_is_graceful_if_db_exists(conn):
+    from bigchaindb.backend.schema import init_database
+
+    init_database(conn, conn.dbname)
+
+
+def test_drop(conn):
+    from bigchaindb.backend import schema
+    from bigchaindb.common.exceptions import DatabaseDoesNotExist
+
+    schema.drop_database(conn, conn.dbname)
+    assert not os.path.exists(conn.dbname)
+
+    with pytest.raises(DatabaseDoesNotExist):
+        schema.drop_database(conn, conn.dbname)
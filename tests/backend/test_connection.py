@@ -19,3 +19,39 @@ def test_get_connection_raises_a_configuration_error(monkeypatch):
                              'bigchaindb.backend.meowmeow.Catsandra'})
 
         connect('catsandra', 'localhost', '1337', 'mydb')
+
+
+def test_get_connection_with_a_role():
+    from bigchaindb.common.exceptions import ConfigurationError
+    from bigchaindb.backend import connect
+
+    conn = connect(role='api')
+    options = conn._client_options()
+    assert options['readPreference'] == 'primary'
+    assert options['maxPoolSize'] == 20
+    assert conn.max_time_ms == 5000
+
+    options = connect()._client_options()
+    assert 'readPreference' not in options
+    assert 'maxPoolSize' not in options
+
+    with pytest.raises(ConfigurationError):
+        connect(role='cron')
+
+
+def test_reads_are_limited_in_time():
+    from bigchaindb.backend import connect
+
+    conn = connect(profiles={'api': {'max_time_ms': 100}}, role='api')
+
+    query = conn._limit_time(conn.collection('blocks')
+                             .find({'height': 1}).sort('height').limit(1))
+    find = query.stack.index('find')
+    assert query.stack[find + 1] == (({'height': 1},), {'max_time_ms': 100})
+
+    query = conn._limit_time(conn.collection('transactions')
+                             .aggregate([], maxTimeMS=10))
+    assert query.stack[-1] == (([],), {'maxTimeMS': 10})
+
+    query = connect()._limit_time(conn.collection('blocks').find_one())
+    assert query.stack[-1] == ((), {})
@@ -74,3 +74,20 @@ def test_module_dispatch_errors_on_non_dispatchable_func(mock_module):
         @mock_dispatch(str)
         def dispatched():
             pass
+
+
+def test_parse_search():
+    from bigchaindb.backend.utils import parse_search
+
+    assert parse_search('coffee "coffee shop" -cake -"ice cream"') == (
+        ['coffee shop'], ['coffee'], ['cake', 'ice cream'])
+    assert parse_search('') == ([], [], [])
+
+
+def test_fold():
+    from bigchaindb.backend.utils import fold
+
+    assert fold('CAFÉ') == 'cafe'
+    assert fold('CAFÉ', case_sensitive=True) == 'CAFE'
+    assert fold('CAFÉ', diacritic_sensitive=True) == fold('café', diacritic_sensitive=True)
+    assert fold('CAFÉ', diacritic_sensitive=True) != 'cafe'
@@ -0,0 +1,117 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import os
+from copy import deepcopy
+
+import pytest
+
+from bigchaindb.common import verification_cache
+from bigchaindb.common.verification_cache import VerificationCache, key
+
+
+@pytest.fixture
+def cache():
+    verification_cache.enable(64)
+    yield verification_cache._cache
+    verification_cache.disable()
+
+
+def test_add_and_contains():
+    cache = VerificationCache(64)
+
+    cache.add(key('signature', 'a'))
+
+    assert key('signature', 'a') in cache
+    assert key('signature', 'b') not in cache
+    assert key('schema', 'a') not in cache
+
+
+def test_key_is_unambiguous():
+    assert key('ab', 'c') != key('a', 'bc')
+    assert key('a', 'b') == key(b'a', b'b')
+
+
+def test_size_is_rounded_up_to_whole_buckets():
+    assert VerificationCache(5).size == 8
+    assert VerificationCache(0).size == 4
+
+
+def test_full_bucket_overwrites_an_entry():
+    cache = VerificationCache(4)
+    keys = [key('signature', str(i)) for i in range(5)]
+
+    for digest in keys:
+        cache.add(digest)
+
+    assert keys[-1] in cache
+    assert sum(digest in cache for digest in keys) == 4
+
+
+def test_disabled_cache_contains_nothing():
+    verification_cache.enable(0)
+
+    verification_cache.add(key('signature', 'a'))
+
+    assert not verification_cache.enabled()
+    assert not verification_cache.contains(key('signature', 'a'))
+
+
+def test_cache_is_shared_with_forked_children(cache):
+    pid = os.fork()
+    if pid == 0:
+        verification_cache.add(key('signature', 'child'))
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    assert verification_cache.contains(key('signature', 'child'))
+
+
+def test_verified_fulfillment_is_not_verified_again(cache, monkeypatch, alice):
+    from bigchaindb.models import Transaction
+    from bigchaindb.common import transaction
+
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])
+    tx = tx.sign([alice.private_key])
+    assert tx.inputs_valid()
+
+    def from_uri(uri):
+        raise AssertionError('the fulfillment was verified again')
+
+    Transaction._input_valid.cache_clear()
+    monkeypatch.setattr(transaction.Fulfillment, 'from_uri', from_uri)
+    assert tx.inputs_valid()
+
+
+def test_invalid_fulfillment_is_not_cached(cache, alice):
+    from bigchaindb.common.transaction import Transaction
+
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])
+    tx_dict = deepcopy(tx.sign([alice.private_key]).to_dict())
+    tx_dict['metadata'] = {'tampered': True}
+    tx = Transaction.from_dict(tx_dict)
+
+    assert not tx.inputs_valid()
+    assert not any(cache._map[:])
+
+
+def test_validated_schema_is_not_validated_again(cache, monkeypatch, alice):
+    from bigchaindb.models import Transaction
+    from bigchaindb.common.exceptions import InvalidHash
+
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])
+    tx_dict = tx.sign([alice.private_key]).to_dict()
+    calls = []
+    monkeypatch.setattr('bigchaindb.models.validate_transaction_schema',
+                        calls.append)
+
+    Transaction.validate_schema(tx_dict)
+    Transaction.validate_schema(tx_dict)
+    assert calls == [tx_dict]
+
+    # The id is always checked, so a tampered body is never found.
+    tampered = deepcopy(tx_dict)
+    tampered['metadata'] = {'tampered': True}
+    with pytest.raises(InvalidHash):
+        Transaction.validate_schema(tampered)
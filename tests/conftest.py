@@ -74,6 +74,10 @@ def pytest_configure(config):
 def _bdb_marker(request):
     if request.keywords.get('bdb', None):
         request.getfixturevalue('_bdb')
+    elif request.config.getoption('--database-backend') != 'localmongodb':
+        # MongoDB creates the database when it is first written to, the
+        # embedded ones must be initialized for the tests using them too
+        request.getfixturevalue('_setup_database')
 
 
 @pytest.fixture(autouse=True)
@@ -103,6 +107,9 @@ def _configure_bigchaindb(request):
             'port': 26657,
         }
     }
+    if backend == 'localsqlite':
+        # The name of an embedded database is the path to its file
+        test_db_name = os.path.join(tempfile.mkdtemp(), test_db_name)
     config['database']['name'] = test_db_name
     config = config_utils.env_config(config)
     config_utils.set_config(config)
@@ -321,6 +328,8 @@ def dummy_db(request):
     xdist_suffix = getattr(request.config, 'slaveinput', {}).get('slaveid')
     if xdist_suffix:
         dbname = '{}_{}'.format(dbname, xdist_suffix)
+    # Put the files of embedded databases next to the test database
+    dbname = os.path.join(os.path.dirname(conn.dbname), dbname)
 
     _drop_db(conn, dbname)  # make sure we start with a clean DB
     schema.init_database(conn, dbname)
@@ -344,12 +353,12 @@ def db_config():
 
 @pytest.fixture
 def db_host(db_config):
-    return db_config['host']
+    return db_config.get('host')
 
 
 @pytest.fixture
 def db_port(db_config):
-    return db_config['port']
+    return db_config.get('port')
 
 
 @pytest.fixture
@@ -269,6 +269,124 @@ def test_deliver_tx__valid_create_updates_db(b, init_chain_request):
     #     next(unspent_outputs)
 
 
+def test_commit_publishes_block_event(b):
+    from queue import Queue
+    from bigchaindb import App
+    from bigchaindb.events import EventTypes
+    from bigchaindb.models import Transaction
+    from bigchaindb.common.crypto import generate_key_pair
+
+    alice = generate_key_pair()
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)],
+                            metadata={'shape': 'round'})\
+                    .sign([alice.private_key])
+
+    b.store_block(Block(app_hash='', height=0, transactions=[])._asdict())
+    events_queue = Queue()
+    app = App(b, events_queue=events_queue)
+
+    app.begin_block(RequestBeginBlock())
+    app.deliver_tx(encode_tx_to_bytes(tx))
+    app.end_block(RequestEndBlock(height=99))
+    app.commit()
+
+    event = events_queue.get_nowait()
+    assert event.type == EventTypes.BLOCK_VALID
+    assert event.data == {'height': 99, 'transactions': [tx.to_dict()]}
+    assert b.get_latest_block()['height'] == 99
+
+    # No event for empty blocks
+    app.begin_block(RequestBeginBlock())
+    app.end_block(RequestEndBlock(height=100))
+    app.commit()
+    assert events_queue.empty()
+
+
+def test_commit_publishes_the_tendermint_height_after_a_migration(b):
+    from queue import Queue
+    from bigchaindb import App
+    from bigchaindb.backend.query import store_abci_chain
+    from bigchaindb.models import Transaction
+    from bigchaindb.common.crypto import generate_key_pair
+
+    alice = generate_key_pair()
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])\
+                    .sign([alice.private_key])
+
+    b.store_block(Block(app_hash='', height=10, transactions=[])._asdict())
+    store_abci_chain(b.connection, 10, 'chain-X')
+    events_queue = Queue()
+    app = App(b, events_queue=events_queue)
+
+    app.begin_block(RequestBeginBlock())
+    app.deliver_tx(encode_tx_to_bytes(tx))
+    app.end_block(RequestEndBlock(height=1))
+    app.commit()
+
+    assert events_queue.get_nowait().data['height'] == 1
+    assert b.get_latest_block()['height'] == 11
+
+
+def test_checks_publish_sampled_tx_events(b, monkeypatch):
+    from queue import Queue
+    from bigchaindb import App
+    from bigchaindb.events import EventTypes
+    from bigchaindb.models import Transaction
+    from bigchaindb.common.crypto import generate_key_pair
+
+    alice = generate_key_pair()
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])\
+                    .sign([alice.private_key])
+
+    tx_events_queue = Queue()
+    app = App(b, tx_events_queue=tx_events_queue, tx_events_sample_rate=0.5)
+
+    monkeypatch.setattr('random.random', lambda: 0.75)
+    app.check_tx(encode_tx_to_bytes(tx))
+    assert tx_events_queue.empty()
+
+    monkeypatch.setattr('random.random', lambda: 0.25)
+    app.check_tx(encode_tx_to_bytes(tx))
+    app.begin_block(RequestBeginBlock())
+    app.deliver_tx(encode_tx_to_bytes(tx))
+    app.deliver_tx(encode_tx_to_bytes(tx))
+
+    events = [tx_events_queue.get_nowait() for _ in range(3)]
+    assert [(event.type, event.data['stage']) for event in events] == [
+        (EventTypes.TX_ACCEPTED, 'check_tx'),
+        (EventTypes.TX_ACCEPTED, 'deliver_tx'),
+        (EventTypes.TX_REJECTED, 'deliver_tx'),
+    ]
+    assert all(event.data['transaction_id'] == tx.id for event in events)
+    assert 'error' not in events[0].data
+    rejected = events[2]
+    assert rejected.data['error'] == 'DuplicateTransaction'
+    assert rejected.data['latency'] in ('0.001', '0.0025', '0.005', '0.01', '0.025',
+                                        '0.05', '0.1', '0.25', '0.5', '1')
+
+
+def test_check_rejecting_without_an_error_publishes_a_rejection(b, monkeypatch):
+    from queue import Queue
+    from bigchaindb import App
+    from bigchaindb.events import EventTypes
+    from bigchaindb.models import Transaction
+    from bigchaindb.common.crypto import generate_key_pair
+
+    alice = generate_key_pair()
+    tx = Transaction.create([alice.public_key], [([alice.public_key], 1)])\
+                    .sign([alice.private_key])
+
+    tx_events_queue = Queue()
+    app = App(b, tx_events_queue=tx_events_queue, tx_events_sample_rate=1)
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.validate_transaction',
+                        lambda *args: False)
+
+    assert app.check_tx(encode_tx_to_bytes(tx)).code == CodeTypeError
+    event = tx_events_queue.get_nowait()
+    assert event.type == EventTypes.TX_REJECTED
+    assert event.data['error'] == 'ValidationError'
+
+
 def test_deliver_tx__double_spend_fails(b, init_chain_request):
     from bigchaindb import App
     from bigchaindb.models import Transaction
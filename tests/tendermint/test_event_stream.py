@@ -109,3 +109,96 @@ async def test_subscribe_events(tendermint_ws_url, b):
     transaction = json.loads(base64.b64decode(raw_txn).decode('utf8'))
 
     assert transaction == tx.to_dict()
+
+
+def test_backoff_grows_up_to_a_bound(monkeypatch):
+    from bigchaindb import event_stream
+
+    monkeypatch.setattr('random.uniform', lambda low, high: high)
+    delays = [event_stream.backoff(attempt) for attempt in range(10)]
+    assert delays[:3] == [event_stream.BACKOFF_BASE,
+                          event_stream.BACKOFF_BASE * 2,
+                          event_stream.BACKOFF_BASE * 4]
+    assert max(delays) == event_stream.BACKOFF_MAX
+
+
+def _stored_blocks(heights):
+    blocks = {height: {'height': height,
+                       'transactions': [{'id': str(height)}] if height % 2 else []}
+              for height in heights}
+    reads = []
+
+    def read_blocks(from_height, limit):
+        reads.append((from_height, limit))
+        return [blocks[height] for height
+                in range(from_height, from_height + limit) if height in blocks]
+
+    return blocks, read_blocks, reads
+
+
+@pytest.mark.asyncio
+async def test_event_client_backfills_the_missed_blocks(monkeypatch):
+    from bigchaindb import event_stream, metrics
+    from bigchaindb.event_stream import EventClient
+
+    metrics.reset()
+    monkeypatch.setattr(event_stream, 'BACKFILL_BATCH_SIZE', 3)
+    blocks, read_blocks, reads = _stored_blocks(range(1, 11))
+    event_queue = Queue()
+    client = EventClient(event_queue, read_blocks)
+
+    await client.deliver(blocks[1])
+    await client.deliver(blocks[1])
+    await client.deliver(blocks[10])
+
+    assert reads == [(2, 3), (5, 3), (8, 2)]
+    heights = [event_queue.get().data['height'] for _ in range(event_queue.qsize())]
+    assert heights == [1, 3, 5, 7, 9]
+    assert client.last_height == 10
+    assert metrics.counter('event_stream.backfilled_blocks').value == 4
+
+
+@pytest.mark.asyncio
+async def test_event_client_skips_the_blocks_not_stored():
+    from bigchaindb.event_stream import EventClient
+
+    blocks, read_blocks, _ = _stored_blocks([1, 2, 3, 7])
+    event_queue = Queue()
+    client = EventClient(event_queue, read_blocks)
+
+    await client.deliver(blocks[1])
+    await client.deliver(blocks[7])
+
+    heights = [event_queue.get().data['height'] for _ in range(event_queue.qsize())]
+    assert heights == [1, 3, 7]
+    assert client.last_height == 7
+
+
+@pytest.mark.asyncio
+async def test_event_client_reconnects_with_backoff(monkeypatch):
+    import asyncio
+    from bigchaindb import event_stream, metrics
+    from bigchaindb.event_stream import EventClient
+
+    metrics.reset()
+    attempts = []
+    monkeypatch.setattr(event_stream, 'backoff',
+                        lambda attempt: attempts.append(attempt) or 0)
+
+    client = EventClient(Queue(), None)
+    connections = 0
+
+    async def connect_and_recv():
+        nonlocal connections
+        connections += 1
+        client.connected = connections == 3
+        if connections == 5:
+            raise asyncio.CancelledError()
+        raise ConnectionError()
+
+    client.connect_and_recv = connect_and_recv
+    with pytest.raises(asyncio.CancelledError):
+        await client.run()
+
+    assert attempts == [0, 1, 0, 1]
+    assert metrics.counter('event_stream.reconnects').value == 4
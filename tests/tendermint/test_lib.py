@@ -54,6 +54,33 @@ def test_asset_is_separated_from_transaciton(b):
     assert b.get_transaction(tx.id).to_dict() == tx_dict
 
 
+@pytest.mark.bdb
+def test_get_transaction_dict_matches_to_dict(b, alice, bob, carol):
+    import json
+    from bigchaindb.models import Transaction
+
+    tx_create = Transaction.create([alice.public_key],
+                                   [([bob.public_key, carol.public_key], 1),
+                                    ([alice.public_key], 2)],
+                                   metadata={'hello': 'world'},
+                                   asset={'cycle': 'lifecycle'})\
+                           .sign([alice.private_key])
+    tx_transfer = Transaction.transfer(tx_create.to_inputs([1]),
+                                       [([bob.public_key], 2)],
+                                       asset_id=tx_create.id)\
+                             .sign([alice.private_key])
+
+    b.store_bulk_transactions([tx_create, tx_transfer])
+
+    for tx in (tx_create, tx_transfer):
+        expected = b.get_transaction(tx.id).to_dict()
+        tx_dict = b.get_transaction_dict(tx.id)
+        assert tx_dict == expected
+        assert json.dumps(tx_dict) == json.dumps(expected)
+
+    assert b.get_transaction_dict('a' * 64) is None
+
+
 @pytest.mark.bdb
 def test_get_latest_block(b):
     from bigchaindb.lib import Block
@@ -90,7 +117,7 @@ def test_validation_error(b):
     assert not b.validate_transaction(tx)
 
 
-@patch('requests.post')
+@patch('requests.Session.post')
 def test_write_and_post_transaction(mock_post, b):
     from bigchaindb.models import Transaction
     from bigchaindb.common.crypto import generate_key_pair
@@ -112,7 +139,7 @@ def test_write_and_post_transaction(mock_post, b):
     assert encoded_tx == kwargs['json']['params']
 
 
-@patch('requests.post')
+@patch('requests.Session.post')
 @pytest.mark.parametrize('mode', [
     'broadcast_tx_async',
     'broadcast_tx_sync',
@@ -441,6 +468,62 @@ def test_validation_with_transaction_buffer(b):
     assert not b.is_valid_transaction(double_spend, [create_tx, transfer_tx])
 
 
+@pytest.mark.bdb
+def test_read_blocks(b, signed_create_tx, signed_transfer_tx):
+    from bigchaindb.lib import read_blocks
+
+    b.store_bulk_transactions([signed_create_tx, signed_transfer_tx])
+    b.store_block({'height': 1, 'transactions': [signed_create_tx.id]})
+    b.store_block({'height': 2, 'transactions': []})
+    b.store_block({'height': 3, 'transactions': [signed_transfer_tx.id]})
+
+    blocks = read_blocks(b.connection, 2, 10)
+
+    assert [block['height'] for block in blocks] == [2, 3]
+    assert blocks[0]['transactions'] == []
+    assert [tx['id'] for tx in blocks[1]['transactions']] == [signed_transfer_tx.id]
+
+    blocks = read_blocks(b.connection, 1, 10, full=True)
+    assert blocks[0]['transactions'][0] == signed_create_tx.to_dict()
+    assert blocks[2]['transactions'][0] == signed_transfer_tx.to_dict()
+
+
+@pytest.mark.bdb
+def test_read_committed_blocks(b, signed_create_tx):
+    from bigchaindb.backend.query import store_abci_chain
+    from bigchaindb.lib import read_committed_blocks
+
+    b.store_bulk_transactions([signed_create_tx])
+    b.store_block({'height': 1, 'transactions': []})
+    b.store_block({'height': 11, 'transactions': [signed_create_tx.id]})
+    store_abci_chain(b.connection, 10, 'chain-X')
+
+    blocks = read_committed_blocks(b.connection, 1, 10, full=True)
+
+    assert [block['height'] for block in blocks] == [1]
+    assert blocks[0]['transactions'] == [signed_create_tx.to_dict()]
+
+
+def test_check_transaction_names_the_error(b, signed_create_tx):
+    from bigchaindb.common.exceptions import InvalidSignature
+
+    tx = signed_create_tx.to_dict()
+    assert b.check_transaction(tx) == (signed_create_tx, None)
+
+    # The stateful checks are those of validate_transaction
+    with patch('bigchaindb.lib.BigchainDB.validate_transaction',
+               side_effect=InvalidSignature('Transaction signature is invalid.')) as validate:
+        assert b.check_transaction(tx) == (False, 'InvalidSignature')
+    assert validate.call_args[0] == (signed_create_tx, [])
+
+    assert b.check_transaction(dict(tx, id='0' * 64)) == (False, 'InvalidHash')
+
+    # Some validations fail without raising
+    with patch('bigchaindb.lib.BigchainDB.validate_transaction',
+               return_value=False):
+        assert b.check_transaction(tx) == (False, 'ValidationError')
+
+
 @pytest.mark.bdb
 def test_migrate_abci_chain_yields_on_genesis(b):
     b.migrate_abci_chain()
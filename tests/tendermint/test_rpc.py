@@ -0,0 +1,126 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    from bigchaindb import metrics
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_get_client_is_shared_within_a_process():
+    from bigchaindb.tendermint_rpc import get_client
+
+    client = get_client('http://localhost:26657/')
+    assert get_client('http://localhost:26657/') is client
+    assert get_client('http://tendermint:26657/') is not client
+
+
+def test_get_client_is_not_shared_with_forked_children():
+    from bigchaindb.tendermint_rpc import get_client
+
+    client = get_client('http://localhost:26657/')
+    with patch('os.getpid', return_value=-1):
+        assert get_client('http://localhost:26657/') is not client
+
+
+def test_client_retries_connection_errors_only():
+    from bigchaindb.tendermint_rpc import TendermintRPC
+
+    client = TendermintRPC('http://localhost:26657/', pool_size=4,
+                           retries=2, backoff_factor=0.5)
+    adapter = client.session.get_adapter('http://localhost:26657/')
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.connect == 2
+    assert adapter.max_retries.read == 0
+    assert adapter.max_retries.backoff_factor == 0.5
+    assert not client.session.trust_env
+
+
+@patch('requests.Session.post')
+def test_post_uses_timeouts_and_records_latency(mock_post):
+    from bigchaindb import metrics
+    from bigchaindb.tendermint_rpc import TendermintRPC
+
+    client = TendermintRPC('http://localhost:26657/',
+                           connect_timeout=1, read_timeout=2)
+    payload = {'method': 'broadcast_tx_async'}
+    assert client.post(payload) is mock_post.return_value
+
+    args, kwargs = mock_post.call_args
+    assert args == ('http://localhost:26657/',)
+    assert kwargs == {'json': payload, 'timeout': (1, 2)}
+    latency = metrics.snapshot()['tendermint_rpc.broadcast_tx_async.latency']
+    assert latency['count'] == 1
+
+
+@patch('requests.Session.post')
+def test_workers_log_the_rpc_metrics(mock_post):
+    from bigchaindb import metrics
+    from bigchaindb.tendermint_rpc import TendermintRPC
+    from bigchaindb.web import server
+
+    TendermintRPC('http://localhost:26657/').post({'method': 'broadcast_tx_sync'})
+    with patch.object(server.logger, 'info') as info:
+        metrics.log_snapshot(server.logger, 'web worker 7')
+
+    logged = json.loads(info.call_args[0][2])
+    assert logged['tendermint_rpc.broadcast_tx_sync.latency']['count'] == 1
+
+
+@patch('requests.Session.post', side_effect=requests.exceptions.ConnectionError)
+def test_post_counts_errors(mock_post):
+    from bigchaindb import metrics
+    from bigchaindb.tendermint_rpc import TendermintRPC
+
+    client = TendermintRPC('http://localhost:26657/')
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.post({'method': 'broadcast_tx_sync'})
+
+    assert metrics.snapshot()['tendermint_rpc.errors'] == {'value': 1}
+
+
+@patch('requests.Session.post', side_effect=requests.exceptions.ConnectionError)
+def test_write_transaction_when_tendermint_is_unreachable(
+        mock_post, b, signed_create_tx):
+    assert b.write_transaction(signed_create_tx, 'broadcast_tx_async') == \
+        (503, 'Tendermint is unreachable')
+
+
+@patch('requests.Session.post')
+def test_write_transaction_reuses_the_connection_pool(mock_post, b,
+                                                      signed_create_tx):
+    from bigchaindb import BigchainDB
+
+    mock_post.return_value = Mock(json=Mock(return_value={'result': {'code': 0}}))
+    assert b.write_transaction(signed_create_tx, 'broadcast_tx_async') == (202, '')
+    assert BigchainDB().rpc is b.rpc
+
+
+@patch('requests.Session.post')
+def test_write_transaction_when_the_mempool_is_full(mock_post, b,
+                                                    signed_create_tx):
+    mock_post.return_value = Mock(json=Mock(return_value={
+        'error': {'code': -32603, 'message': 'Internal error',
+                  'data': 'Error broadcasting transaction: Mempool is full'}}))
+    assert b.write_transaction(signed_create_tx, 'broadcast_tx_sync') == \
+        (429, 'Mempool is full')
+
+
+@patch('requests.Session.post')
+def test_get_mempool_size(mock_post, b):
+    mock_post.return_value = Mock(json=Mock(return_value={
+        'result': {'n_txs': '42', 'txs': []}}))
+
+    assert b.get_mempool_size() == 42
+    args, kwargs = mock_post.call_args
+    assert kwargs['json']['method'] == 'num_unconfirmed_txs'
@@ -3,7 +3,8 @@
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
 import base64
-import json
+
+import rapidjson
 
 try:
     from hashlib import sha3_256
@@ -20,7 +21,7 @@ def test_encode_decode_transaction(b):
     }
 
     encode_tx = encode_transaction(asset)
-    new_encode_tx = base64.b64encode(json.dumps(asset).
+    new_encode_tx = base64.b64encode(rapidjson.dumps(asset).
                                      encode('utf8')).decode('utf8')
 
     assert encode_tx == new_encode_tx
@@ -29,6 +30,17 @@ def test_encode_decode_transaction(b):
     assert asset == decode_transaction(de64)
 
 
+def test_encode_raw_transaction():
+    from bigchaindb.tendermint_utils import (encode_raw_transaction,
+                                             decode_transaction_base64)
+
+    raw_tx = b'{ "value" : "key" }'
+    encode_tx = encode_raw_transaction(raw_tx)
+
+    assert base64.b64decode(encode_tx) == raw_tx
+    assert decode_transaction_base64(encode_tx) == {'value': 'key'}
+
+
 def test_calculate_hash_no_key(b):
     from bigchaindb.tendermint_utils import calculate_hash
 
@@ -199,6 +199,18 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request):
         'keyfile': 'keyfile',
         'keyfile_passphrase': 'passphrase',
         'crlfile': 'crlfile',
+        'profiles': {
+            'consensus': {
+                'read_preference': 'primary',
+                'max_time_ms': 0,
+                'max_pool_size': 100,
+            },
+            'api': {
+                'read_preference': 'primary',
+                'max_time_ms': 5000,
+                'max_pool_size': 20,
+            },
+        },
     }
 
     assert bigchaindb.config == {
@@ -207,6 +219,15 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request):
             'bind': SERVER_BIND,
             'loglevel': 'info',
             'workers': None,
+            'engine': 'gunicorn',
+            'response_cache_size': 1024,
+            'commit_timeout': 10,
+            'status_max_waiters': 2,
+            'dedupe_ttl': 30,
+            'admission_max_mempool_size': 10000,
+            'admission_max_in_flight': 0,
+            'admission_max_rejection_rate': 0,
+            'admission_retry_after': 2,
         },
         'wsserver': {
             'scheme': WSSERVER_SCHEME,
@@ -215,11 +236,25 @@ def test_autoconfigure_read_both_from_file_and_env(monkeypatch, request):
             'advertised_scheme': WSSERVER_ADVERTISED_SCHEME,
             'advertised_host': WSSERVER_ADVERTISED_HOST,
             'advertised_port': WSSERVER_ADVERTISED_PORT,
+            'queue_size': 1000,
+            'overflow': 'drop_oldest',
+            'event_source': 'tendermint',
+            'workers': 1,
+            'tx_events_sample_rate': 0.01,
+            'tx_events_rate_limit': 100,
         },
         'database': database_mongodb,
         'tendermint': {
             'host': 'localhost',
             'port': 26657,
+            'rpc_pool_size': 10,
+            'rpc_connect_timeout': 5,
+            'rpc_read_timeout': 30,
+            'rpc_retries': 3,
+            'rpc_backoff_factor': 0.1,
+        },
+        'verification_cache': {
+            'size': 65536,
         },
         'log': {
             'file': LOG_FILE,
@@ -24,6 +24,11 @@ def config(request, monkeypatch):
         'tendermint': {
             'host': 'localhost',
             'port': 26657,
+            'rpc_pool_size': 10,
+            'rpc_connect_timeout': 5,
+            'rpc_read_timeout': 30,
+            'rpc_retries': 3,
+            'rpc_backoff_factor': 0.1,
         },
         'CONFIGURED': True,
     }
@@ -2,6 +2,11 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import asyncio
+import multiprocessing
+import os
+from queue import Empty
+
 import pytest
 
 
@@ -23,7 +28,7 @@ def test_event_handler():
     sub3 = exchange.get_subscriber_queue(EventTypes.BLOCK_INVALID)
 
     # push and event to the queue
-    exchange.dispatch(event)
+    exchange.get_publisher_queue().put(event)
 
     # get the event from the queue
     event_sub0 = sub0.get()
@@ -40,35 +45,189 @@ def test_event_handler():
     assert event_sub2.data == event.data
 
     assert sub3.qsize() == 0
+    with pytest.raises(Empty):
+        sub3.get(timeout=0.01)
 
 
 def test_event_handler_raises_when_called_after_start():
     from bigchaindb.events import Exchange, POISON_PILL
 
     exchange = Exchange()
-    publisher_queue = exchange.get_publisher_queue()
-    publisher_queue.put(POISON_PILL)
-    exchange.run()
+    exchange.get_publisher_queue().put(POISON_PILL)
 
     with pytest.raises(RuntimeError):
         exchange.get_subscriber_queue()
 
 
-def test_exchange_stops_with_poison_pill():
+def test_poison_pill_reaches_all_subscribers():
     from bigchaindb.events import EventTypes, Event, Exchange, POISON_PILL
 
-    # create and event
-    event_data = {'msg': 'some data'}
-    event = Event(EventTypes.BLOCK_VALID, event_data)
+    exchange = Exchange()
+    subscriber = exchange.get_subscriber_queue(EventTypes.BLOCK_INVALID)
+
+    exchange.put(Event(EventTypes.BLOCK_VALID, {'height': 1}))
+    exchange.put(POISON_PILL)
+
+    assert subscriber.qsize() == 1
+    assert subscriber.get() == POISON_PILL
+    assert subscriber.qsize() == 0
+
+
+def test_get_subscriber_queues():
+    from bigchaindb.events import EventTypes, Event, Exchange
 
-    # create the events pub sub
     exchange = Exchange()
+    queues = exchange.get_subscriber_queues(3, EventTypes.BLOCK_VALID)
+    exchange.put(Event(EventTypes.BLOCK_VALID, {'height': 1}))
 
-    publisher_queue = exchange.get_publisher_queue()
+    assert len(queues) == 3
+    assert [queue.get().data for queue in queues] == [{'height': 1}] * 3
 
-    # push and event to the queue
-    publisher_queue.put(event)
-    publisher_queue.put(POISON_PILL)
-    exchange.run()
 
-    assert publisher_queue.qsize() == 0
+def test_events_wrap_around_the_buffer():
+    from bigchaindb.events import Exchange
+
+    exchange = Exchange(size=1024)
+    subscriber = exchange.get_subscriber_queue()
+
+    for i in range(100):
+        event = {'height': i, 'data': 'x' * (i % 50)}
+        exchange.put(event)
+        assert subscriber.get_nowait() == event
+    assert exchange.header().head > exchange.size
+
+
+def test_slow_subscribers_lose_the_oldest_events():
+    from bigchaindb import metrics
+    from bigchaindb.events import Exchange
+
+    metrics.reset()
+    exchange = Exchange(size=1024)
+    subscriber = exchange.get_subscriber_queue()
+
+    for i in range(100):
+        exchange.put({'height': i, 'data': 'x' * 40})
+
+    received = [subscriber.get_nowait()['height'] for _ in range(subscriber.qsize())]
+    assert received == list(range(100 - len(received), 100))
+    assert metrics.counter('events.lost').value == 100 - len(received)
+    with pytest.raises(Empty):
+        subscriber.get_nowait()
+    metrics.reset()
+
+
+def test_events_larger_than_the_buffer_are_rejected():
+    from bigchaindb.events import Exchange
+
+    exchange = Exchange(size=1024)
+    with pytest.raises(ValueError):
+        exchange.put('x' * 1024)
+
+
+def test_header_waits_for_the_publisher():
+    import threading
+    from bigchaindb.events import Exchange, VERSION
+
+    exchange = Exchange(size=1024)
+    exchange.put('event')
+    version = exchange.header().version
+    VERSION.pack_into(exchange.buffer, 0, version + 1)
+
+    threading.Timer(0.01, VERSION.pack_into,
+                    args=(exchange.buffer, 0, version + 2)).start()
+    assert exchange.header().version == version + 2
+
+
+def test_header_raises_if_the_publisher_never_finishes():
+    from bigchaindb.events import Exchange, VERSION
+
+    exchange = Exchange(size=1024)
+    VERSION.pack_into(exchange.buffer, 0, 1)
+
+    with pytest.raises(RuntimeError):
+        exchange.header(timeout=0.01)
+
+
+def test_publishers_take_the_lock_over_from_a_dead_publisher():
+    from bigchaindb.events import Exchange, VERSION
+
+    exchange = Exchange(size=1024)
+    subscriber = exchange.get_subscriber_queue()
+    exchange.put('before')
+
+    def die_while_publishing():
+        exchange.lock.acquire()
+        VERSION.pack_into(exchange.buffer, 0, exchange.header().version + 1)
+        os._exit(1)
+
+    process = multiprocessing.Process(target=die_while_publishing)
+    process.start()
+    process.join()
+
+    exchange.put('after', lock_timeout=0.01)
+    assert subscriber.get(timeout=5) == 'before'
+    assert subscriber.get(timeout=5) == 'after'
+    assert exchange.header().version % 2 == 0
+    # the lock was released
+    assert exchange.lock.acquire(block=False)
+
+
+def test_seek_to_head_skips_the_published_events():
+    from bigchaindb.events import Exchange
+
+    exchange = Exchange(size=1024)
+    subscriber = exchange.get_subscriber_queue()
+    exchange.put('old')
+
+    subscriber.seek_to_head()
+    with pytest.raises(Empty):
+        subscriber.get(timeout=0)
+    exchange.put('new')
+    assert subscriber.get(timeout=5) == 'new'
+
+
+def publish(exchange, count):
+    for height in range(count):
+        exchange.put({'height': height})
+
+
+def test_subscribers_read_events_published_by_another_process():
+    from bigchaindb.events import Exchange
+
+    exchange = Exchange(size=4096)
+    subscriber = exchange.get_subscriber_queue()
+    publisher = multiprocessing.Process(target=publish, args=(exchange, 10))
+    publisher.start()
+
+    assert [subscriber.get(timeout=5)['height'] for _ in range(10)] == list(range(10))
+    publisher.join()
+
+
+def test_subscribers_read_events_published_by_several_processes():
+    from bigchaindb.events import Exchange
+
+    exchange = Exchange(size=65536)
+    subscriber = exchange.get_subscriber_queue()
+    publishers = [multiprocessing.Process(target=publish, args=(exchange, 100))
+                  for _ in range(2)]
+    for publisher in publishers:
+        publisher.start()
+
+    heights = sorted(subscriber.get(timeout=5)['height'] for _ in range(200))
+    assert heights == sorted(list(range(100)) * 2)
+    for publisher in publishers:
+        publisher.join()
+
+
+@asyncio.coroutine
+def test_async_event_reader(loop):
+    from bigchaindb.events import AsyncEventReader, Exchange
+
+    exchange = Exchange(size=4096)
+    subscriber = AsyncEventReader(exchange.get_subscriber_queue(), loop)
+
+    exchange.put('first')
+    assert (yield from subscriber.get()) == 'first'
+
+    loop.call_later(0.01, exchange.put, 'second')
+    assert (yield from asyncio.wait_for(subscriber.get(), 5, loop=loop)) == 'second'
@@ -0,0 +1,112 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import json
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    from bigchaindb import metrics
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def test_counter():
+    from bigchaindb import metrics
+
+    metrics.counter('requests').inc()
+    metrics.counter('requests').inc(2)
+
+    assert metrics.snapshot() == {'requests': {'value': 3}}
+
+
+def test_gauge():
+    from bigchaindb import metrics
+
+    metrics.gauge('queued').set(5)
+    metrics.gauge('queued').set(2)
+
+    assert metrics.snapshot() == {'queued': {'value': 2}}
+
+    queue = [1, 2, 3]
+    metrics.gauge('queued').set_function(lambda: len(queue))
+    queue.pop()
+    assert metrics.snapshot() == {'queued': {'value': 2}}
+
+
+def test_histogram():
+    from bigchaindb import metrics
+
+    histogram = metrics.histogram('latency', buckets=(1, 2))
+    for value in (0.5, 1, 1.5, 3):
+        histogram.observe(value)
+
+    assert metrics.snapshot()['latency'] == {
+        'count': 4,
+        'sum': 6,
+        'max': 3,
+        'buckets': {'1': 2, '2': 3, '+Inf': 4},
+    }
+
+
+def test_histogram_time(monkeypatch):
+    from bigchaindb import metrics
+
+    clock = iter((10, 10.25))
+    monkeypatch.setattr('time.perf_counter', lambda: next(clock))
+    with metrics.histogram('latency').time():
+        pass
+
+    assert metrics.histogram('latency').sum == 0.25
+
+
+def test_bucket():
+    from bigchaindb import metrics
+
+    assert [metrics.bucket(value, buckets=(1, 2)) for value in (0.5, 1, 1.5, 3)] == \
+        ['1', '1', '2', '+Inf']
+    assert metrics.bucket(0.003) == '0.005'
+
+
+def test_metric_names_are_unique():
+    from bigchaindb import metrics
+
+    metrics.counter('requests')
+    with pytest.raises(TypeError):
+        metrics.histogram('requests')
+
+
+def test_log_snapshot():
+    from bigchaindb import metrics
+
+    logger = Mock()
+    metrics.log_snapshot(logger, 'web worker 7')
+    assert not logger.info.called
+
+    metrics.counter('dedupe.suppressed').inc()
+    metrics.log_snapshot(logger, 'web worker 7')
+    args = logger.info.call_args[0]
+    assert args[1] == 'web worker 7'
+    assert json.loads(args[2]) == {'dedupe.suppressed': {'value': 1}}
+
+
+def test_start_logging():
+    from bigchaindb import metrics
+
+    with patch('bigchaindb.metrics.log_snapshot') as log_snapshot:
+        stopped = metrics.start_logging('logger', 'web worker 7', interval=0.001)
+        time.sleep(0.1)
+        stopped.set()
+        time.sleep(0.01)
+        calls = log_snapshot.call_count
+        time.sleep(0.05)
+
+    log_snapshot.assert_called_with('logger', 'web worker 7')
+    # no longer logging once stopped
+    assert log_snapshot.call_count == calls
@@ -154,6 +154,52 @@ def test_valid_election_votes_received(b_mock, valid_election, ed25519_node_keys
     assert valid_election.get_commited_votes(b_mock) == votes-2
 
 
+@pytest.mark.bdb
+def test_votes_stored_without_a_tally_are_counted(b_mock, valid_election,
+                                                  ed25519_node_keys, monkeypatch):
+    from bigchaindb.backend import query
+    from bigchaindb.elections.election import Election
+
+    tx_vote0 = gen_vote(valid_election, 0, ed25519_node_keys)
+    tx_vote1 = gen_vote(valid_election, 1, ed25519_node_keys)
+    tx_vote2 = gen_vote(valid_election, 2, ed25519_node_keys)
+    b_mock.store_bulk_transactions([valid_election])
+
+    # Stored before the upgrade adding the tallies
+    with monkeypatch.context() as m:
+        m.setattr(Election, 'tally_votes', classmethod(lambda cls, txns: {}))
+        b_mock.store_bulk_transactions([tx_vote0, tx_vote1])
+    assert query.get_vote_tally(b_mock.connection, valid_election.id) is None
+
+    votes = tx_vote0.outputs[0].amount + tx_vote1.outputs[0].amount
+    assert valid_election.get_commited_votes(b_mock) == votes
+    assert ValidatorElection.has_concluded(b_mock, valid_election.id, [tx_vote2])
+    # reading the votes doesn't store a tally
+    assert query.get_vote_tally(b_mock.connection, valid_election.id) is None
+
+
+@pytest.mark.bdb
+def test_first_tallied_vote_counts_the_votes_stored_before(b_mock, valid_election,
+                                                           ed25519_node_keys, monkeypatch):
+    from bigchaindb.backend import query
+    from bigchaindb.elections.election import Election
+
+    tx_vote0 = gen_vote(valid_election, 0, ed25519_node_keys)
+    tx_vote1 = gen_vote(valid_election, 1, ed25519_node_keys)
+    tx_vote2 = gen_vote(valid_election, 2, ed25519_node_keys)
+    b_mock.store_bulk_transactions([valid_election])
+
+    with monkeypatch.context() as m:
+        m.setattr(Election, 'tally_votes', classmethod(lambda cls, txns: {}))
+        b_mock.store_bulk_transactions([tx_vote0])
+    b_mock.store_bulk_transactions([tx_vote1])
+
+    votes = tx_vote0.outputs[0].amount + tx_vote1.outputs[0].amount
+    assert query.get_vote_tally(b_mock.connection, valid_election.id)['votes'] == votes
+    assert valid_election.get_commited_votes(b_mock) == votes
+    assert ValidatorElection.has_concluded(b_mock, valid_election.id, [tx_vote2])
+
+
 @pytest.mark.bdb
 def test_valid_election_conclude(b_mock, valid_election, ed25519_node_keys):
 
@@ -213,6 +259,33 @@ def test_valid_election_conclude(b_mock, valid_election, ed25519_node_keys):
     assert not ValidatorElection.has_concluded(b_mock, valid_election.id, [tx_vote3])
 
 
+@pytest.mark.bdb
+def test_recover_recounts_the_votes_of_deleted_transactions(b_mock, valid_election,
+                                                            ed25519_node_keys):
+    from bigchaindb.commands.bigchaindb import run_recover
+    from bigchaindb.lib import Block, PreCommitState
+    from bigchaindb.backend.query import PRE_COMMIT_ID
+
+    tx_vote0 = gen_vote(valid_election, 0, ed25519_node_keys)
+    tx_vote1 = gen_vote(valid_election, 1, ed25519_node_keys)
+    b_mock.store_bulk_transactions([valid_election, tx_vote0])
+    b_mock.store_block(Block(app_hash='', height=1,
+                             transactions=[valid_election.id, tx_vote0.id])._asdict())
+
+    # The node stopped after storing the transactions of the next block,
+    # but before storing the block
+    b_mock.store_pre_commit_state(PreCommitState(commit_id=PRE_COMMIT_ID, height=2,
+                                                 transactions=[tx_vote1.id])._asdict())
+    b_mock.store_bulk_transactions([tx_vote1])
+    votes0 = tx_vote0.outputs[0].amount
+    assert valid_election.get_commited_votes(b_mock) == votes0 + tx_vote1.outputs[0].amount
+
+    run_recover(b_mock)
+
+    assert not b_mock.get_transaction(tx_vote1.id)
+    assert valid_election.get_commited_votes(b_mock) == votes0
+
+
 @pytest.mark.abci
 def test_upsert_validator(b, node_key, node_keys, ed25519_node_keys):
     import time
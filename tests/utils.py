@@ -4,7 +4,9 @@
 
 from functools import singledispatch
 
+from bigchaindb.backend.localmemory.connection import LocalMemoryConnection
 from bigchaindb.backend.localmongodb.connection import LocalMongoDBConnection
+from bigchaindb.backend.localsqlite.connection import LocalSQLiteConnection
 from bigchaindb.backend.schema import TABLES
 
 
@@ -19,6 +21,23 @@ def flush_localmongo_db(connection, dbname):
         getattr(connection.conn[dbname], t).delete_many({})
 
 
+@flush_db.register(LocalSQLiteConnection)
+def flush_localsqlite_db(connection, dbname):
+    def flush(db):
+        for t in TABLES:
+            db.execute('DELETE FROM {}'.format(t))
+        # Blocks are never deleted, so no trigger cleans this one up
+        db.execute('DELETE FROM block_transactions')
+
+    connection.run(flush, write=True)
+
+
+@flush_db.register(LocalMemoryConnection)
+def flush_localmemory_db(connection, dbname):
+    for t in TABLES:
+        connection.conn[t].clear()
+
+
 def generate_block(bigchain):
     from bigchaindb.common.crypto import generate_key_pair
     from bigchaindb.models import Transaction
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+from unittest.mock import Mock, patch
+
 import pytest
 
 
@@ -16,3 +18,23 @@ def app(request):
         app = server.create_app(debug=True)
 
     return app
+
+
+@pytest.fixture
+def empty_ledger(monkeypatch):
+    # register the backend queries before patching the generic one
+    import bigchaindb.backend.localmongodb.query  # noqa: F401
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: False)
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.get_transaction',
+                        lambda self, txid: None)
+    monkeypatch.setattr('bigchaindb.backend.query.get_spent',
+                        lambda conn, txid, output: None)
+
+
+@pytest.fixture
+def mock_post():
+    with patch('requests.Session.post') as mock_post:
+        mock_post.return_value = Mock(
+            json=Mock(return_value={'result': {'code': 0}}))
+        yield mock_post
@@ -0,0 +1,83 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from unittest.mock import Mock
+
+from bigchaindb.lib import TX_REJECTED
+from bigchaindb.web import admission
+from bigchaindb.web.admission import AdmissionController
+
+
+def test_everything_is_admitted_without_thresholds():
+    controller = AdmissionController(Mock(return_value=10 ** 6))
+
+    assert controller.admit(1000) is None
+    assert controller.in_flight == 1000
+    assert not controller.mempool_size.called
+
+
+def test_in_flight_transactions_are_limited():
+    controller = AdmissionController(max_in_flight=10)
+
+    assert controller.admit(8) is None
+    assert controller.admit(3) == 'too many transactions are being processed'
+    controller.release(8)
+    assert controller.admit(3) is None
+    assert controller.in_flight == 3
+
+
+def test_mempool_is_sampled_once_per_interval(monkeypatch):
+    now = [100]
+    monkeypatch.setattr('time.monotonic', lambda: now[0])
+    mempool_size = Mock(side_effect=[5, 20])
+    controller = AdmissionController(mempool_size, max_mempool_size=10)
+
+    assert controller.admit() is None
+    assert controller.admit() is None
+    now[0] += admission.MEMPOOL_SAMPLE_INTERVAL
+    assert controller.admit() == 'the mempool is full'
+    assert mempool_size.call_count == 2
+
+
+def test_failed_samples_keep_the_last_mempool_size(monkeypatch):
+    now = [100]
+    monkeypatch.setattr('time.monotonic', lambda: now[0])
+    controller = AdmissionController(
+        Mock(side_effect=[20, ConnectionError]), max_mempool_size=10)
+
+    assert controller.admit() == 'the mempool is full'
+    now[0] += admission.MEMPOOL_SAMPLE_INTERVAL
+    assert controller.admit() == 'the mempool is full'
+
+
+def test_load_is_shed_while_tendermint_rejects_transactions(monkeypatch):
+    now = [100]
+    monkeypatch.setattr('time.monotonic', lambda: now[0])
+    controller = AdmissionController(max_rejection_rate=0.5)
+
+    for status_code, message in [(202, ''), TX_REJECTED] * admission.REJECTION_MIN_SAMPLES:
+        controller.record('broadcast_tx_sync', status_code, message)
+    assert controller.admit() is None
+
+    for _ in range(admission.REJECTION_MIN_SAMPLES):
+        controller.record('broadcast_tx_sync', *TX_REJECTED)
+    assert controller.admit() == 'too many transactions are being rejected'
+
+    # the outcomes expire, so the node eventually accepts transactions again
+    now[0] += admission.REJECTION_WINDOW + 1
+    assert controller.admit() is None
+
+
+def test_only_check_tx_rejections_are_recorded():
+    controller = AdmissionController(max_rejection_rate=0.5)
+
+    for _ in range(admission.REJECTION_MIN_SAMPLES):
+        # not checked before Tendermint answers
+        controller.record('broadcast_tx_async', *TX_REJECTED)
+        # not a verdict on the transaction
+        controller.record('broadcast_tx_sync', 503, 'Tendermint is unreachable')
+        controller.record('broadcast_tx_sync', 429, 'Mempool is full')
+        controller.record('broadcast_tx_sync', 500, 'Tx already exists in cache')
+    assert controller.admit() is None
+    assert not controller._outcomes
@@ -0,0 +1,232 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import copy
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import rapidjson
+
+from bigchaindb.web.async_server import create_app
+
+
+TX_ENDPOINT = '/api/v1/transactions/'
+BATCH_ENDPOINT = TX_ENDPOINT + 'batch'
+
+
+@pytest.fixture
+def async_app():
+    return create_app({'threads': 4})
+
+
+@pytest.fixture
+def async_client(loop, async_app, aiohttp_client):
+    return loop.run_until_complete(aiohttp_client(async_app))
+
+
+async def test_index_and_routes_match_the_flask_app(async_client, client):
+    for path in ['/', '/api/v1/', '/api/v1']:
+        res = await async_client.get(path)
+        assert res.status == 200
+        assert res.headers['Access-Control-Allow-Origin'] == '*'
+        assert await res.json() == client.get(path).json
+
+
+async def test_get_transaction_is_cached_with_etag(async_client,
+                                                   signed_create_tx):
+    tx_dict = signed_create_tx.to_dict()
+    with patch('bigchaindb.lib.BigchainDB.get_transaction_dict',
+               return_value=tx_dict) as get_transaction_dict:
+        res = await async_client.get(TX_ENDPOINT + tx_dict['id'])
+        assert res.status == 200
+        assert await res.json() == tx_dict
+        etag = res.headers['ETag']
+
+        res = await async_client.get(TX_ENDPOINT + tx_dict['id'],
+                                     headers={'If-None-Match': etag})
+        assert res.status == 304
+        assert get_transaction_dict.call_count == 1
+
+
+async def test_get_transaction_returns_404_if_not_found(async_client):
+    with patch('bigchaindb.lib.BigchainDB.get_transaction_dict',
+               return_value=None):
+        res = await async_client.get(TX_ENDPOINT + '123')
+    assert res.status == 404
+    assert await res.json() == {'status': 404, 'message': 'Not found'}
+
+
+async def test_query_arguments_are_validated_like_flask(async_client):
+    res = await async_client.get('/api/v1/outputs')
+    assert res.status == 400
+    assert 'public_key' in (await res.json())['message']
+
+    res = await async_client.get('/api/v1/transactions?asset_id=abc')
+    assert res.status == 400
+    assert (await res.json())['message'] == {'asset_id': 'Invalid hash'}
+
+    res = await async_client.get('/api/v1/blocks?transaction_id=a&foo=1')
+    assert res.status == 400
+    assert (await res.json())['message'] == 'Unknown arguments: foo'
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_post_transaction(async_client, mock_post, signed_create_tx):
+    tx = signed_create_tx.to_dict()
+
+    res = await async_client.post(TX_ENDPOINT + '?mode=sync',
+                                  data=json.dumps(tx, indent=4))
+    assert res.status == 202
+    assert await res.read() == rapidjson.dumps(tx).encode()
+    assert mock_post.call_args[1]['json']['method'] == 'broadcast_tx_sync'
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_post_invalid_transaction(async_client, mock_post,
+                                        signed_create_tx):
+    res = await async_client.post(TX_ENDPOINT, data='{"id": ')
+    assert res.status == 400
+    assert (await res.json())['message'].startswith('Invalid JSON')
+
+    tx = copy.deepcopy(signed_create_tx.to_dict())
+    tx['id'] = 'abcd' * 16
+    res = await async_client.post(TX_ENDPOINT, data=json.dumps(tx))
+    assert res.status == 400
+    assert (await res.json())['message'].startswith(
+        'Invalid transaction (InvalidHash)')
+    assert not mock_post.called
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_post_transaction_batch(async_client, mock_post,
+                                      signed_create_tx, signed_transfer_tx):
+    invalid_tx = copy.deepcopy(signed_create_tx.to_dict())
+    invalid_tx['id'] = 'abcd' * 16
+    batch = [signed_create_tx.to_dict(), invalid_tx,
+             signed_transfer_tx.to_dict()]
+
+    res = await async_client.post(BATCH_ENDPOINT, data=json.dumps(batch))
+    assert res.status == 200
+    statuses = await res.json()
+    assert [status['status'] for status in statuses] == [202, 400, 202]
+    assert mock_post.call_count == 2
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_post_transaction_in_commit_mode_waits_without_a_thread(
+        async_app, async_client, mock_post, monkeypatch, signed_create_tx):
+    registry = async_app['commit_registry']
+    registry.slot = 0
+    tx_id = signed_create_tx.id
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: registry.committed_height(txid)
+                        is not None)
+
+    def post(*args, **kwargs):
+        threading.Timer(0.05, registry.resolve, args=(1, [tx_id])).start()
+        return mock_post.return_value
+
+    mock_post.side_effect = post
+
+    res = await async_client.post(TX_ENDPOINT + '?mode=commit',
+                                  data=json.dumps(signed_create_tx.to_dict()))
+    assert res.status == 202
+    assert mock_post.call_args[1]['json']['method'] == 'broadcast_tx_sync'
+    assert not registry._pending
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_get_transaction_status_waits_for_the_commit(
+        async_app, async_client, monkeypatch):
+    registry = async_app['commit_registry']
+    registry.slot = 0
+    tx_id = 'a' * 64
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: registry.committed_height(txid)
+                        is not None)
+
+    res = await async_client.get(TX_ENDPOINT + tx_id + '/status')
+    assert res.status == 404
+
+    threading.Timer(0.05, registry.resolve, args=(1, [tx_id])).start()
+    res = await async_client.get(TX_ENDPOINT + tx_id + '/status?wait=5')
+    assert res.status == 200
+    assert await res.json() == {'id': tx_id, 'status': 'committed'}
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_timed_out_waits_remove_their_callback(async_app, async_client,
+                                                     monkeypatch):
+    registry = async_app['commit_registry']
+    registry.slot = 0
+    tx_id = 'a' * 64
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: False)
+    # also waited for by another request
+    pending = registry.register(tx_id)
+
+    for _ in range(3):
+        res = await async_client.get(TX_ENDPOINT + tx_id + '/status?wait=0.01')
+        assert res.status == 404
+    assert not pending._callbacks
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_get_transaction_status_refuses_to_wait_without_block_events(
+        async_client):
+    res = await async_client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=5')
+    assert res.status == 503
+
+
+@pytest.mark.usefixtures('empty_ledger')
+async def test_duplicate_submissions_wait_without_a_thread(
+        loop, aiohttp_client, mock_post, signed_create_tx):
+    import asyncio
+    from bigchaindb.web import api
+
+    app = create_app({'threads': 1})
+    client = await aiohttp_client(app)
+    raw_tx = rapidjson.dumps(signed_create_tx.to_dict()).encode()
+    # an identical submission is in flight
+    key = api.submission_key(signed_create_tx.to_dict(), raw_tx,
+                             'broadcast_tx_async')
+    submission, _ = app['dedupe_table'].claim(key)
+
+    duplicates = [asyncio.ensure_future(client.post(TX_ENDPOINT, data=raw_tx))
+                  for _ in range(3)]
+    await asyncio.sleep(0.05)
+    # the only thread of the pool is free
+    assert await loop.run_in_executor(app['thread_pool'], int) == 0
+
+    app['dedupe_table'].complete(key, submission, (202, ''), accepted=True)
+    responses = await asyncio.gather(*duplicates)
+    assert [res.status for res in responses] == [202, 202, 202]
+    assert not mock_post.called
+
+
+async def test_post_transaction_is_shed_when_overloaded(
+        async_app, async_client, mock_post, signed_create_tx):
+    async_app['admission'].max_mempool_size = 10
+    async_app['admission'].last_mempool_size = 11
+
+    res = await async_client.post(TX_ENDPOINT,
+                                  data=json.dumps(signed_create_tx.to_dict()))
+    assert res.status == 429
+    assert res.headers['Retry-After'] == '2'
+    assert not mock_post.called
+
+
+def test_check_stateless_records_verified_signatures(signed_create_tx):
+    from bigchaindb.common import verification_cache
+    from bigchaindb.web.async_server import _check_stateless
+
+    verification_cache.enable(64)
+    try:
+        assert _check_stateless(signed_create_tx.to_dict()) is None
+        assert any(verification_cache._cache._map[:])
+        assert _check_stateless({'id': 'ab' * 32}).startswith('Invalid')
+    finally:
+        verification_cache.disable()
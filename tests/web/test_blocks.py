@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+from unittest.mock import patch
+
 import pytest
 
 BLOCKS_ENDPOINT = '/api/v1/blocks/'
@@ -52,3 +54,18 @@ def test_get_blocks_by_txid_endpoint_returns_400_bad_query_params(client):
     assert res.json == {
         'message': 'Unknown arguments: status'
     }
+
+
+def test_get_block_is_cached_with_etag(client):
+    block = {'height': 3, 'transactions': []}
+    with patch('bigchaindb.lib.BigchainDB.get_block',
+               return_value=block) as get_block:
+        res = client.get(BLOCKS_ENDPOINT + '3')
+        assert res.status_code == 200
+        assert res.json == block
+
+        res = client.get(BLOCKS_ENDPOINT + '3',
+                         headers={'If-None-Match': res.headers['ETag']})
+        assert res.status_code == 304
+
+    get_block.assert_called_once_with(block_id=3)
@@ -0,0 +1,135 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import queue
+import threading
+from unittest.mock import Mock
+
+from bigchaindb.events import Event, EventTypes, Exchange, POISON_PILL
+from bigchaindb.web.commit_registry import CommitRegistry
+
+
+def test_wait_for_a_committed_transaction():
+    registry = CommitRegistry()
+    pending = registry.register('a')
+
+    threading.Timer(0.01, registry.resolve, args=(7, ['a', 'b'])).start()
+
+    assert pending.wait(5) == 7
+    registry.discard(pending)
+    assert not registry._pending
+
+
+def test_wait_times_out():
+    registry = CommitRegistry()
+    pending = registry.register('a')
+
+    assert pending.wait(0.01) is None
+    registry.discard(pending)
+    assert not registry._pending
+
+
+def test_done_callbacks_are_called_once_committed():
+    registry = CommitRegistry()
+    pending = registry.register('a')
+    callback = Mock()
+
+    pending.add_done_callback(callback)
+    assert not callback.called
+    registry.resolve(3, ['a'])
+    callback.assert_called_once_with(3)
+
+    # callbacks added once committed are called right away
+    late_callback = Mock()
+    pending.add_done_callback(late_callback)
+    late_callback.assert_called_once_with(3)
+
+
+def test_remove_a_done_callback():
+    registry = CommitRegistry()
+    pending = registry.register('a')
+    callback = Mock()
+
+    pending.add_done_callback(callback)
+    pending.remove_done_callback(callback)
+    # removing it twice is harmless
+    pending.remove_done_callback(callback)
+    registry.resolve(3, ['a'])
+    assert not callback.called
+
+
+def test_register_a_transaction_committed_recently():
+    registry = CommitRegistry(recent_size=2)
+    registry.resolve(1, ['a', 'b'])
+    registry.resolve(2, ['c'])
+
+    assert registry.register('b').wait(0) == 1
+    assert registry.register('c').wait(0) == 2
+    assert registry.register('a').wait(0) is None
+    assert registry.committed_height('c') == 2
+
+
+def test_waiters_share_a_pending_commit():
+    registry = CommitRegistry()
+    first = registry.register('a')
+    second = registry.register('a')
+
+    assert first is second
+    registry.discard(first)
+    assert 'a' in registry._pending
+    registry.discard(second)
+    assert 'a' not in registry._pending
+
+
+def test_consume_block_events():
+    registry = CommitRegistry()
+    events = queue.Queue()
+    events.put(Event(EventTypes.BLOCK_VALID,
+                     {'height': 3, 'transactions': [{'id': 'a'}]}))
+    events.put(Event(EventTypes.BLOCK_VALID, {'invalid': 'block'}))
+    events.put(POISON_PILL)
+
+    registry.consume(events)
+
+    assert registry.committed_height('a') == 3
+
+
+def test_gunicorn_hooks_assign_a_queue_per_worker():
+    registry = CommitRegistry(queues=[queue.Queue(), queue.Queue()])
+    workers = [Mock(), Mock(), Mock()]
+
+    for worker in workers:
+        registry.pre_fork(None, worker)
+    assert [worker.commit_registry_slot for worker in workers] == [0, 1, None]
+
+    registry.child_exit(None, workers[0])
+    replacement = Mock()
+    registry.pre_fork(None, replacement)
+    assert replacement.commit_registry_slot == 0
+
+    registry.post_fork(None, workers[2])
+    assert not registry.running
+    registry.post_fork(None, workers[1])
+    assert registry.running
+    assert registry.slot == 1
+    registry.queues[1].put(POISON_PILL)
+
+
+def test_post_fork_skips_the_events_published_before_the_worker():
+    exchange = Exchange(size=4096)
+    registry = CommitRegistry(exchange.get_subscriber_queues(1))
+    worker = Mock()
+    registry.pre_fork(None, worker)
+    # Committed while a previous worker held the queue
+    exchange.put(Event(EventTypes.BLOCK_VALID,
+                       {'height': 1, 'transactions': [{'id': 'a'}]}))
+
+    registry.post_fork(None, worker)
+    exchange.put(Event(EventTypes.BLOCK_VALID,
+                       {'height': 2, 'transactions': [{'id': 'b'}]}))
+    pending = registry.register('b')
+
+    assert pending.wait(5) == 2
+    assert registry.committed_height('a') is None
+    exchange.put(POISON_PILL)
@@ -0,0 +1,97 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import threading
+
+from bigchaindb.web.dedupe import DedupeTable
+
+
+def test_accepted_submissions_are_kept():
+    table = DedupeTable(ttl=30)
+
+    submission, new = table.claim('a')
+    assert new
+    table.complete('a', submission, (202, ''), accepted=True)
+
+    duplicate, new = table.claim('a')
+    assert not new
+    assert duplicate.wait(0) == (202, '')
+
+
+def test_rejected_submissions_are_forgotten():
+    table = DedupeTable(ttl=30)
+
+    submission, _ = table.claim('a')
+    table.complete('a', submission, (400, 'Invalid'), accepted=False)
+
+    assert table.claim('a')[1]
+
+
+def test_duplicates_wait_for_submissions_in_flight():
+    table = DedupeTable(ttl=30)
+    submission, _ = table.claim('a')
+    duplicate, new = table.claim('a')
+
+    assert not new
+    assert duplicate.wait(0) is None
+    threading.Timer(0.01, table.complete,
+                    args=('a', submission, (500, 'Oops'), False)).start()
+    assert duplicate.wait(5) == (500, 'Oops')
+
+
+def test_callbacks_get_the_outcome():
+    table = DedupeTable(ttl=30)
+    submission, _ = table.claim('a')
+    outcomes = []
+
+    submission.add_done_callback(outcomes.append)
+    table.complete('a', submission, (202, ''), accepted=True)
+    submission.add_done_callback(outcomes.append)
+
+    assert outcomes == [(202, ''), (202, '')]
+
+
+def test_remove_a_done_callback():
+    table = DedupeTable(ttl=30)
+    submission, _ = table.claim('a')
+    outcomes = []
+
+    submission.add_done_callback(outcomes.append)
+    submission.remove_done_callback(outcomes.append)
+    table.complete('a', submission, (202, ''), accepted=True)
+
+    assert outcomes == []
+
+
+def test_accepted_submissions_expire(monkeypatch):
+    now = 0
+    monkeypatch.setattr('time.monotonic', lambda: now)
+    table = DedupeTable(ttl=30)
+    for key in ('a', 'b'):
+        submission, _ = table.claim(key)
+        table.complete(key, submission, (202, ''), accepted=True)
+
+    now = 31
+    assert table.claim('a')[1]
+    assert len(table) == 1
+
+
+def test_table_is_bounded():
+    table = DedupeTable(ttl=30, size=2)
+    for key in ('a', 'b', 'c'):
+        submission, _ = table.claim(key)
+        table.complete(key, submission, (202, ''), accepted=True)
+
+    assert len(table) == 2
+    assert table.claim('a')[1]
+
+
+def test_zero_ttl_disables_deduplication():
+    table = DedupeTable(ttl=0)
+
+    submission, _ = table.claim('a')
+    table.complete('a', submission, (202, ''), accepted=True)
+
+    assert table.claim('a')[1]
+    assert len(table) == 0
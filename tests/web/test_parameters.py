@@ -77,3 +77,17 @@ def test_valid_operation():
         valid_operation('blah')
     with pytest.raises(ValueError):
         valid_operation('')
+
+
+def test_valid_height():
+    from bigchaindb.web.views.parameters import valid_height
+
+    assert valid_height('0') == 0
+    assert valid_height('42') == 42
+
+    with pytest.raises(ValueError):
+        valid_height('-1')
+    with pytest.raises(ValueError):
+        valid_height('1.5')
+    with pytest.raises(ValueError):
+        valid_height('')
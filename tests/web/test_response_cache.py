@@ -0,0 +1,30 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+
+def test_response_cache_evicts_least_recently_used():
+    from bigchaindb.web.response_cache import ResponseCache
+
+    cache = ResponseCache(2)
+    cache.put('a', b'{"a": 1}')
+    cache.put('b', b'{"b": 1}')
+    assert cache.get('a').body == b'{"a": 1}'
+
+    cache.put('c', b'{"c": 1}')
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_response_cache_etag_is_strong_and_stable():
+    from bigchaindb.web.response_cache import ResponseCache
+
+    cache = ResponseCache(0)
+    first = cache.put('a', b'{"a": 1}')
+    second = cache.put('b', b'{"a": 1}')
+    assert first.etag == second.etag
+    assert not first.etag.startswith('W/')
+    assert len(cache) == 0
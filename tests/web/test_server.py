@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+from unittest.mock import Mock, patch
+
 
 def test_settings():
     import bigchaindb
@@ -12,3 +14,47 @@ def test_settings():
     # for whatever reason the value is wrapped in a list
     # needs further investigation
     assert s.cfg.bind[0] == bigchaindb.config['server']['bind']
+
+
+def test_workers_have_several_threads_by_default():
+    import bigchaindb
+    from bigchaindb.web import server
+
+    settings = dict(bigchaindb.config['server'])
+    settings.pop('threads', None)
+    s = server.create_server(settings)
+
+    # a request waiting for a commit doesn't tie up the whole worker
+    assert s.cfg.threads == server.DEFAULT_THREADS > 1
+
+
+def test_settings_with_exchange():
+    import bigchaindb
+    from bigchaindb.events import Exchange
+    from bigchaindb.web import server
+
+    settings = dict(bigchaindb.config['server'], workers=2)
+    exchange = Exchange()
+    s = server.create_server(settings, exchange=exchange)
+    registry = s.application.config['commit_registry']
+
+    assert len(registry.queues) == 2
+    assert s.cfg.pre_fork == registry.pre_fork
+    assert s.cfg.child_exit == registry.child_exit
+
+    worker = Mock()
+    with patch.object(registry, 'post_fork') as registry_post_fork, \
+            patch('bigchaindb.metrics.start_logging') as start_logging:
+        s.cfg.post_fork(None, worker)
+    registry_post_fork.assert_called_once_with(None, worker)
+    assert start_logging.call_args[0][0] is server.logger
+
+
+def test_workers_log_their_metrics():
+    import bigchaindb
+    from bigchaindb.web import server
+
+    s = server.create_server(bigchaindb.config['server'])
+    with patch('bigchaindb.metrics.start_logging') as start_logging:
+        s.cfg.post_fork(None, Mock())
+    assert start_logging.called
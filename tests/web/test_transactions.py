@@ -2,11 +2,13 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import copy
 import json
 from unittest.mock import Mock, patch
 
 import base58
 import pytest
+import rapidjson
 from cryptoconditions import Ed25519Sha256
 from sha3 import sha3_256
 
@@ -31,6 +33,39 @@ def test_get_transaction_returns_404_if_not_found(client):
     assert res.status_code == 404
 
 
+def test_get_transaction_is_cached_with_etag(client, signed_create_tx):
+    with patch('bigchaindb.lib.BigchainDB.get_transaction_dict',
+               return_value=signed_create_tx.to_dict()) as get_transaction:
+        res = client.get(TX_ENDPOINT + signed_create_tx.id)
+        assert res.status_code == 200
+        assert res.json == signed_create_tx.to_dict()
+        assert res.headers['ETag']
+        assert 'immutable' in res.headers['Cache-Control']
+
+        cached = client.get(TX_ENDPOINT + signed_create_tx.id)
+        assert cached.data == res.data
+        assert cached.headers['ETag'] == res.headers['ETag']
+
+        not_modified = client.get(TX_ENDPOINT + signed_create_tx.id,
+                                  headers={'If-None-Match': res.headers['ETag']})
+        assert not_modified.status_code == 304
+        assert not_modified.data == b''
+
+    assert get_transaction.call_count == 1
+
+
+def test_get_transaction_not_found_is_not_cached(client, signed_create_tx):
+    with patch('bigchaindb.lib.BigchainDB.get_transaction_dict',
+               side_effect=[None, signed_create_tx.to_dict()]):
+        res = client.get(TX_ENDPOINT + signed_create_tx.id)
+        assert res.status_code == 404
+        assert 'ETag' not in res.headers
+
+        res = client.get(TX_ENDPOINT + signed_create_tx.id)
+        assert res.status_code == 200
+        assert res.json == signed_create_tx.to_dict()
+
+
 @pytest.mark.abci
 def test_post_create_transaction_endpoint(b, client):
     from bigchaindb.models import Transaction
@@ -402,7 +437,7 @@ def test_transactions_get_list_bad(client):
         assert client.get(url).status_code == 400
 
 
-@patch('requests.post')
+@patch('requests.Session.post')
 @pytest.mark.parametrize('mode', [
     ('', 'broadcast_tx_async'),
     ('?mode=async', 'broadcast_tx_async'),
@@ -443,3 +478,395 @@ def test_post_transaction_invalid_mode(client):
     assert '400 BAD REQUEST' in response.status
     assert 'Mode must be "async", "sync" or "commit"' ==\
            json.loads(response.data.decode('utf8'))['message']['mode']
+
+
+BATCH_ENDPOINT = TX_ENDPOINT + 'batch'
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch(client, mock_post, signed_create_tx,
+                                signed_transfer_tx):
+    invalid_tx = copy.deepcopy(signed_create_tx.to_dict())
+    invalid_tx['id'] = 'abcd' * 16
+    batch = [signed_create_tx.to_dict(), invalid_tx,
+             signed_transfer_tx.to_dict()]
+
+    res = client.post(BATCH_ENDPOINT + '?mode=sync', data=json.dumps(batch))
+
+    assert res.status_code == 200
+    assert res.json == [
+        {'id': signed_create_tx.id, 'status': 202},
+        {'id': 'abcd' * 16, 'status': 400,
+         'message': "Invalid transaction (InvalidHash): The transaction's id "
+                    "'{}' isn't equal to the hash of its body, i.e. it's not "
+                    'valid.'.format('abcd' * 16)},
+        {'id': signed_transfer_tx.id, 'status': 202},
+    ]
+    methods = [kwargs['json']['method'] for _, kwargs in mock_post.call_args_list]
+    assert methods == ['broadcast_tx_sync', 'broadcast_tx_sync']
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_forwards_the_serialized_transaction(
+        client, mock_post, signed_create_tx):
+    from bigchaindb.tendermint_utils import encode_transaction
+
+    tx = signed_create_tx.to_dict()
+    res = client.post(TX_ENDPOINT, data=json.dumps(tx, indent=4))
+
+    assert res.status_code == 202
+    assert res.data == rapidjson.dumps(tx).encode()
+    args, kwargs = mock_post.call_args
+    assert kwargs['json']['params'] == [encode_transaction(tx)]
+
+
+def test_post_transaction_with_invalid_json(client):
+    res = client.post(TX_ENDPOINT, data='{"id": ')
+    assert res.status_code == 400
+    assert res.json['message'].startswith('Invalid JSON: ')
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch_as_ndjson(client, mock_post, signed_create_tx,
+                                          signed_transfer_tx):
+    from bigchaindb.tendermint_utils import encode_transaction
+
+    txs = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    body = '{}\n\n{}\n'.format(json.dumps(txs[0], indent=None),
+                               json.dumps(txs[1], separators=(' ,', ' : ')))
+
+    res = client.post(BATCH_ENDPOINT, data=body,
+                      content_type='application/x-ndjson')
+
+    assert res.status_code == 200
+    assert [status['status'] for status in res.json] == [202, 202]
+    params = [kwargs['json']['params'] for _, kwargs in mock_post.call_args_list]
+    assert params == [[encode_transaction(tx)] for tx in txs]
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch_rejects_dependents_of_invalid_tx(
+        client, mock_post, signed_create_tx, signed_transfer_tx):
+    from bigchaindb.common.exceptions import InvalidSignature
+
+    def validate(self, tx, current_transactions=[]):
+        if tx.id == signed_create_tx.id:
+            raise InvalidSignature('Transaction signature is invalid.')
+        return tx
+
+    batch = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    with patch('bigchaindb.lib.BigchainDB.validate_transaction', validate):
+        res = client.post(BATCH_ENDPOINT, data=json.dumps(batch))
+
+    assert res.json == [
+        {'id': signed_create_tx.id, 'status': 400,
+         'message': 'Invalid transaction (InvalidSignature): '
+                    'Transaction signature is invalid.'},
+        {'id': signed_transfer_tx.id, 'status': 400,
+         'message': 'Invalid transaction: it depends on a rejected '
+                    'transaction of the batch'},
+    ]
+    assert not mock_post.called
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch_ignores_the_spends_of_invalid_txs(
+        client, mock_post, signed_create_tx, signed_transfer_tx, user_pk,
+        user_sk):
+    from bigchaindb.models import Transaction
+
+    # spends the same output as `signed_transfer_tx`, with too large an
+    # amount
+    invalid_tx = Transaction.transfer(signed_create_tx.to_inputs(),
+                                      [([user_pk], 2)],
+                                      asset_id=signed_create_tx.id)
+    invalid_tx = invalid_tx.sign([user_sk])
+    batch = [signed_create_tx.to_dict(), invalid_tx.to_dict(),
+             signed_transfer_tx.to_dict()]
+
+    res = client.post(BATCH_ENDPOINT, data=json.dumps(batch))
+
+    assert [status['status'] for status in res.json] == [202, 400, 202]
+    assert res.json[1]['message'].startswith('Invalid transaction (AmountError)')
+    assert mock_post.call_count == 2
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch_when_tendermint_is_unreachable(
+        client, mock_post, signed_create_tx, signed_transfer_tx):
+    import requests
+
+    mock_post.side_effect = requests.exceptions.ConnectionError
+    batch = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    res = client.post(BATCH_ENDPOINT, data=json.dumps(batch))
+
+    assert [status['status'] for status in res.json] == [503, 503]
+    assert mock_post.call_count == 1
+
+
+@pytest.mark.parametrize('body,status_code', [
+    ('', 400),
+    ('[]', 400),
+    ('{}', 400),
+    ('[1, 2', 400),
+    (json.dumps([{}] * 1001), 413),
+])
+def test_post_invalid_transaction_batch(client, body, status_code):
+    res = client.post(BATCH_ENDPOINT, data=body)
+    assert res.status_code == status_code
+
+
+@pytest.fixture
+def commit_registry(app):
+    from bigchaindb.web.commit_registry import CommitRegistry
+
+    registry = CommitRegistry()
+    registry.slot = 0
+    app.config['commit_registry'] = registry
+    app.config['commit_timeout'] = 0.1
+    return registry
+
+
+@pytest.mark.usefixtures('empty_ledger')
+@pytest.mark.parametrize('committed,status_code', [(True, 202), (False, 500)])
+def test_post_transaction_in_commit_mode_waits_on_the_registry(
+        client, mock_post, commit_registry, monkeypatch, signed_create_tx,
+        committed, status_code):
+    stored = set()
+
+    def broadcast(*args, **kwargs):
+        commit_registry.resolve(1, [signed_create_tx.id])
+        if committed:
+            stored.add(signed_create_tx.id)
+        return mock_post.return_value
+
+    mock_post.side_effect = broadcast
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: txid in stored)
+    res = client.post(TX_ENDPOINT + '?mode=commit',
+                      data=json.dumps(signed_create_tx.to_dict()))
+
+    assert res.status_code == status_code
+    args, kwargs = mock_post.call_args
+    assert kwargs['json']['method'] == 'broadcast_tx_sync'
+    assert not commit_registry._pending
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_in_commit_mode_times_out(
+        client, mock_post, commit_registry, signed_create_tx):
+    res = client.post(TX_ENDPOINT + '?mode=commit',
+                      data=json.dumps(signed_create_tx.to_dict()))
+
+    assert res.status_code == 500
+    assert res.json['message'] == \
+        'Timed out waiting for tx to be included in a block'
+    assert not commit_registry._pending
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_in_commit_mode_when_broadcast_fails(
+        client, mock_post, commit_registry, signed_create_tx):
+    mock_post.return_value.json.return_value = {'result': {'code': 1}}
+    res = client.post(TX_ENDPOINT + '?mode=commit',
+                      data=json.dumps(signed_create_tx.to_dict()))
+
+    assert res.status_code == 500
+    assert res.json['message'] == 'Transaction validation failed'
+    assert not commit_registry._pending
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_batch_in_commit_mode(
+        client, mock_post, commit_registry, monkeypatch, signed_create_tx,
+        signed_transfer_tx):
+    def broadcast(*args, **kwargs):
+        commit_registry.resolve(1, [signed_create_tx.id])
+        return mock_post.return_value
+
+    mock_post.side_effect = broadcast
+    monkeypatch.setattr('bigchaindb.lib.BigchainDB.is_committed',
+                        lambda self, txid: bool(commit_registry.committed_height(txid)))
+    batch = [signed_create_tx.to_dict(), signed_transfer_tx.to_dict()]
+    res = client.post(BATCH_ENDPOINT + '?mode=commit', data=json.dumps(batch))
+
+    assert res.json == [
+        {'id': signed_create_tx.id, 'status': 202},
+        {'id': signed_transfer_tx.id, 'status': 500,
+         'message': 'Timed out waiting for tx to be included in a block'},
+    ]
+
+
+@pytest.mark.parametrize('committed,status_code', [(True, 200), (False, 503)])
+def test_get_transaction_status_without_block_events(client, committed,
+                                                     status_code):
+    with patch('bigchaindb.lib.BigchainDB.is_committed',
+               return_value=committed) as is_committed:
+        res = client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=1')
+
+    assert res.status_code == status_code
+    is_committed.assert_called_once_with('a' * 64)
+
+
+@pytest.mark.parametrize('committed,status_code', [(True, 200), (False, 404)])
+def test_get_transaction_status_waits_for_the_commit(client, commit_registry,
+                                                     committed, status_code):
+    import threading
+
+    def is_committed(txid):
+        if is_committed.calls:
+            return committed
+        is_committed.calls += 1
+        threading.Timer(0.05, commit_registry.resolve,
+                        args=(2, [txid])).start()
+        return False
+    is_committed.calls = 0
+
+    with patch('bigchaindb.lib.BigchainDB.is_committed',
+               side_effect=is_committed) as mock_is_committed:
+        res = client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=5')
+
+    # the database is checked again, as the transactions failing
+    # `deliver_tx` are in the block events as well
+    assert res.status_code == status_code
+    assert mock_is_committed.call_count == 2
+    assert not commit_registry._pending
+
+
+def test_get_transaction_status_times_out(client, commit_registry):
+    with patch('bigchaindb.lib.BigchainDB.is_committed', return_value=False):
+        res = client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=0.01')
+
+    assert res.status_code == 404
+    assert not commit_registry._pending
+
+
+def test_get_transaction_status_waits_with_the_default_config(
+        commit_registry):
+    import threading
+    import bigchaindb
+    from bigchaindb.web import server
+
+    app = server.create_server(bigchaindb.config['server']).application
+    app.config['commit_registry'] = commit_registry
+    tx_id = 'a' * 64
+    threading.Timer(0.05, commit_registry.resolve,
+                    args=(1, [tx_id])).start()
+
+    with patch('bigchaindb.lib.BigchainDB.is_committed',
+               side_effect=[False, True]):
+        res = app.test_client().get(TX_ENDPOINT + tx_id + '/status?wait=5')
+
+    assert res.status_code == 200
+
+
+def test_get_transaction_status_refuses_to_wait_without_a_spare_thread(
+        app, client, commit_registry):
+    import threading
+    from bigchaindb import metrics
+
+    app.config['status_waiters'] = threading.BoundedSemaphore(1)
+    app.config['status_waiters'].acquire()
+    metrics.reset()
+    with patch('bigchaindb.lib.BigchainDB.is_committed', return_value=False):
+        res = client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=5')
+
+    assert res.status_code == 503
+    assert metrics.snapshot()['status.waits_refused'] == {'value': 1}
+    assert not commit_registry._pending
+
+
+@pytest.mark.parametrize('wait', ['-1', 'nan', 'soon'])
+def test_get_transaction_status_with_invalid_wait(client, wait):
+    res = client.get(TX_ENDPOINT + 'a' * 64 + '/status?wait=' + wait)
+    assert res.status_code == 400
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_suppresses_duplicates(client, mock_post,
+                                                signed_create_tx):
+    from bigchaindb import metrics
+
+    metrics.reset()
+    raw_tx = json.dumps(signed_create_tx.to_dict())
+    with patch('bigchaindb.lib.BigchainDB.validate_transaction',
+               side_effect=lambda tx, current=[]: tx) as validate:
+        responses = [client.post(TX_ENDPOINT, data=raw_tx) for _ in range(3)]
+
+    assert [res.status_code for res in responses] == [202, 202, 202]
+    assert responses[2].data == rapidjson.dumps(signed_create_tx.to_dict()).encode()
+    assert validate.call_count == 1
+    assert mock_post.call_count == 1
+    assert metrics.snapshot()['dedupe.suppressed'] == {'value': 2}
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_duplicate_times_out(app, client, mock_post,
+                                              signed_create_tx):
+    import hashlib
+
+    tx = signed_create_tx.to_dict()
+    raw_tx = rapidjson.dumps(tx).encode()
+    # an identical submission is stuck in flight
+    app.config['dedupe_table'].claim(
+        (tx['id'], hashlib.sha256(raw_tx).digest(), 'broadcast_tx_async'))
+    app.config['commit_timeout'] = 0.01
+
+    res = client.post(TX_ENDPOINT, data=raw_tx)
+
+    assert res.status_code == 504
+    assert res.json['message'] == 'Timed out waiting for an identical submission'
+    assert not mock_post.called
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_does_not_suppress_other_submissions(
+        client, mock_post, signed_create_tx):
+    mock_post.return_value.json.side_effect = [{'result': {'code': 1}},
+                                               {'result': {'code': 0}},
+                                               {'result': {'code': 0}},
+                                               {'result': {'code': 0}}]
+    raw_tx = json.dumps(signed_create_tx.to_dict())
+
+    # failures are not remembered
+    assert client.post(TX_ENDPOINT, data=raw_tx).status_code == 500
+    assert client.post(TX_ENDPOINT, data=raw_tx).status_code == 202
+    # a different formatting of the transaction is a duplicate, but a
+    # different mode isn't
+    assert client.post(TX_ENDPOINT, data=raw_tx + ' ').status_code == 202
+    assert client.post(TX_ENDPOINT + '?mode=sync',
+                       data=raw_tx).status_code == 202
+    assert mock_post.call_count == 3
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_is_shed_when_the_mempool_is_full(
+        app, client, mock_post, signed_create_tx):
+    from bigchaindb.web.admission import AdmissionController
+
+    app.config['admission'] = AdmissionController(
+        lambda: 11, max_mempool_size=10, retry_after=3)
+
+    res = client.post(TX_ENDPOINT, data=json.dumps(signed_create_tx.to_dict()))
+    assert res.status_code == 429
+    assert res.headers['Retry-After'] == '3'
+    assert res.json['message'] == 'Too many requests: the mempool is full'
+
+    res = client.post(BATCH_ENDPOINT,
+                      data=json.dumps([signed_create_tx.to_dict()]))
+    assert res.status_code == 429
+    assert not mock_post.called
+    assert app.config['admission'].in_flight == 0
+
+
+@pytest.mark.usefixtures('empty_ledger')
+def test_post_transaction_returns_429_if_tendermint_mempool_is_full(
+        client, mock_post, signed_create_tx):
+    mock_post.return_value.json.return_value = {
+        'error': {'code': -32603, 'message': 'Internal error',
+                  'data': 'Error broadcasting transaction: Mempool is full'}}
+
+    res = client.post(TX_ENDPOINT, data=json.dumps(signed_create_tx.to_dict()))
+    assert res.status_code == 429
+    assert res.headers['Retry-After'] == '2'
+    assert res.json['message'] == 'Mempool is full'
@@ -4,7 +4,6 @@
 
 import asyncio
 import json
-import queue
 import threading
 from unittest.mock import patch
 
@@ -14,10 +13,32 @@ import pytest
 class MockWebSocket:
     def __init__(self):
         self.received = []
+        self.close_kwargs = None
 
+    @asyncio.coroutine
     def send_str(self, s):
         self.received.append(s)
 
+    @asyncio.coroutine
+    def close(self, **kwargs):
+        self.close_kwargs = kwargs
+
+
+class StalledWebSocket(MockWebSocket):
+    """A websocket whose client never reads."""
+
+    @asyncio.coroutine
+    def send_str(self, s):
+        yield from asyncio.Event().wait()
+
+
+@pytest.fixture
+def reset_metrics():
+    from bigchaindb import metrics
+    metrics.reset()
+    yield
+    metrics.reset()
+
 
 def test_eventify_block_works_with_any_transaction():
     from bigchaindb.web.websocket_server import eventify_block
@@ -46,62 +67,47 @@ def test_eventify_block_works_with_any_transaction():
         assert event == expected
 
 
-@asyncio.coroutine
-def test_bridge_sync_async_queue(loop):
-    from bigchaindb.web.websocket_server import _multiprocessing_to_asyncio
-
-    sync_queue = queue.Queue()
-    async_queue = asyncio.Queue(loop=loop)
-
-    bridge = threading.Thread(target=_multiprocessing_to_asyncio,
-                              args=(sync_queue, async_queue, loop),
-                              daemon=True)
-    bridge.start()
-
-    sync_queue.put('fahren')
-    sync_queue.put('auf')
-    sync_queue.put('der')
-    sync_queue.put('Autobahn')
-
-    result = yield from async_queue.get()
-    assert result == 'fahren'
-
-    result = yield from async_queue.get()
-    assert result == 'auf'
-
-    result = yield from async_queue.get()
-    assert result == 'der'
-
-    result = yield from async_queue.get()
-    assert result == 'Autobahn'
-
-    assert async_queue.qsize() == 0
-
-
-@patch('threading.Thread')
 @patch('aiohttp.web.run_app')
 @patch('bigchaindb.web.websocket_server.init_app')
-@patch('asyncio.get_event_loop', return_value='event-loop')
-@patch('asyncio.Queue', return_value='event-queue')
-def test_start_creates_an_event_loop(queue_mock, get_event_loop_mock,
-                                     init_app_mock, run_app_mock,
-                                     thread_mock):
+@patch('asyncio.get_event_loop')
+def test_start_creates_an_event_loop(get_event_loop_mock, init_app_mock,
+                                     run_app_mock):
     from bigchaindb import config
-    from bigchaindb.web.websocket_server import start, _multiprocessing_to_asyncio
-
-    start(None)
-    thread_mock.assert_called_once_with(
-        target=_multiprocessing_to_asyncio,
-        args=(None, queue_mock.return_value, get_event_loop_mock.return_value),
-        daemon=True,
-    )
-    thread_mock.return_value.start.assert_called_once_with()
-    init_app_mock.assert_called_with('event-queue', loop='event-loop')
+    from bigchaindb.events import AsyncEventReader
+    from bigchaindb.web.websocket_server import start
+
+    loop = get_event_loop_mock.return_value
+    start('event-reader')
+    event_source = init_app_mock.call_args[0][0]
+    assert isinstance(event_source, AsyncEventReader)
+    assert event_source.reader == 'event-reader'
+    assert event_source.loop == loop
+    init_app_mock.assert_called_with(event_source, loop=loop)
+    assert loop.create_task.called
     run_app_mock.assert_called_once_with(
         init_app_mock.return_value,
         host=config['wsserver']['host'],
         port=config['wsserver']['port'],
+        reuse_port=False,
     )
+    loop.create_task.call_args[0][0].close()
+
+
+@asyncio.coroutine
+def test_workers_log_their_metrics(loop, monkeypatch, reset_metrics):
+    from bigchaindb import metrics
+    from bigchaindb.web import websocket_server
+
+    monkeypatch.setattr(websocket_server, 'METRICS_LOG_INTERVAL', 0)
+    metrics.counter('websocket.connections').inc(3)
+    metrics.counter('transactions.posted').inc()
+    with patch.object(websocket_server.logger, 'info') as info:
+        task = loop.create_task(websocket_server._log_metrics(2, loop))
+        yield from asyncio.sleep(0.01, loop=loop)
+        task.cancel()
+
+    assert info.call_args[0][1] == 2
+    assert json.loads(info.call_args[0][2]) == {'websocket.connections': {'value': 3}}
 
 
 @asyncio.coroutine
@@ -160,6 +166,484 @@ def test_websocket_block_event(b, test_client, loop):
     yield from event_source.put(POISON_PILL)
 
 
+@asyncio.coroutine
+def test_dispatcher_drops_oldest_events_of_slow_subscribers(loop, reset_metrics):
+    from bigchaindb import metrics
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    dispatcher = Dispatcher(None, queue_size=2, loop=loop)
+    fast, slow = MockWebSocket(), StalledWebSocket()
+    dispatcher.subscribe('fast', fast)
+    dispatcher.subscribe('slow', slow)
+
+    for message in ('a', 'b', 'c', 'd', 'e'):
+        dispatcher.enqueue(message)
+        yield from asyncio.sleep(0, loop=loop)
+
+    assert fast.received == ['a', 'b', 'c', 'd', 'e']
+    # The slow subscriber is stuck sending `a`, and `b` and `c` were
+    # dropped to queue `d` and `e`
+    queue = dispatcher.subscribers['slow'].queue
+    assert [queue.get_nowait(), queue.get_nowait()] == ['d', 'e']
+    assert metrics.counter('websocket.dropped').value == 2
+
+    dispatcher.unsubscribe('slow')
+    dispatcher.unsubscribe('slow')
+    assert list(dispatcher.subscribers) == ['fast']
+    dispatcher.close()
+    yield from asyncio.sleep(0, loop=loop)
+
+
+@asyncio.coroutine
+def test_dispatcher_disconnects_slow_subscribers(loop, reset_metrics):
+    from bigchaindb import metrics
+    from bigchaindb.web.websocket_server import Dispatcher, OVERFLOW_CLOSE_CODE
+
+    dispatcher = Dispatcher(None, queue_size=2, overflow='disconnect', loop=loop)
+    slow = StalledWebSocket()
+    dispatcher.subscribe('slow', slow)
+
+    for message in ('a', 'b', 'c', 'd'):
+        dispatcher.enqueue(message)
+        yield from asyncio.sleep(0, loop=loop)
+    yield from asyncio.sleep(0.01, loop=loop)
+
+    assert dispatcher.subscribers == {}
+    assert slow.close_kwargs['code'] == OVERFLOW_CLOSE_CODE
+    assert metrics.counter('websocket.disconnected').value == 1
+    assert metrics.counter('websocket.dropped').value == 3
+    assert metrics.gauge('websocket.subscribers').value == 0
+    # The websocket handler unsubscribes it again when it closes
+    dispatcher.unsubscribe('slow')
+
+
+def test_dispatcher_rejects_unknown_overflow_policy(loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    with pytest.raises(ValueError):
+        Dispatcher(None, overflow='block', loop=loop)
+
+
+@asyncio.coroutine
+def test_publish_to_thousands_of_subscribers(loop, reset_metrics):
+    from bigchaindb import events, metrics
+    from bigchaindb.web.websocket_server import Dispatcher, POISON_PILL
+
+    event_source = asyncio.Queue(loop=loop)
+    dispatcher = Dispatcher(event_source, queue_size=10, loop=loop)
+    websockets = [StalledWebSocket() if i % 10 == 0 else MockWebSocket()
+                  for i in range(2000)]
+    for i, websocket in enumerate(websockets):
+        dispatcher.subscribe(i, websocket)
+
+    blocks = [{'height': height,
+               'transactions': [{'id': '{}-{}'.format(height, i),
+                                 'operation': 'CREATE',
+                                 'outputs': []}
+                                for i in range(5)]}
+              for height in range(10)]
+    for block in blocks:
+        event_source.put_nowait(events.Event(events.EventTypes.BLOCK_VALID, block))
+    event_source.put_nowait(POISON_PILL)
+
+    # Publishing doesn't wait for the stalled subscribers
+    yield from asyncio.wait_for(dispatcher.publish(), 30, loop=loop)
+    for _ in range(20):
+        yield from asyncio.sleep(0, loop=loop)
+
+    expected = [tx['id'] for block in blocks for tx in block['transactions']]
+    for websocket in websockets:
+        if not isinstance(websocket, StalledWebSocket):
+            assert [json.loads(message)['transaction_id']
+                    for message in websocket.received] == expected
+
+    # Each stalled subscriber is stuck sending the first message, and only
+    # keeps the last 10 ones
+    stalled = len(websockets) // 10
+    assert metrics.counter('websocket.dropped').value == stalled * (50 - 11)
+    assert metrics.gauge('websocket.max_queue_depth').value == 10
+    assert metrics.gauge('websocket.queued').value == stalled * 10
+
+    dispatcher.close()
+    yield from asyncio.sleep(0, loop=loop)
+
+
+def test_dispatcher_matches_subscribers_by_filter(loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    dispatcher = Dispatcher(None, loop=loop)
+    dispatcher.subscribe('all', MockWebSocket())
+    dispatcher.subscribe('asset', MockWebSocket(), {'asset_id': ['a1', 'a2']})
+    dispatcher.subscribe('transfers', MockWebSocket(),
+                         {'asset_id': ['a1'], 'operation': ['TRANSFER']})
+    dispatcher.subscribe('key', MockWebSocket(), {'public_key': ['pk']})
+
+    dispatcher.subscribe('blocks', MockWebSocket(), {'public_key': ['pk']},
+                         payload='block')
+
+    def match(asset_id, operation, *public_keys):
+        matched = dispatcher.match({'asset_id': (asset_id,),
+                                    'operation': (operation,),
+                                    'public_key': set(public_keys)})
+        return {payload: set(uuids) for payload, uuids in matched.items()}
+
+    assert match('a1', 'CREATE')['ids'] == {'asset'}
+    assert match('a1', 'TRANSFER', 'pk') == {'ids': {'asset', 'transfers', 'key'},
+                                             'transaction': set(),
+                                             'block': {'blocks'}}
+    assert match('a2', 'TRANSFER')['ids'] == {'asset'}
+    assert match('a3', 'TRANSFER', 'other', 'pk')['ids'] == {'key'}
+    assert dispatcher.unfiltered['ids'] == {'all': None}
+
+    dispatcher.close()
+    assert dispatcher.unfiltered == {'ids': {}, 'transaction': {}, 'block': {}}
+    assert dispatcher.index == {'asset_id': {}, 'operation': {}, 'public_key': {}}
+
+
+@asyncio.coroutine
+def test_websocket_filters(b, test_client, loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import init_app, POISON_PILL, EVENTS_ENDPOINT
+    from bigchaindb.models import Transaction
+    from bigchaindb.common import crypto
+
+    alice_priv, alice_pub = crypto.generate_key_pair()
+    bob_priv, bob_pub = crypto.generate_key_pair()
+    create = Transaction.create([alice_pub], [([alice_pub], 1)]).sign([alice_priv])
+    other = Transaction.create([bob_pub], [([bob_pub], 1)]).sign([bob_priv])
+    transfer = Transaction.transfer(create.to_inputs(), [([bob_pub], 1)],
+                                    asset_id=create.id).sign([alice_priv])
+
+    event_source = asyncio.Queue(loop=loop)
+    app = init_app(event_source, loop=loop)
+    client = yield from test_client(app)
+    by_asset = yield from client.ws_connect(
+        EVENTS_ENDPOINT + '?asset_id=' + create.id)
+    by_key = yield from client.ws_connect(
+        EVENTS_ENDPOINT + '?public_key=' + bob_pub + '&operation=create')
+
+    block = {'height': 1,
+             'transactions': [tx.to_dict() for tx in (create, other, transfer)]}
+    yield from event_source.put(events.Event(events.EventTypes.BLOCK_VALID, block))
+    yield from event_source.put('end')
+
+    @asyncio.coroutine
+    def received(ws):
+        messages = []
+        while True:
+            result = yield from ws.receive()
+            if result.data == 'end':
+                return messages
+            messages.append(json.loads(result.data)['transaction_id'])
+
+    assert (yield from received(by_asset)) == [create.id, transfer.id]
+    assert (yield from received(by_key)) == [other.id]
+
+    yield from event_source.put(POISON_PILL)
+
+
+@pytest.mark.parametrize('query', [
+    'asset_id=abc',
+    'operation=MINT',
+    'public_key=0OIl',
+    'height=1',
+    'from_height=-1',
+    'from_height=tip',
+    'payload=full',
+])
+@asyncio.coroutine
+def test_websocket_rejects_invalid_filters(query, test_client, loop):
+    from bigchaindb.web.websocket_server import init_app, EVENTS_ENDPOINT
+
+    app = init_app(asyncio.Queue(loop=loop), loop=loop)
+    client = yield from test_client(app)
+    response = yield from client.get(EVENTS_ENDPOINT + '?' + query)
+
+    assert response.status == 400
+    assert 'message' in (yield from response.json())
+
+
+def make_block(height, *asset_ids):
+    return {'height': height,
+            'transactions': [{'id': '{}-{}'.format(height, i),
+                              'operation': 'TRANSFER',
+                              'asset': {'id': asset_id},
+                              'outputs': []}
+                             for i, asset_id in enumerate(asset_ids)]}
+
+
+@asyncio.coroutine
+def test_replay_then_live_events(loop, monkeypatch):
+    from bigchaindb.web import websocket_server
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    monkeypatch.setattr(websocket_server, 'REPLAY_BATCH_SIZE', 2)
+    committed = [make_block(height, 'a', 'b') for height in range(1, 6)]
+    reads = []
+
+    def read_blocks(from_height, limit, full):
+        reads.append(from_height)
+        return [block for block in committed
+                if block['height'] >= from_height][:limit]
+
+    dispatcher = Dispatcher(None, queue_size=100, read_blocks=read_blocks,
+                            loop=loop)
+    websocket = MockWebSocket()
+    dispatcher.subscribe('replay', websocket, {'asset_id': {'a'}},
+                         from_height=2)
+
+    # Published while the blocks are replayed: 5 was committed already,
+    # 6 wasn't
+    for block in (committed[4], make_block(6, 'a', 'b')):
+        for tx in block['transactions']:
+            message = json.dumps({'transaction_id': tx['id']})
+            dispatcher.enqueue(message, dispatcher.match({
+                'asset_id': (tx['asset']['id'],),
+                'operation': ('TRANSFER',),
+                'public_key': ()})['ids'], block['height'])
+
+    yield from asyncio.wait_for(dispatcher.subscribers['replay'].replayer,
+                                5, loop=loop)
+    yield from asyncio.sleep(0, loop=loop)
+
+    assert reads == [2, 4, 6]
+    assert [json.loads(message)['transaction_id']
+            for message in websocket.received] == ['2-0', '3-0', '4-0', '5-0', '6-0']
+
+    # Live events of replayed blocks are ignored
+    dispatcher.enqueue('late', ['replay'], 5)
+    dispatcher.enqueue('next', ['replay'], 7)
+    yield from asyncio.sleep(0, loop=loop)
+    assert websocket.received[-1] == 'next'
+
+    dispatcher.close()
+    yield from asyncio.sleep(0, loop=loop)
+
+
+@asyncio.coroutine
+def test_replay_disconnects_when_held_events_overflow(loop, reset_metrics):
+    from bigchaindb import metrics
+    from bigchaindb.web.websocket_server import Dispatcher, OVERFLOW_CLOSE_CODE
+
+    replaying = threading.Event()
+
+    def read_blocks(from_height, limit, full):
+        replaying.wait(5)
+        return []
+
+    # Even with `drop_oldest`, dropping a held event would skip it
+    dispatcher = Dispatcher(None, queue_size=2, overflow='drop_oldest',
+                            read_blocks=read_blocks, loop=loop)
+    websocket = MockWebSocket()
+    dispatcher.subscribe('replay', websocket, from_height=1)
+
+    for height in (1, 2, 3):
+        dispatcher.enqueue(str(height), height=height)
+    replaying.set()
+    yield from asyncio.sleep(0.01, loop=loop)
+
+    assert dispatcher.subscribers == {}
+    assert websocket.received == []
+    assert websocket.close_kwargs['code'] == OVERFLOW_CLOSE_CODE
+    assert metrics.counter('websocket.disconnected').value == 1
+    assert metrics.counter('websocket.dropped').value == 3
+
+
+def test_block_messages_are_serialized_once_by_payload(loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    dispatcher = Dispatcher(None, loop=loop)
+    for payload in ('ids', 'transaction', 'block'):
+        for i in range(2):
+            dispatcher.subscribe((payload, i), MockWebSocket(), payload=payload)
+            dispatcher.subscribe((payload, 'a', i), MockWebSocket(),
+                                 {'asset_id': ['a']}, payload=payload)
+    dispatcher.subscribe(('block', 'c'), MockWebSocket(), {'asset_id': ['c']},
+                         payload='block')
+
+    block = make_block(3, 'a', 'b')
+    messages = list(dispatcher.block_messages(block))
+    by_uuids = {frozenset(uuids): message for message, uuids, _ in messages}
+
+    def message(*uuids):
+        return json.loads(by_uuids[frozenset(uuids)])
+
+    assert len(messages) == 6
+    assert {height for _, _, height in messages} == {3}
+    assert message(('ids', 0), ('ids', 1), ('ids', 'a', 0), ('ids', 'a', 1)) == {
+        'height': 3, 'asset_id': 'a', 'transaction_id': '3-0'}
+    assert message(('transaction', 0), ('transaction', 1)) == {
+        'height': 3, 'asset_id': 'b', 'transaction_id': '3-1',
+        'transaction': block['transactions'][1]}
+    assert message(('block', 0), ('block', 1)) == block
+    assert message(('block', 'a', 0), ('block', 'a', 1)) == {
+        'height': 3, 'transactions': block['transactions'][:1]}
+    # Nothing for subscribers matching no transaction of the block
+    assert all(('block', 'c') not in uuids for _, uuids, _ in messages)
+
+    dispatcher.close()
+
+
+@asyncio.coroutine
+def test_websocket_payloads(test_client, loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import init_app, POISON_PILL, EVENTS_ENDPOINT
+
+    event_source = asyncio.Queue(loop=loop)
+    app = init_app(event_source, loop=loop)
+    client = yield from test_client(app)
+    by_tx = yield from client.ws_connect(EVENTS_ENDPOINT + '?payload=transaction')
+    by_block = yield from client.ws_connect(
+        EVENTS_ENDPOINT + '?payload=block&asset_id=' + 'b' * 64)
+
+    block = make_block(1, 'a' * 64, 'b' * 64)
+    yield from event_source.put(events.Event(events.EventTypes.BLOCK_VALID, block))
+
+    for tx in block['transactions']:
+        result = yield from by_tx.receive()
+        assert json.loads(result.data)['transaction'] == tx
+    result = yield from by_block.receive()
+    assert json.loads(result.data) == {'height': 1,
+                                       'transactions': block['transactions'][1:]}
+
+    yield from event_source.put(POISON_PILL)
+
+
+@asyncio.coroutine
+def test_websocket_admissions(test_client, loop):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import (init_app, POISON_PILL, EVENTS_ENDPOINT,
+                                                 ADMISSIONS_ENDPOINT)
+
+    event_source = asyncio.Queue(loop=loop)
+    app = init_app(event_source, loop=loop)
+    client = yield from test_client(app)
+    admissions = yield from client.ws_connect(ADMISSIONS_ENDPOINT)
+    transactions = yield from client.ws_connect(EVENTS_ENDPOINT)
+
+    rejected = {'transaction_id': 'a' * 64, 'stage': 'check_tx',
+                'latency': '0.001', 'error': 'DoubleSpend'}
+    yield from event_source.put(events.Event(events.EventTypes.TX_REJECTED, rejected))
+    block = make_block(1, 'b' * 64)
+    yield from event_source.put(events.Event(events.EventTypes.BLOCK_VALID, block))
+
+    result = yield from admissions.receive()
+    assert json.loads(result.data) == dict(rejected, status='rejected', skipped=0)
+    result = yield from transactions.receive()
+    assert json.loads(result.data)['transaction_id'] == '1-0'
+    with pytest.raises(asyncio.TimeoutError):
+        yield from admissions.receive(timeout=0.05)
+
+    response = yield from client.get(ADMISSIONS_ENDPOINT + '?operation=CREATE')
+    assert response.status == 400
+
+    yield from event_source.put(POISON_PILL)
+
+
+def test_dispatcher_caps_the_admission_events(loop, monkeypatch, reset_metrics):
+    from bigchaindb import events, metrics
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    now = 100
+    monkeypatch.setattr(loop, 'time', lambda: now)
+    dispatcher = Dispatcher(None, admissions_rate_limit=2, loop=loop)
+    event = events.Event(events.EventTypes.TX_ACCEPTED,
+                         {'transaction_id': 'a' * 64, 'stage': 'deliver_tx',
+                          'latency': '0.01'})
+
+    assert dispatcher.admission_message(event) is None
+    dispatcher.subscribe_admissions('dashboard', MockWebSocket())
+
+    messages = [dispatcher.admission_message(event) for _ in range(5)]
+    assert [json.loads(message)['status'] for message in messages[:2]] == ['accepted'] * 2
+    assert messages[2:] == [None] * 3
+    assert metrics.counter('websocket.admissions_skipped').value == 3
+
+    now += 1
+    assert json.loads(dispatcher.admission_message(event))['skipped'] == 3
+    assert json.loads(dispatcher.admission_message(event))['skipped'] == 0
+
+    dispatcher.close()
+    assert dispatcher.admissions == {}
+
+
+@asyncio.coroutine
+def test_replay_failure_closes_websocket(loop):
+    from bigchaindb.web.websocket_server import Dispatcher
+
+    def read_blocks(from_height, limit, full):
+        raise RuntimeError('database is gone')
+
+    dispatcher = Dispatcher(None, read_blocks=read_blocks, loop=loop)
+    websocket = MockWebSocket()
+    dispatcher.subscribe('replay', websocket, from_height=1)
+
+    yield from asyncio.wait_for(dispatcher.subscribers['replay'].replayer,
+                                5, loop=loop)
+    yield from asyncio.sleep(0.01, loop=loop)
+
+    assert websocket.close_kwargs['code'] == 1011
+    dispatcher.close()
+
+
+@pytest.mark.bdb
+@asyncio.coroutine
+def test_websocket_replay(b, test_client, loop, signed_create_tx,
+                          signed_transfer_tx):
+    from bigchaindb import events
+    from bigchaindb.web.websocket_server import init_app, POISON_PILL, EVENTS_ENDPOINT
+
+    b.store_bulk_transactions([signed_create_tx])
+    b.store_block({'height': 1, 'transactions': [signed_create_tx.id]})
+
+    event_source = asyncio.Queue(loop=loop)
+    app = init_app(event_source, loop=loop)
+    client = yield from test_client(app)
+    ws = yield from client.ws_connect(EVENTS_ENDPOINT + '?from_height=1')
+
+    result = yield from ws.receive()
+    assert json.loads(result.data) == {'height': 1,
+                                       'asset_id': signed_create_tx.id,
+                                       'transaction_id': signed_create_tx.id}
+
+    block = {'height': 2, 'transactions': [signed_transfer_tx.to_dict()]}
+    yield from event_source.put(events.Event(events.EventTypes.BLOCK_VALID, block))
+    result = yield from ws.receive()
+    assert json.loads(result.data)['transaction_id'] == signed_transfer_tx.id
+
+    yield from event_source.put(POISON_PILL)
+
+
+@pytest.mark.bdb
+@asyncio.coroutine
+def test_websocket_replay_after_a_chain_migration(b, test_client, loop, signed_create_tx,
+                                                  signed_transfer_tx):
+    from bigchaindb import events
+    from bigchaindb.backend.query import store_abci_chain
+    from bigchaindb.web.websocket_server import init_app, POISON_PILL, EVENTS_ENDPOINT
+
+    # The first block of the chain starting at height 10
+    store_abci_chain(b.connection, 10, 'chain-X')
+    b.store_bulk_transactions([signed_create_tx])
+    b.store_block({'height': 11, 'transactions': [signed_create_tx.id]})
+
+    event_source = asyncio.Queue(loop=loop)
+    app = init_app(event_source, loop=loop)
+    client = yield from test_client(app)
+    ws = yield from client.ws_connect(EVENTS_ENDPOINT + '?from_height=1')
+
+    result = yield from ws.receive()
+    assert json.loads(result.data)['height'] == 1
+
+    # Live events have Tendermint heights as well
+    block = {'height': 2, 'transactions': [signed_transfer_tx.to_dict()]}
+    yield from event_source.put(events.Event(events.EventTypes.BLOCK_VALID, block))
+    result = yield from asyncio.wait_for(ws.receive(), 5, loop=loop)
+    assert json.loads(result.data)['transaction_id'] == signed_transfer_tx.id
+
+    yield from event_source.put(POISON_PILL)
+
+
 @pytest.mark.skip('Processes are not stopping properly, and the whole test suite would hang')
 def test_integration_from_webapi_to_websocket(monkeypatch, client, loop):
     # XXX: I think that the `pytest-aiohttp` plugin is sparkling too much